@@ -1,5 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from jit_kernels import chain_reset_walk, clamped_walk
+from render_utils import plot_history
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,7 +11,9 @@ OMEGA = 117.038
 # A vida exige um "Atrator Topológico" (Omega) que colapsa a função de onda das possibilidades
 # em direção à complexidade funcional.
 
-def simulate_abiogenesis(attempts=1000):
+@register_experiment("abiogenesis_omega", seed=117)
+def compute_abiogenesis(attempts=1000, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 12: Omega Abiogenesis...")
     
     # Meta: Montar uma proteína funcional simples de 50 resíduos
@@ -21,44 +27,43 @@ def simulate_abiogenesis(attempts=1000):
     # O universo "quer" criar vida. O campo Omega favorece configurações estáveis.
     # Probabilidade = 1/20 * Omega_Bootstrap
     
-    progress_random = []
-    progress_omega = []
+    # Dois sorteios por tentativa (acaso, Omega), na mesma ordem do laço passo a passo
+    draws = rng.random((attempts, 2))
+    
+    # 1. Tentativa Aleatória
+    # Se acertar, cadeia cresce. Se errar, cadeia quebra (instabilidade).
+    progress_random = chain_reset_walk(draws[:, 0] < 0.05) # 1/20
     
-    current_chain_random = 0
-    current_chain_omega = 0
+    # 2. Tentativa Omega
+    # O acerto é facilitado pela ressonância (boost de probabilidade).
+    # Se errar, a memória holográfica pode "segurar" a estrutura por um tempo:
+    # não zera imediatamente, decai (passeio com piso em 0).
+    steps = np.where(draws[:, 1] < 0.05 * np.log(OMEGA), 1, -1)
+    progress_omega = clamped_walk(0, steps, floor=0.0).astype(np.int64)
     
-    for t in range(attempts):
-        # 1. Tentativa Aleatória
-        # Se acertar, cadeia cresce. Se errar, cadeia quebra (instabilidade).
-        if np.random.random() < 0.05: # 1/20
-            current_chain_random += 1
-        else:
-            current_chain_random = 0 # Quebra
-            
-        # 2. Tentativa Omega
-        # O acerto é facilitado pela ressonância
-        if np.random.random() < 0.05 * np.log(OMEGA): # Boost de probabilidade
-            current_chain_omega += 1
-        else:
-            # Se errar, a memória holográfica pode "segurar" a estrutura por um tempo
-            # Não zera imediatamente, decai.
-            current_chain_omega = max(0, current_chain_omega - 1)
-            
-        progress_random.append(current_chain_random)
-        progress_omega.append(current_chain_omega)
-        
-        if current_chain_omega >= target_complexity:
-            print(f"Vida criada (Omega) na iteração {t}!")
-            # Manter no gráfico como sucesso
-            for _ in range(attempts - t - 1):
-                progress_omega.append(target_complexity)
-                progress_random.append(current_chain_random) # Random continua falhando
-            break
-            
+    reached = np.flatnonzero(progress_omega >= target_complexity)
+    if reached.size:
+        t = reached[0]
+        print(f"Vida criada (Omega) na iteração {t}!")
+        # Manter no gráfico como sucesso; Random continua falhando
+        progress_omega[t + 1:] = target_complexity
+        progress_random[t + 1:] = progress_random[t]
+
+    return {'progress_random': np.array(progress_random), 'progress_omega': np.array(progress_omega),
+            'target_complexity': target_complexity}
+
+@register_renderer("abiogenesis_omega")
+def render_abiogenesis(results):
+    import matplotlib.pyplot as plt
+
+    progress_random = results['progress_random']
+    progress_omega = results['progress_omega']
+    target_complexity = results['target_complexity']
+
     # Plot
     plt.figure(figsize=(10, 6))
-    plt.plot(progress_random, 'r-', alpha=0.5, label='Acaso (Random Chance)')
-    plt.plot(progress_omega, 'b-', linewidth=2, label='Atrator Omega (Intelligent Design/Physics)')
+    plot_history(plt.gca(), progress_random, 'r-', alpha=0.5, label='Acaso (Random Chance)')
+    plot_history(plt.gca(), progress_omega, 'b-', linewidth=2, label='Atrator Omega (Intelligent Design/Physics)')
     
     plt.axhline(y=target_complexity, color='green', linestyle='--', label='Complexidade Mínima para Vida')
     
@@ -72,6 +77,8 @@ def simulate_abiogenesis(attempts=1000):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_abiogenesis(attempts=1000, rng=None):
+    render_abiogenesis(compute_abiogenesis(attempts, rng))
+
 if __name__ == "__main__":
-    np.random.seed(117)
-    simulate_abiogenesis()
+    simulate_abiogenesis(rng=np.random.default_rng(117))
@@ -1,5 +1,8 @@
+import itertools
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,72 +10,159 @@ OMEGA = 117.038
 # Ao contrário do Cas9 (que rasga a topologia -> DSB), o BE apenas rotaciona a informação.
 # Delta S (Entropia) do BE deve ser logarítmicamente menor que Cas9.
 
-def simulate_editing_thermodynamics():
+THERMAL_SCALE = 20.0  # Escala térmica (kT) das energias de ativação
+
+# Catálogo de editores
+# activation_energy: barreira de ativação (unidades kT)
+# topology_exponent: Omega_Factor = Omega^expoente (>0 preserva a estrutura holográfica, <0 rompe)
+# entropy_factor: calor entrópico gerado por unidade de energia dissipada
+EDITORS = {
+    'Cas9 (DSB)': {
+        # DSB (Cas9) = Alta barreira, rompimento topológico crítico
+        'activation_energy': 50.0,
+        'topology_exponent': -0.5,  # Penalidade topológica
+        'entropy_factor': OMEGA,    # DSB gera muito calor entrópico
+    },
+    'Base Editor (Quantum Tunneling)': {
+        # Base Editing = Rotação de bit (Deaminação)
+        'activation_energy': 15.0,
+        'topology_exponent': 0.5,   # Bônus topológico
+        'entropy_factor': 1.0,
+    },
+    'Prime Editor (Nick + RT)': {
+        # Prime Editing = Nick em fita simples + transcrição reversa
+        'activation_energy': 30.0,
+        'topology_exponent': 0.25,
+        'entropy_factor': np.sqrt(OMEGA),
+    },
+}
+
+def editing_rates(activation_energies, topology_exponents):
+    """Constante de taxa k ~ exp(-E/kT) * Omega_Factor (independente do tempo)."""
+    activation_energies = np.asarray(activation_energies, dtype=float)
+    topology_exponents = np.asarray(topology_exponents, dtype=float)
+    return np.exp(-activation_energies / THERMAL_SCALE) * OMEGA ** topology_exponents
+
+def editing_kinetics(time_steps, activation_energies, topology_exponents, entropy_factors):
+    """
+    Curvas de sucesso (%) e entropia colateral de qualquer número de editores,
+    avaliadas sobre uma malha temporal comum numa única expressão com broadcast.
+
+    Os parâmetros podem ter qualquer formato (ex.: (n_editores,) ou uma grade de variantes);
+    o resultado tem formato parâmetros.shape + (len(time_steps),).
+    """
+    activation_energies, topology_exponents, entropy_factors = np.broadcast_arrays(
+        np.asarray(activation_energies, dtype=float),
+        np.asarray(topology_exponents, dtype=float),
+        np.asarray(entropy_factors, dtype=float))
+    k = editing_rates(activation_energies, topology_exponents)[..., None]
+    t = np.asarray(time_steps, dtype=float)
+
+    # Rate equation: dN/dt = k * (N0 - N) -> Cumulative success (Saturação em 100%)
+    p = -np.expm1(-k * t)
+
+    # Entropia gerada (Desperdício de energia/dano colateral)
+    # S ~ Probabilidade * Energia Dissipada
+    entropy = p * (activation_energies * entropy_factors)[..., None]
+    return p * 100, entropy
+
+def catalog_kinetics(time_steps, editors=None):
+    """Avalia as curvas de todos os editores do catálogo. Retorna (nomes, sucesso, entropia)."""
+    if editors is None:
+        editors = EDITORS
+    names = list(editors)
+    params = [editors[name] for name in names]
+    success, entropy = editing_kinetics(
+        time_steps,
+        [e['activation_energy'] for e in params],
+        [e['topology_exponent'] for e in params],
+        [e['entropy_factor'] for e in params])
+    return names, success, entropy
+
+def fit_editor_parameters(time_steps, measured_success, topology_exponent=0.0, fit_plateau=False):
+    """
+    Ajusta a energia de ativação (e opcionalmente o platô de eficiência) a séries
+    temporais medidas de eficiência de edição (%).
+
+    measured_success pode ser 1-D (uma curva) ou 2-D (uma curva por linha).
+    Retorna dict com arrays 'activation_energy', 'rate' e 'plateau' (um valor por curva).
+    """
+    from scipy.optimize import curve_fit
+
+    t = np.asarray(time_steps, dtype=float)
+    curves = np.atleast_2d(np.asarray(measured_success, dtype=float))
+    topology_exponent = np.broadcast_to(np.asarray(topology_exponent, dtype=float), (len(curves),))
+
+    def model(t, log_k, plateau=100.0):
+        return plateau * -np.expm1(-np.exp(log_k) * t)
+
+    rates = np.empty(len(curves))
+    plateaus = np.full(len(curves), 100.0)
+    for i, curve in enumerate(curves):
+        valid = np.isfinite(curve)
+        # Chute inicial: tempo de meia-saturação
+        half = np.argmax(curve[valid] >= 0.5 * np.nanmax(curve))
+        t_half = max(t[valid][half], t[valid][1] if valid.sum() > 1 else 1.0)
+        p0 = [np.log(np.log(2) / t_half)]
+        if fit_plateau:
+            p0.append(max(np.nanmax(curve), 1e-6))
+        popt, _ = curve_fit(model, t[valid], curve[valid], p0=p0, maxfev=10000)
+        rates[i] = np.exp(popt[0])
+        if fit_plateau:
+            plateaus[i] = popt[1]
+
+    # Inverte k = exp(-E/kT) * Omega^expoente
+    activation = -THERMAL_SCALE * (np.log(rates) - topology_exponent * np.log(OMEGA))
+    return {'activation_energy': activation, 'rate': rates, 'plateau': plateaus}
+
+@register_experiment("base_editing_thermo", seed=137)
+def compute_editing_thermodynamics():
     print("Iniciando Experimento 8: Base Editing Thermodynamics...")
-    
-    # Energias de ativação (hipotéticas, em unidades kT)
-    # DSB (Cas9) = Alta barreira, rompimento topológico crítico
-    E_dsb = 50.0 
-    
-    # Base Editing = Rotação de bit (Deaminação)
-    E_be = 15.0
-    
+
     # Simulação de Monte Carlo para taxa de sucesso no tempo
     time_steps = np.linspace(0, 100, 200)
-    
+
     # Probabilidade de transição: P = exp(-DeltaE / kT) * Omega_Factor
     # Omega_Factor: BE preserva a estrutura holográfica (fator > 1), Cas9 rompe (fator < 1)
-    
-    success_rate_cas9 = []
-    success_rate_be = []
-    
-    entropy_generated_cas9 = []
-    entropy_generated_be = []
-    
-    for t in time_steps:
-        # Rate equation: dN/dt = k * (N0 - N)
-        # k ~ exp(-E)
-        
-        k_cas9 = np.exp(-E_dsb / 20.0) * (1.0 / np.sqrt(OMEGA)) # Penalidade topológica
-        k_be = np.exp(-E_be / 20.0) * np.sqrt(OMEGA) # Bônus topológico
-        
-        # Cumulative success (Saturação em 100%)
-        p_cas9 = 1 - np.exp(-k_cas9 * t)
-        p_be = 1 - np.exp(-k_be * t)
-        
-        success_rate_cas9.append(p_cas9 * 100)
-        success_rate_be.append(p_be * 100)
-        
-        # Entropia gerada (Desperdício de energia/dano colateral)
-        # S ~ Probabilidade * Energia Dissipada
-        entropy_generated_cas9.append(p_cas9 * E_dsb * OMEGA) # DSB gera muito calor entrópico
-        entropy_generated_be.append(p_be * E_be)
-        
+    names, success, entropy = catalog_kinetics(time_steps)
+    return {'time_steps': time_steps, 'names': np.array(names), 'success': success, 'entropy': entropy}
+
+@register_renderer("base_editing_thermo")
+def render_editing_thermodynamics(results):
+    import matplotlib.pyplot as plt
+
+    time_steps = results['time_steps']
+    names = [str(name) for name in results['names']]
+    success, entropy = results['success'], results['entropy']
+
     # Plot
     fig, ax1 = plt.subplots(figsize=(10, 6))
-    
+    styles = [{'linestyle': '--'}, {'linewidth': 2}, {'linestyle': ':', 'linewidth': 2}]
+
     ax1.set_xlabel('Time (Simulation Steps)')
     ax1.set_ylabel('Editing Efficiency (%)', color='tab:blue')
-    ax1.plot(time_steps, success_rate_cas9,  color='tab:blue', linestyle='--', label='Cas9 (DSB)')
-    ax1.plot(time_steps, success_rate_be, color='tab:blue', linewidth=2, label='Base Editor (Quantum Tunneling)')
+    for name, curve, style in zip(names, success, itertools.cycle(styles)):
+        ax1.plot(time_steps, curve, color='tab:blue', label=name, **style)
     ax1.tick_params(axis='y', labelcolor='tab:blue')
     ax1.legend(loc='upper left')
-    
+
     ax2 = ax1.twinx()  # instantiate a second axes that shares the same x-axis
-    ax2.set_ylabel('Collateral Entropy (Information Loss)', color='tab:red')  
-    ax2.plot(time_steps, entropy_generated_cas9, color='tab:red', linestyle='--', label='Cas9 Entropy')
-    ax2.plot(time_steps, entropy_generated_be, color='tab:red', linewidth=2, label='BE Entropy')
+    ax2.set_ylabel('Collateral Entropy (Information Loss)', color='tab:red')
+    for name, curve, style in zip(names, entropy, itertools.cycle(styles)):
+        ax2.plot(time_steps, curve, color='tab:red', label=f'{name.split(" (")[0]} Entropy', **style)
     ax2.tick_params(axis='y', labelcolor='tab:red')
     # ax2.legend(loc='upper right')
-    
+
     plt.title('Thermodynamic Comparison: Cas9 vs Base Editing')
-    fig.tight_layout()  
+    fig.tight_layout()
     plt.grid(True, alpha=0.3)
-    
+
     outfile = "../imgs/base_editing_thermo_results.png"
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_editing_thermodynamics():
+    render_editing_thermodynamics(compute_editing_thermodynamics())
+
 if __name__ == "__main__":
-    np.random.seed(137)
     simulate_editing_thermodynamics()
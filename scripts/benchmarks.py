@@ -0,0 +1,292 @@
+"""
+Suíte de benchmarks dos kernels de simulação
+
+Cada benchmark declara uma escada de tamanhos; para cada tamanho são medidos o tempo
+(mínimo e mediana de várias repetições), o pico de memória alocada (tracemalloc, numa
+execução separada) e, sobre a escada, o expoente de escala (inclinação de log(tempo)
+contra log(tamanho)). Os resultados são anexados a um histórico JSON (uma linha por
+execução, com commit e versões), e a comparação com a execução anterior evidencia
+regressões e ganhos entre commits.
+
+Uso:
+    python benchmarks.py [-k filtro] [--quick] [--min-time S] [--no-save] [--list]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import dna_kernels
+import epigenetic_bits
+import graph_kernels
+import jit_kernels
+import kmer_entropy
+import lz_complexity
+import offtarget_scan
+import multiverse_map
+import reality_patch
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(SCRIPT_DIR, "..", ".benchmarks", "history.jsonl")
+
+# Razão de tempo a partir da qual a comparação sinaliza regressão / ganho
+REGRESSION_RATIO = 1.25
+
+# Registro global: nome -> (setup, tamanhos)
+BENCHMARKS = {}
+
+def benchmark(name, sizes):
+    """
+    Decorador que registra um benchmark. `setup(n, rng)` prepara as entradas para o
+    tamanho n e devolve a função sem argumentos a ser medida.
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, list(sizes))
+        return setup
+    return decorator
+
+def random_sequence(n, rng):
+    return "".join(np.array(list("ATCG"))[rng.integers(0, 4, n)])
+
+# --- Kernels ---
+
+@benchmark("calculate_omega_resonance", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_omega_resonance(n, rng):
+    seq = random_sequence(n, rng)
+    return lambda: dna_kernels.calculate_omega_resonance(seq)
+
+@benchmark("simulate_radiation_damage", sizes=[1_000, 10_000, 100_000])
+def bench_radiation_damage(n, rng):
+    seq = random_sequence(n, rng)
+    return lambda: dna_kernels.simulate_radiation_damage(seq, radiation_dose=0.1, rng=rng)
+
+@benchmark("holographic_noise_simulation", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_holographic_noise(n, rng):
+    genome = (rng.random(n) < 0.02).astype(float)
+    return lambda: dna_kernels.holographic_noise_simulation(genome, intensity=0.2, rng=rng)
+
+@benchmark("entropic_distance", sizes=[20, 200, 2_000, 20_000])
+def bench_entropic_distance(n, rng):
+    s1, s2 = random_sequence(n, rng), random_sequence(n, rng)
+    return lambda: dna_kernels.entropic_distance(s1, s2)
+
+@benchmark("calculate_information_flow", sizes=[50, 100, 200, 400])
+def bench_information_flow(n, rng):
+    import networkx as nx
+    G = nx.watts_strogatz_graph(n, k=6, p=0.1, seed=int(rng.integers(2**31)))
+    return lambda: graph_kernels.calculate_information_flow(G)
+
+@benchmark("epigenetic_lattice_step", sizes=[10_000, 40_000, 160_000, 640_000, 2_560_000])
+def bench_epigenetic_step(n, rng):
+    side = int(np.sqrt(n))
+    grid = epigenetic_bits.omega_memory_pattern(side)
+    noise_map = rng.random((side, side))
+    return lambda: epigenetic_bits.epigenetic_lattice_step(grid, noise_map, 50)
+
+@benchmark("scan_multiverse", sizes=[10_000, 40_000, 160_000, 640_000])
+def bench_multiverse_scan(n, rng):
+    side = int(np.sqrt(n))
+    cmb_map = rng.normal(2.725, 0.00002, (side, side))
+    return lambda: multiverse_map.scan_multiverse(cmb_map.copy(), rng=rng)
+
+@benchmark("reality_patch_filter", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_reality_patch(n, rng):
+    signal = rng.normal(0, 1, n)
+    return lambda: reality_patch.reality_patch_filter(signal)
+
+@benchmark("clamped_walk", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_clamped_walk(n, rng):
+    increments = rng.uniform(-0.5, 0.4, n)
+    return lambda: jit_kernels.clamped_walk(1.0, increments)
+
+@benchmark("kuramoto_coherence", sizes=[200, 2_000, 20_000])
+def bench_kuramoto(n, rng):
+    phases_a, phases_b = rng.uniform(0, 2 * np.pi, (2, 100))
+    coupling = np.where(np.arange(n) > n // 2, 1.618, 0.5)
+    noise = rng.normal(0, 0.05, n)
+    return lambda: jit_kernels.kuramoto_coherence(phases_a, phases_b, 0.1, 1.17, coupling, noise)
+
+@benchmark("global_efficiency", sizes=[50, 100, 200, 400])
+def bench_global_efficiency(n, rng):
+    import networkx as nx
+    A = nx.to_scipy_sparse_array(nx.watts_strogatz_graph(n, k=6, p=0.1, seed=int(rng.integers(2**31))),
+                                 format='csr')
+    return lambda: jit_kernels.global_efficiency(A.indptr, A.indices)
+
+@benchmark("block_entropies", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_block_entropies(n, rng):
+    seq = random_sequence(n, rng)
+    return lambda: kmer_entropy.block_entropies(seq, 12)
+
+@benchmark("population_block_entropy", sizes=[1_000, 10_000, 100_000])
+def bench_population_block_entropy(n, rng):
+    codes = rng.integers(1, 5, (n, 50), dtype=np.uint8)
+    return lambda: kmer_entropy.population_block_entropy(codes, 4)
+
+@benchmark("rolling_entropic_signature", sizes=[10_000, 100_000, 1_000_000, 10_000_000])
+def bench_rolling_entropic_signature(n, rng):
+    seq = random_sequence(n, rng)
+    return lambda: dna_kernels.rolling_entropic_signature(seq, 20)
+
+@benchmark("offtarget_scan", sizes=[100_000, 1_000_000, 4_000_000])
+def bench_offtarget_scan(n, rng):
+    genome = random_sequence(n, rng)
+    guides = [random_sequence(20, rng) for _ in range(8)]
+    return lambda: offtarget_scan.offtarget_scan(guides, genome, max_edits=3)
+
+@benchmark("lz76_complexity", sizes=[1_000, 10_000, 100_000, 1_000_000])
+def bench_lz76_complexity(n, rng):
+    seq = random_sequence(n, rng)
+    return lambda: lz_complexity.lz76_complexity(seq)
+
+@benchmark("lz76_batch", sizes=[1_000, 10_000, 100_000])
+def bench_lz76_batch(n, rng):
+    codes = rng.integers(1, 5, (n, 50), dtype=np.uint8)
+    return lambda: lz_complexity.lz76_batch(codes)
+
+# --- Medição ---
+
+def time_call(fn, min_time=0.2, max_repeat=50):
+    """Repete fn até acumular min_time segundos (mínimo 3 vezes). Retorna (mínimo, mediana, n)."""
+    fn()  # aquecimento (caches, importações tardias)
+    times = []
+    total = 0.0
+    while len(times) < 3 or (total < min_time and len(times) < max_repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return min(times), float(np.median(times)), len(times)
+
+def peak_memory(fn):
+    """Pico de memória alocada (bytes) durante uma chamada, incluindo buffers do numpy."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def scaling_exponent(sizes, times):
+    """Inclinação de log(tempo) x log(tamanho): ~1 linear, ~2 quadrático."""
+    if len(sizes) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return float(slope)
+
+def run_benchmark(name, quick=False, min_time=0.2, seed=0):
+    setup, sizes = BENCHMARKS[name]
+    if quick:
+        sizes = sizes[:2]
+    points = []
+    for n in sizes:
+        fn = setup(n, np.random.default_rng(seed))
+        best, median, repeats = time_call(fn, min_time)
+        points.append({'size': n, 'time_min': best, 'time_median': median,
+                       'repeats': repeats, 'peak_bytes': peak_memory(fn)})
+    exponent = scaling_exponent([p['size'] for p in points], [p['time_min'] for p in points])
+    return {'name': name, 'points': points, 'scaling_exponent': exponent}
+
+# --- Histórico ---
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                             capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=SCRIPT_DIR, capture_output=True, text=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_history(path, record):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+
+def previous_point(history, name, size):
+    """Tempo mínimo mais recente registrado para (benchmark, tamanho)."""
+    for record in reversed(history):
+        for bench in record['benchmarks']:
+            if bench['name'] != name:
+                continue
+            for point in bench['points']:
+                if point['size'] == size:
+                    return point['time_min']
+    return None
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def print_report(results, history):
+    print(f"{'Kernel':<30} {'Tamanho':>10} {'Tempo (mín)':>12} {'Memória':>10}  Anterior")
+    print("-" * 80)
+    for bench in results:
+        for p in bench['points']:
+            previous = previous_point(history, bench['name'], p['size'])
+            change = ""
+            if previous:
+                ratio = p['time_min'] / previous
+                flag = " REGRESSÃO" if ratio > REGRESSION_RATIO else (" ganho" if ratio < 1 / REGRESSION_RATIO else "")
+                change = f"{ratio:.2f}x{flag}"
+            print(f"{bench['name']:<30} {p['size']:>10} {format_time(p['time_min']):>12} "
+                  f"{p['peak_bytes'] / 2**20:>8.1f}MB  {change}")
+        if bench['scaling_exponent'] is not None:
+            print(f"{'':<30} {'expoente de escala':>23} {bench['scaling_exponent']:.2f}")
+    print("-" * 80)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos kernels de simulação.")
+    parser.add_argument("-k", dest="filter", default=None, help="Roda apenas benchmarks cujo nome contém o filtro")
+    parser.add_argument("--quick", action="store_true", help="Apenas os dois menores tamanhos de cada escada")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Tempo mínimo acumulado por medida (s)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="Arquivo de histórico (JSON lines)")
+    parser.add_argument("--no-save", action="store_true", help="Não grava no histórico")
+    parser.add_argument("--list", action="store_true", help="Lista os benchmarks e suas escadas")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.list:
+        for name, (_, sizes) in BENCHMARKS.items():
+            print(f"{name:<30} {sizes}")
+        sys.exit(0)
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    history = load_history(args.history)
+    results = []
+    for name in names:
+        print(f"▶ {name}...", flush=True)
+        results.append(run_benchmark(name, quick=args.quick, min_time=args.min_time))
+
+    print_report(results, history)
+    if not args.no_save:
+        append_history(args.history, {
+            'timestamp': time.time(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'quick': args.quick,
+            'benchmarks': results,
+        })
+        print(f"Histórico atualizado: {os.path.relpath(args.history)}")
@@ -1,6 +1,13 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
+
+from checkpoint import checkpointer
+from graph_kernels import calculate_information_flow
+from experiments import register_experiment, register_renderer
+from instrumentation import count, stage
+from recorders import Recorder
+from render_utils import plot_history
+from rng_streams import ensure_rng
+from plot_style import apply_publication_style
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,95 +15,126 @@ OMEGA = 117.038
 # A eficiência catalítica depende da topologia da rede de resíduos (aminoácidos).
 # O fluxo de informação deve minimizar a entropia de Von Neumann.
 
-def create_protein_network(n_residues=100):
+def create_protein_network(n_residues=100, rng=None):
     """
     Cria um grafo representando a proteína.
     Nós = Aminoácidos
     Arestas = Contatos físicos/químicos
     """
+    import networkx as nx
+
     # Modelo Small-World (propriedade comum em proteínas)
-    G = nx.watts_strogatz_graph(n_residues, k=6, p=0.1)
+    G = nx.watts_strogatz_graph(n_residues, k=6, p=0.1, seed=ensure_rng(rng))
     return G
 
-def calculate_information_flow(G):
+@register_experiment("cas9_flow", seed=137)
+def compute_cas9_topology(generations=50, history_points=0, rng=None):
     """
-    Calcula a eficiência do fluxo de informação usando
-    Centralidade de Informação e Entropia do Grafo.
+    Otimização de Metropolis da rede de resíduos. history_points > 0 limita os históricos
+    a esse número de pontos (decimação; média/variância continuam sobre todas as gerações).
     """
-    # Espectro do Laplaciano
-    L = nx.laplacian_matrix(G).toarray().astype(float)
-    eigenvalues = np.linalg.eigvalsh(L)
-    
-    # Entropia Espectral (Von Neumann)
-    # S = - sum(lambda * log(lambda)) (normalizado)
-    eigenvalues = eigenvalues[eigenvalues > 1e-10] # Remove zero
-    prob = eigenvalues / np.sum(eigenvalues)
-    entropy = -np.sum(prob * np.log(prob))
-    
-    # Eficiência Global 
-    efficiency = nx.global_efficiency(G)
-    
-    return efficiency, entropy
-
-def optimize_cas9_topology(generations=50):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 5: Otimização Topológica da Cas9...")
     
-    G = create_protein_network(150) # Modelo simplificado da Cas9
+    G = create_protein_network(150, rng) # Modelo simplificado da Cas9
     
-    history_eff = []
-    history_ent = []
+    history_eff = Recorder(generations, max_points=history_points or None)
+    history_ent = Recorder(generations, max_points=history_points or None)
     
     print(f"Otimizando rede de {len(G.nodes)} resíduos por {generations} gerações...")
     
-    for gen in range(generations):
+    # Checkpoint: nós, arestas, históricos e estado do gerador (ver checkpoint.py)
+    ckpt = checkpointer("cas9_flow", {'generations': generations, 'residues': len(G),
+                                      'history_points': history_points})
+    start = 0
+    if ckpt is not None:
+        start, state = ckpt.load(rng)
+        if state is not None:
+            import networkx as nx
+
+            G = nx.Graph()
+            G.add_nodes_from(state['nodes'].tolist())
+            G.add_edges_from(state['edges'].tolist())
+            history_eff.restore(state, 'history_eff.')
+            history_ent.restore(state, 'history_ent.')
+    
+    # Pontuação do estado atual da cadeia (só muda quando uma mutação é aceita)
+    eff_orig, ent_orig = calculate_information_flow(G)
+    
+    for gen in range(start, generations):
         # Mutação: Rewiring (mudança conformacional ou mutação pontual)
-        G_mut = G.copy()
-        
-        # Escolhe aresta para remover e uma para adicionar
-        edges = list(G_mut.edges())
-        if edges:
-            rem_edge = edges[np.random.randint(len(edges))]
-            G_mut.remove_edge(*rem_edge)
+        with stage("mutation"):
+            G_mut = G.copy()
             
-        nodes = list(G_mut.nodes())
-        u, v = np.random.choice(nodes, 2, replace=False)
-        G_mut.add_edge(u, v)
+            # Escolhe aresta para remover e uma para adicionar
+            # (ordem canônica: o sorteio depende só do conjunto de arestas, não da ordem interna do grafo)
+            edges = sorted((min(a, b), max(a, b)) for a, b in G_mut.edges())
+            if edges:
+                rem_edge = edges[rng.integers(len(edges))]
+                G_mut.remove_edge(*rem_edge)
+                
+            nodes = list(G_mut.nodes())
+            u, v = rng.choice(nodes, 2, replace=False)
+            G_mut.add_edge(u, v)
         
         # Seleção: Critério Omega
         # A natureza busca MAXIMIZAR eficiência e MINIMIZAR entropia (Free Energy Minimization)
         # TAMESIS: Otimização próxima a criticalidade Omega? 
         # Vamos assumir critério simples: E = Efficiency - Entropy
         
-        eff_orig, ent_orig = calculate_information_flow(G)
-        eff_mut, ent_mut = calculate_information_flow(G_mut)
-        
-        score_orig = eff_orig * 10 - ent_orig
-        score_mut = eff_mut * 10 - ent_mut
+        with stage("scoring"):
+            eff_mut, ent_mut = calculate_information_flow(G_mut)
+            
+            score_orig = eff_orig * 10 - ent_orig
+            score_mut = eff_mut * 10 - ent_mut
         
-        if score_mut > score_orig:
-            G = G_mut
-            history_eff.append(eff_mut)
-            history_ent.append(ent_mut)
-        else:
-            # Metropolis criterion (Temperatura térmica)
-            if np.random.random() < 0.1: # Aceita ruim as vezes
+        with stage("selection"):
+            if score_mut > score_orig:
                 G = G_mut
+                eff_orig, ent_orig = eff_mut, ent_mut
                 history_eff.append(eff_mut)
                 history_ent.append(ent_mut)
+                count("accepted")
             else:
-                history_eff.append(eff_orig)
-                history_ent.append(ent_orig)
-                
+                # Metropolis criterion (Temperatura térmica)
+                if rng.random() < 0.1: # Aceita ruim as vezes
+                    G = G_mut
+                    eff_orig, ent_orig = eff_mut, ent_mut
+                    history_eff.append(eff_mut)
+                    history_ent.append(ent_mut)
+                    count("accepted")
+                else:
+                    history_eff.append(eff_orig)
+                    history_ent.append(ent_orig)
+        
+        if ckpt is not None:
+            ckpt.maybe_save(gen + 1, lambda: {'nodes': np.array(list(G.nodes())),
+                                              'edges': np.array(list(G.edges())).reshape(-1, 2),
+                                              **history_eff.state('history_eff.'),
+                                              **history_ent.state('history_ent.')}, rng)
+
+    if ckpt is not None:
+        ckpt.finish()
+
+    return {'history_eff': history_eff.values, 'history_ent': history_ent.values,
+            'history_steps': history_eff.steps}
+
+@register_renderer("cas9_flow")
+def render_cas9_topology(results):
+    import matplotlib.pyplot as plt
+
+    history_eff = results['history_eff']
+    history_ent = results['history_ent']
+    steps = results.get('history_steps', np.arange(len(history_eff)))
+
     # Plot - Estilo Publicação Científica
     plt.figure(figsize=(12, 5), dpi=300)
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.size'] = 11
-    plt.rcParams['axes.linewidth'] = 1.2
+    apply_publication_style(font_size=11)
     
     # Subplot 1: Eficiência
     ax1 = plt.subplot(1, 2, 1)
-    ax1.plot(history_eff, color='#1f77b4', linewidth=2.5, label='Network Efficiency')
-    ax1.fill_between(range(len(history_eff)), history_eff, 
+    plot_history(ax1, history_eff, x=steps, color='#1f77b4', linewidth=2.5, label='Network Efficiency')
+    ax1.fill_between(steps, history_eff, 
                     alpha=0.3, color='#1f77b4')
     ax1.set_title('(a) Catalytic Efficiency Evolution', 
                  fontsize=12, fontweight='bold', pad=10)
@@ -107,15 +145,15 @@ def optimize_cas9_topology(generations=50):
     ax1.spines['right'].set_visible(False)
     
     # Região de convergência
-    conv_start = len(history_eff) * 2 // 3
-    ax1.axvspan(conv_start, len(history_eff), alpha=0.1, color='green')
+    conv_start = (steps[-1] + 1) * 2 // 3
+    ax1.axvspan(conv_start, steps[-1] + 1, alpha=0.1, color='green')
     ax1.text(conv_start + 3, min(history_eff) + 0.01, 'Convergence', 
             fontsize=9, style='italic', color='darkgreen')
     
     # Subplot 2: Entropia
     ax2 = plt.subplot(1, 2, 2)
-    ax2.plot(history_ent, color='#d62728', linewidth=2.5, label='Von Neumann Entropy')
-    ax2.fill_between(range(len(history_ent)), history_ent, 
+    plot_history(ax2, history_ent, x=steps, color='#d62728', linewidth=2.5, label='Von Neumann Entropy')
+    ax2.fill_between(steps, history_ent, 
                     alpha=0.3, color='#d62728')
     ax2.set_title('(b) Entropy Minimization', 
                  fontsize=12, fontweight='bold', pad=10)
@@ -126,9 +164,9 @@ def optimize_cas9_topology(generations=50):
     ax2.spines['right'].set_visible(False)
     
     # Linha de tendência
-    z = np.polyfit(range(len(history_ent)), history_ent, 2)
+    z = np.polyfit(steps, history_ent, 2)
     p = np.poly1d(z)
-    ax2.plot(range(len(history_ent)), p(range(len(history_ent))), 
+    ax2.plot(steps, p(steps), 
             "--", color='black', linewidth=1.5, alpha=0.6, label='Trend')
     ax2.legend(fontsize=9, loc='upper right', frameon=True)
     
@@ -137,6 +175,8 @@ def optimize_cas9_topology(generations=50):
     plt.savefig(outfile, dpi=300, bbox_inches='tight')
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def optimize_cas9_topology(generations=50, history_points=0, rng=None):
+    render_cas9_topology(compute_cas9_topology(generations, history_points, rng=rng))
+
 if __name__ == "__main__":
-    np.random.seed(137) # Fine structure constant seed
-    optimize_cas9_topology()
+    optimize_cas9_topology(rng=np.random.default_rng(137)) # Fine structure constant seed
@@ -0,0 +1,117 @@
+"""
+Checkpoints de laços longos (evolução, otimização, gerações)
+
+O laço grava periodicamente o próprio estado (população/grafo, históricos), o estado
+do gerador aleatório e o passo atual num `.npz` (formato de `results_io`, escrita
+atômica: um processo morto no meio da gravação nunca corrompe o último checkpoint).
+Com `resume=True` o laço continua do passo salvo com o mesmo fluxo aleatório, e o
+resultado é idêntico ao de uma execução sem interrupção. O checkpoint só é retomado
+pela mesma execução: parâmetros do laço, estado inicial do gerador (semente), precisão
+(`precision.py`) e código de cálculo do módulo (`result_cache.code_fingerprint`) fazem
+parte da sua identidade, e qualquer diferença é um erro.
+
+    ckpt = checkpointer("entropic_dna", {"generations": generations})
+    start, state = ckpt.load(rng) if ckpt else (0, None)
+    for step in range(start, n):
+        ...
+        if ckpt:
+            ckpt.maybe_save(step + 1, {...}, rng)
+    if ckpt:
+        ckpt.finish()
+
+Os laços só gravam dentro de `checkpointing(...)` (ligado por `run_all_simulations.py`,
+opções --checkpoint-dir/--checkpoint-interval/--resume); fora dele `checkpointer`
+devolve None e não há custo.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+
+import precision
+from results_io import load_results, save_results
+
+DEFAULT_INTERVAL = 30.0  # segundos entre checkpoints
+
+_active = None  # (diretório, resume, intervalo)
+
+@contextlib.contextmanager
+def checkpointing(directory, resume=False, interval=DEFAULT_INTERVAL):
+    """Liga os checkpoints dos laços executados dentro do bloco."""
+    global _active
+    previous = _active
+    _active = (os.path.abspath(directory), resume, interval)
+    try:
+        yield
+    finally:
+        _active = previous
+
+def checkpointer(name, params=None):
+    """Checkpointer do laço `name` se os checkpoints estiverem ligados, senão None."""
+    if _active is None:
+        return None
+    directory, resume, interval = _active
+    from result_cache import code_fingerprint
+
+    # Código de cálculo do módulo que chama (o laço), como na chave do cache
+    module = sys._getframe(1).f_globals['__name__']
+    return Checkpointer(os.path.join(directory, name + ".ckpt.npz"), params, resume, interval,
+                        code=code_fingerprint(module))
+
+def _rng_fingerprint(rng):
+    state = json.dumps(rng.bit_generator.state, sort_keys=True, default=str)
+    return hashlib.sha256(state.encode()).hexdigest()
+
+class Checkpointer:
+    """Grava e recupera o estado de um laço (dict de arrays + estado do gerador + passo)."""
+
+    def __init__(self, path, params=None, resume=False, interval=DEFAULT_INTERVAL, code=None):
+        self.path = path
+        self.params = dict(params or {})
+        self.resume = resume
+        self.interval = interval
+        self.last_save = time.monotonic()
+        # Identidade da execução; o estado inicial do gerador entra em `load`
+        self.identity = {'precision': precision.get_precision(), 'code': code, 'rng': None}
+
+    def load(self, rng):
+        """
+        (passo, estado) do último checkpoint, restaurando o estado de `rng`; (0, None)
+        se não houver checkpoint ou resume=False. Chamado no início do laço, com o gerador
+        ainda no estado inicial. Parâmetros, semente, precisão ou código diferentes são um erro.
+        """
+        self.identity['rng'] = _rng_fingerprint(rng)
+        if not self.resume or not os.path.exists(self.path):
+            return 0, None
+        state, meta = load_results(self.path)
+        if meta.get('params') != self.params:
+            raise ValueError(f"Checkpoint {self.path} foi gravado com outros parâmetros: "
+                             f"{meta.get('params')} != {self.params}")
+        saved = meta.get('identity') or {}
+        different = [key for key, value in self.identity.items() if saved.get(key) != value]
+        if different:
+            labels = {'precision': 'precisão', 'code': 'código', 'rng': 'semente (estado inicial do gerador)'}
+            raise ValueError(f"Checkpoint {self.path} foi gravado por outra execução: "
+                             f"{', '.join(labels[key] for key in different)} diferente(s)")
+        rng.bit_generator.state = meta['rng_state']
+        print(f"Retomando do checkpoint {os.path.relpath(self.path)} (passo {meta['step']})")
+        return meta['step'], state
+
+    def save(self, step, state, rng):
+        save_results(self.path, state, meta={'step': step, 'params': self.params,
+                                             'identity': self.identity,
+                                             'rng_state': rng.bit_generator.state,
+                                             'saved': time.time()})
+        self.last_save = time.monotonic()
+
+    def maybe_save(self, step, state, rng):
+        """Grava se o intervalo passou. `state` pode ser uma função (só chamada ao gravar)."""
+        if time.monotonic() - self.last_save >= self.interval:
+            self.save(step, state() if callable(state) else state, rng)
+
+    def finish(self):
+        """Laço concluído: remove o checkpoint."""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
@@ -1,5 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,14 +9,16 @@ OMEGA = 117.038
 # sem quebrar a causalidade, SE a informação for "Self-Consistent" (Princípio de Novikov).
 # O canal só abre se S(msg) < S(critical) / Omega.
 
-def simulate_chrono_telephony(attempts=200):
+@register_experiment("chrono_telephony", seed=int(OMEGA))
+def compute_chrono_telephony(attempts=200, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 15: Chrono-Telephony (Retro-Causalidade)...")
     
     # Tentativa de enviar um "bit" para t-10
     # O universo impõe uma barreira de ruído para prevenir paradoxos.
     # A "Força de Censura Cósmica".
     
-    noise_barrier = np.random.normal(5, 2, attempts)
+    noise_barrier = rng.normal(5, 2, attempts)
     signal_strength = np.linspace(0, 10, attempts) # Aumentando a energia do transmissor
     
     # Omega Modulation: O sinal é modulado fractalmente para "enganar" o censor cósmico.
@@ -42,7 +46,7 @@ def simulate_chrono_telephony(attempts=200):
         # Probabilidade de Tunneling
         tunnel_prob = 1 / (1 + np.exp(-(omega_boost[t] - noise_barrier[t])))
         
-        if np.random.random() < tunnel_prob:
+        if rng.random() < tunnel_prob:
             received_omega = 1.0 # Bit recebido no passado!
         else:
             received_omega = 0.0
@@ -53,6 +57,18 @@ def simulate_chrono_telephony(attempts=200):
     window = 10
     omega_smooth = np.convolve(received_signal_omega, np.ones(window)/window, mode='same')
 
+    return {'signal_strength': signal_strength,
+            'received_signal_standard': np.array(received_signal_standard),
+            'omega_smooth': omega_smooth}
+
+@register_renderer("chrono_telephony")
+def render_chrono_telephony(results):
+    import matplotlib.pyplot as plt
+
+    signal_strength = results['signal_strength']
+    received_signal_standard = results['received_signal_standard']
+    omega_smooth = results['omega_smooth']
+
     # Plot
     plt.figure(figsize=(10, 6))
     plt.plot(signal_strength, received_signal_standard, 'r--', label='Transmissor Padrão (Paradox Blocked)')
@@ -74,6 +90,8 @@ def simulate_chrono_telephony(attempts=200):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_chrono_telephony(attempts=200, rng=None):
+    render_chrono_telephony(compute_chrono_telephony(attempts, rng))
+
 if __name__ == "__main__":
-    np.random.seed(OMEGA.__int__())
-    simulate_chrono_telephony()
+    simulate_chrono_telephony(rng=np.random.default_rng(int(OMEGA)))
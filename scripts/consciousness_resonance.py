@@ -1,5 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from jit_kernels import kuramoto_coherence
+from plot_style import apply_publication_style
+from render_utils import colored_line
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,7 +13,9 @@ OMEGA = 117.038
 # O DNA atua como "Cloud Storage" para a RAM neural.
 # Ressonância = (Freq_Neural / Freq_Genomica) ~ Phi (Golden Ratio)
 
-def simulate_consciousness_resonance(time_steps=200):
+@register_experiment("consciousness_resonance", seed=117)
+def compute_consciousness_resonance(time_steps=200, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 10: Consciousness Resonance Interface...")
     
     # Frequências (Hz)
@@ -18,50 +25,43 @@ def simulate_consciousness_resonance(time_steps=200):
     # Modelagem: Dois osciladores acoplados (Kuramoto Model)
     # Theta_1 (Neural), Theta_2 (Genetic)
     
-    phases_neural = np.random.uniform(0, 2*np.pi, 100)
-    phases_genetic = np.random.uniform(0, 2*np.pi, 100)
-    
-    coherence_history = []
+    phases_neural = rng.uniform(0, 2*np.pi, 100)
+    phases_genetic = rng.uniform(0, 2*np.pi, 100)
     
     # Coupling Strengths
     K_normal = 0.5 # Acoplamento padrão
     K_omega = 1.618 # Acoplamento no "God Mode" (Estado de Fluxo/Meditação)
     
-    # Simular transição para estado Omega no meio (t=100)
-    K = K_normal
+    # Simular transição para estado Omega no meio (t=100): Ativação da Glândula Pineal/Ressonância
+    coupling = np.where(np.arange(time_steps) > 100, K_omega, K_normal)
+    noise = rng.normal(0, 0.05, time_steps)
     
-    for t in range(time_steps):
-        if t > 100:
-            K = K_omega # Ativação da Glândula Pineal/Ressonância
-            
-        # Update Kuramoto
-        # dTheta/dt = w + K * sum(sin(theta_j - theta_i))
-        
-        # Interação Neural-Genética
-        interaction = np.mean(np.sin(phases_genetic - phases_neural))
-        
-        phases_neural += 0.1 + K * interaction + np.random.normal(0, 0.05)
-        phases_genetic += 0.1 * OMEGA/100 + K * interaction # Genética tem inércia (Omega)
-        
-        # Medida de Sincronia (Order Parameter)
-        order_param = np.abs(np.mean(np.exp(1j * (phases_neural - phases_genetic))))
-        coherence_history.append(order_param)
-        
+    # Update Kuramoto, passo a passo (kernel sequencial, JIT opcional)
+    # dTheta/dt = w + K * sum(sin(theta_j - theta_i))
+    # Interação Neural-Genética; Genética tem inércia (Omega)
+    # Medida de Sincronia (Order Parameter) a cada passo
+    coherence_history = kuramoto_coherence(phases_neural, phases_genetic, 0.1, 0.1 * OMEGA/100,
+                                           coupling, noise)
+
+    return {'coherence_history': coherence_history}
+
+@register_renderer("consciousness_resonance")
+def render_consciousness_resonance(results):
+    import matplotlib.pyplot as plt
+
+    coherence_history = results['coherence_history']
+
     # Plot - Estilo Publicação Científica
     plt.figure(figsize=(11, 6), dpi=300)
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.size'] = 11
-    plt.rcParams['axes.linewidth'] = 1.2
+    apply_publication_style(font_size=11)
     
     ax = plt.gca()
     time_array = np.arange(len(coherence_history))
     
-    # Plot com gradiente de cor
-    for i in range(len(coherence_history)-1):
-        color = '#9467bd' if i < 100 else '#d62728'
-        alpha = 0.7 if i < 100 else 0.9
-        plt.plot(time_array[i:i+2], coherence_history[i:i+2], 
-                color=color, linewidth=3, alpha=alpha)
+    # Plot com gradiente de cor (uma única LineCollection)
+    colored_line(ax, time_array, coherence_history,
+                 colors=lambda t: np.where(t < 100, '#9467bd', '#d62728'),
+                 alpha=lambda t: np.where(t < 100, 0.7, 0.9), linewidth=3)
     
     # Linha de transição
     plt.axvline(x=100, color='#ff7f0e', linestyle='--', linewidth=2.5, 
@@ -69,7 +69,7 @@ def simulate_consciousness_resonance(time_steps=200):
     
     # Regiões sombreadas
     plt.axvspan(0, 100, alpha=0.15, color='blue', label='Normal State')
-    plt.axvspan(100, 200, alpha=0.15, color='red', label='Resonant State')
+    plt.axvspan(100, len(coherence_history), alpha=0.15, color='red', label='Resonant State')
     
     plt.title('Neural-Genomic Phase Synchronization Dynamics', 
              fontsize=13, fontweight='bold', pad=15)
@@ -99,6 +99,8 @@ def simulate_consciousness_resonance(time_steps=200):
     plt.savefig(outfile, dpi=300, bbox_inches='tight')
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_consciousness_resonance(time_steps=200, rng=None):
+    render_consciousness_resonance(compute_consciousness_resonance(time_steps, rng))
+
 if __name__ == "__main__":
-    np.random.seed(117)
-    simulate_consciousness_resonance()
+    simulate_consciousness_resonance(rng=np.random.default_rng(117))
@@ -0,0 +1,272 @@
+"""
+Kernels de sequência de DNA (núcleo leve, sem dependências de visualização)
+
+Funções de medida e de dano reutilizadas pelos experimentos e pelos benchmarks.
+Importar este módulo carrega apenas numpy; os scripts de simulação reexportam
+estes nomes para manter a compatibilidade.
+"""
+from collections import Counter
+
+import numpy as np
+
+from instrumentation import stage, timed
+from precision import float_dtype
+from rng_streams import ensure_rng
+
+# --- CONSTANTES TAMESIS ---
+OMEGA = 117.038
+
+# Tabela de conversão ASCII -> código numérico (A=1, T=2, C=3, G=4; outros = 0)
+BASE_LUT = np.zeros(256, dtype=np.int8)
+for _code, _base in enumerate("ATCG", start=1):
+    BASE_LUT[ord(_base)] = _code
+
+# --- Medidas de sequência (entropic_dna) ---
+
+def calculate_shannon_entropy(sequence):
+    """Calcula a entropia de Shannon de uma sequência de DNA."""
+    if not sequence:
+        return 0
+    counts = Counter(sequence)
+    total = len(sequence)
+    entropy = 0
+    for count in counts.values():
+        p = count / total
+        entropy -= p * np.log2(p)
+    return entropy
+
+def calculate_omega_resonance(sequence):
+    """
+    Calcula o quão 'ressonante' a sequência é com a constante Omega.
+    Hipótese: Sequências com periodicidade φ ligada a Omega são mais estáveis.
+    """
+    # Transformar sequência em sinal numérico (A=1, T=2, C=3, G=4), na precisão atual
+    codes = BASE_LUT[np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)]
+    numeric_signal = codes.astype(float_dtype())
+    
+    # FFT para análise espectral
+    with stage("fft"):
+        spectrum = np.fft.fft(numeric_signal)
+        freqs = np.fft.fftfreq(len(numeric_signal))
+    
+    # Procurar picos em frequências harmônicas de Omega (simplificado)
+    # Omega scale fundamental: 1/117, 1/sqrt(117), etc.
+    target_freq = 1.0 / np.sqrt(OMEGA)
+    
+    # Encontrar a frequência mais próxima no espectro
+    idx = (np.abs(freqs - target_freq)).argmin()
+    resonance_amplitude = np.abs(spectrum[idx])
+    
+    return resonance_amplitude
+
+# --- Estabilidade sob radiação (omega_stability) ---
+
+def generate_dna_sequence(length=1000, mode='random', rng=None):
+    """Gera sequências de DNA baseadas no modo selecionado."""
+    rng = ensure_rng(rng)
+    bases = np.array(['A', 'T', 'C', 'G'])
+    
+    if mode == 'random':
+        return "".join(bases[rng.integers(0, 4, length)])
+    
+    elif mode == 'omega_resonant':
+        # Gera sequência com periodicidade baseada na raiz de Omega
+        period = int(np.sqrt(OMEGA)) # ~10.8 -> 11 bases
+        pattern = bases[rng.integers(0, 4, period)]
+        
+        # Adiciona base do padrão com pequena chance de erro (ruído entrópico)
+        keep = rng.random(length) > 0.05
+        noise = bases[rng.integers(0, 4, length)]
+        return "".join(np.where(keep, pattern[np.arange(length) % period], noise))
+
+@timed("mutation")
+def simulate_radiation_damage(sequence, radiation_dose=0.1, rng=None):
+    """
+    Simula dano por radiação (decoerência).
+    Sequências ressonantes devem se 'curar' ou resistir melhor (hipótese).
+    Na física TAMESIS, a estrutura topológica impõe correção de erro.
+    """
+    rng = ensure_rng(rng)
+    seq_list = list(sequence)
+    mutations = 0
+    
+    # Sorteios de uma vez: posições atingidas, teste de dano e base substituta de cada acerto
+    hits = np.flatnonzero(rng.random(len(seq_list)) < radiation_dose)
+    damage_draws = rng.random(len(hits))
+    new_bases = np.array(['A', 'T', 'C', 'G'])[rng.integers(0, 4, len(hits))]
+    
+    for i, draw, new_base in zip(hits.tolist(), damage_draws.tolist(), new_bases.tolist()):
+        # Dano ocorre
+        original = seq_list[i]
+        
+        # Hipótese: "Cura" topológica
+        # Se a vizinhança respeita a geometria Omega, o erro é suprimido
+        is_protected = False
+        
+        # Checagem simplificada de "proteção topológica" (vizinhança consistente)
+        # Em TAMESIS real, isso seria um cálculo de invariante de nó (knot theory)
+        period = int(np.sqrt(OMEGA))
+        if i > period and i < len(seq_list) - period:
+            neighbor_consistency = (seq_list[i-period] == original) + (seq_list[i+period] == original)
+            if neighbor_consistency > 0:
+                is_protected = True # Ressonância protege a informação
+        
+        # Se não protegido, muta
+        damage_prob = 0.2 if is_protected else 1.0
+        
+        if draw < damage_prob:
+            seq_list[i] = new_base
+            if seq_list[i] != original:
+                mutations += 1
+            
+    return "".join(seq_list), mutations
+
+# --- Blindagem holográfica (holographic_dna) ---
+
+def generate_genome_segment(size=1000, coding_ratio=0.02, rng=None):
+    """
+    Gera um segmento de genoma.
+    coding_ratio ~ 2% (similar a humanos)
+    """
+    rng = ensure_rng(rng)
+    genome = np.zeros(size)
+    n_coding = int(size * coding_ratio)
+    
+    # Distribui genes aleatoriamente
+    indices = rng.choice(size, n_coding, replace=False)
+    genome[indices] = 1 # 1 = Gene Codificante, 0 = Não-codificante ("Junk")
+    return genome
+
+@timed("mutation")
+def holographic_noise_simulation(genome, intensity=0.1, rng=None):
+    """
+    Simula ruído de informação (mutações/erros de transcrição) entrando no sistema.
+    O ruído entra pela "borda" (não-codificante) e difunde para o "bulk" (genes).
+    """
+    rng = ensure_rng(rng)
+    size = len(genome)
+    damage_map = np.zeros(size)
+    
+    # Ruído aleatório atinge o genoma
+    noise_hits = int(size * intensity)
+    hit_indices = rng.integers(0, size, noise_hits)
+    
+    for idx in hit_indices:
+        # Se bater em região não-codificante (0), o dano é absorvido (dissipado)
+        # Se bater em gene (1), o dano é crítico
+        
+        if genome[idx] == 0:
+            # Absorção entrópica: Junk DNA absorve o erro e reorganiza
+            damage_map[idx] = 0.1 # Dano leve
+        else:
+            # Dano funcional crítico
+            damage_map[idx] = 1.0 # Crítico
+            
+    return np.sum(damage_map)
+
+# --- Assinatura entrópica de gRNA (grna_entropy) ---
+
+def calculate_entropic_signature(seq):
+    """
+    Calcula uma 'assinatura' numérica baseada em pesos TAMESIS.
+    A=1, T=Omega^0.1, C=Omega^0.2, G=Omega^0.3 (hipotético)
+    """
+    mapping = {
+        'A': 1.0, 
+        'T': OMEGA**0.1, 
+        'C': OMEGA**0.2, 
+        'G': OMEGA**0.3
+    }
+    vals = [mapping[b] for b in seq]
+    # Assinatura é a soma ponderada pela posição (topologia)
+    signature = sum(v * (i+1)**0.5 for i, v in enumerate(vals))
+    return signature
+
+def hamming_distance(s1, s2):
+    return sum(c1 != c2 for c1, c2 in zip(s1, s2))
+
+def entropic_distance(s1, s2):
+    sig1 = calculate_entropic_signature(s1)
+    sig2 = calculate_entropic_signature(s2)
+    return abs(sig1 - sig2)
+
+# Valor de cada código (A=1, T=2, C=3, G=4) na assinatura; bases inválidas dão NaN
+SIGNATURE_VALUES = np.array([np.nan, 1.0, OMEGA**0.1, OMEGA**0.2, OMEGA**0.3])
+COMPLEMENT_CODE = np.array([0, 2, 1, 4, 3], dtype=np.int8)
+
+# Janelas por bloco na varredura (limita os temporários a poucos MB)
+SIGNATURE_CHUNK = 1 << 20
+# Acima deste comprimento de janela a correlação usa FFT (overlap-save) em vez de np.convolve
+FFT_MIN_KERNEL = 64
+
+def _valid_convolve(signal, kernel):
+    """np.convolve(signal, kernel, 'valid'), por FFT em blocos para núcleos longos."""
+    k = len(kernel)
+    if k < FFT_MIN_KERNEL or len(signal) < 4 * k:
+        return np.convolve(signal, kernel, 'valid')
+    nfft = 1 << (8 * k - 1).bit_length()
+    block = nfft - k + 1
+    n_out = len(signal) - k + 1
+    n_blocks = -(-n_out // block)
+    padded = np.zeros(n_blocks * block + k - 1, dtype=signal.dtype)
+    padded[:len(signal)] = signal
+    # Blocos de nfft amostras sobrepostos em k - 1 (len(padded) = (n_blocks - 1) * block + nfft)
+    segments = np.lib.stride_tricks.sliding_window_view(padded, nfft)[::block]
+    spectrum = np.fft.rfft(segments, nfft) * np.fft.rfft(kernel, nfft)
+    out = np.fft.irfft(spectrum, nfft)[:, k - 1:k - 1 + block]
+    return out.reshape(-1)[:n_out].astype(signal.dtype, copy=False)
+
+def _sequence_codes(chunk):
+    if isinstance(chunk, str):
+        chunk = chunk.encode('ascii', 'replace')
+    if isinstance(chunk, (bytes, bytearray, memoryview)):
+        return BASE_LUT[np.frombuffer(chunk, dtype=np.uint8)]
+    return np.asarray(chunk, dtype=np.int8)
+
+def iter_entropic_signatures(chunks, k=20, strand='both'):
+    """
+    Assinaturas entrópicas de todas as janelas de k bases de um genoma lido em blocos
+    (str, bytes ou códigos; ex.: `kmer_entropy.fasta_chunks`). Gera (início, assinaturas)
+    por bloco; com strand='both', assinaturas é (fita +, fita -).
+
+    A assinatura da janela s é Σ_j v(x[s+j]) sqrt(j+1): a correlação do sinal mapeado com
+    o núcleo fixo sqrt(1..k). Na fita -, a janela [s, s+k) é lida como complemento reverso,
+    o que equivale a convoluir (sem inverter o núcleo) o sinal dos complementos.
+    """
+    if strand not in ('+', '-', 'both'):
+        raise ValueError(f"Fita desconhecida: {strand} (esperado +, - ou both)")
+    dtype = float_dtype()
+    weights = np.sqrt(np.arange(1, k + 1)).astype(dtype)
+    plus_values = SIGNATURE_VALUES.astype(dtype)
+    minus_values = SIGNATURE_VALUES[COMPLEMENT_CODE].astype(dtype)
+    carry = np.empty(0, dtype=np.int8)
+    start = 0
+    for chunk in chunks:
+        codes = np.concatenate([carry, _sequence_codes(chunk)])
+        if len(codes) < k:
+            carry = codes
+            continue
+        with stage("signature"):
+            result = []
+            if strand in ('+', 'both'):
+                result.append(_valid_convolve(plus_values[codes], weights[::-1]))
+            if strand in ('-', 'both'):
+                result.append(_valid_convolve(minus_values[codes], weights))
+        yield start, tuple(result) if strand == 'both' else result[0]
+        start += len(codes) - k + 1
+        carry = codes[len(codes) - k + 1:]
+
+@timed("rolling_entropic_signature")
+def rolling_entropic_signature(sequence, k=20, strand='both', chunk=SIGNATURE_CHUNK):
+    """
+    Assinaturas entrópicas (`calculate_entropic_signature`) de todas as janelas de k bases,
+    calculadas em blocos de `chunk` janelas. strand='both' retorna (fita +, fita -).
+    """
+    n = len(sequence)
+    pieces = (sequence[s:s + chunk] for s in range(0, n, chunk))
+    parts = [sig for _, sig in iter_entropic_signatures(pieces, k, strand)]
+    if strand != 'both':
+        return np.concatenate(parts) if parts else np.empty(0, dtype=float_dtype())
+    if not parts:
+        return np.empty(0, dtype=float_dtype()), np.empty(0, dtype=float_dtype())
+    return tuple(np.concatenate(p) for p in zip(*parts))
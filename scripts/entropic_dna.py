@@ -1,8 +1,14 @@
 import numpy as np
-import random
-import matplotlib.pyplot as plt
-from Bio.Seq import Seq
-from collections import Counter
+
+from checkpoint import checkpointer
+from dna_kernels import BASE_LUT, calculate_omega_resonance, calculate_shannon_entropy
+from experiments import register_experiment, register_renderer
+from instrumentation import stage
+from lz_complexity import compressibility
+from recorders import Recorder
+from render_utils import plot_history
+from rng_streams import ensure_rng
+from plot_style import apply_publication_style
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -10,46 +16,12 @@ ALPHA = 0.47
 BOLTZMANN_K = 1.38e-23  # (J/K) - Simbólico aqui, usamos unidades naturais
 TEMP_UNRUH = OMEGA / (2 * np.pi)  # Temperatura teórica de "agitação" informacional
 
-def calculate_shannon_entropy(sequence):
-    """Calcula a entropia de Shannon de uma sequência de DNA."""
-    if not sequence:
-        return 0
-    counts = Counter(sequence)
-    total = len(sequence)
-    entropy = 0
-    for count in counts.values():
-        p = count / total
-        entropy -= p * np.log2(p)
-    return entropy
-
-def calculate_omega_resonance(sequence):
-    """
-    Calcula o quão 'ressonante' a sequência é com a constante Omega.
-    Hipótese: Sequências com periodicidade φ ligada a Omega são mais estáveis.
-    """
-    # Transformar sequência em sinal numérico (A=1, T=2, C=3, G=4)
-    mapping = {'A': 1, 'T': 2, 'C': 3, 'G': 4}
-    numeric_signal = np.array([mapping.get(b, 0) for b in sequence])
-    
-    # FFT para análise espectral
-    spectrum = np.fft.fft(numeric_signal)
-    freqs = np.fft.fftfreq(len(numeric_signal))
-    
-    # Procurar picos em frequências harmônicas de Omega (simplificado)
-    # Omega scale fundamental: 1/117, 1/sqrt(117), etc.
-    target_freq = 1.0 / np.sqrt(OMEGA)
-    
-    # Encontrar a frequência mais próxima no espectro
-    idx = (np.abs(freqs - target_freq)).argmin()
-    resonance_amplitude = np.abs(spectrum[idx])
-    
-    return resonance_amplitude
-
-def entropic_mutation(sequence, temperature=TEMP_UNRUH):
+def entropic_mutation(sequence, temperature=TEMP_UNRUH, rng=None):
     """
     Aplica mutação baseada em probabilidade termodinâmica.
     Sequências com alta 'estabilidade Omega' resistem mais.
     """
+    rng = ensure_rng(rng)
     bases = ['A', 'T', 'C', 'G']
     seq_list = list(sequence)
     mutated = False
@@ -60,58 +32,87 @@ def entropic_mutation(sequence, temperature=TEMP_UNRUH):
     # Probabilidade de mutação decai com estabilidade
     mutation_prob = np.exp(-stability / temperature) * 0.05 # Taxa base ajustável
     
-    indices = range(len(seq_list))
     # Escolher 1 posição aleatória para tentar mutar
-    idx = random.choice(indices)
+    idx = rng.integers(len(seq_list))
     
-    if random.random() < mutation_prob:
+    if rng.random() < mutation_prob:
         original = seq_list[idx]
-        new_base = random.choice([b for b in bases if b != original])
+        new_base = [b for b in bases if b != original][rng.integers(3)]
         seq_list[idx] = new_base
         mutated = True
         
     return "".join(seq_list), mutated
 
-def simulation_evolution(generations=100, sequences=None):
-    """Roda a simulação evolutiva."""
+# Aptidões disponíveis para a seleção (maior = melhor)
+FITNESS_FUNCTIONS = {'resonance': calculate_omega_resonance, 'compressibility': compressibility}
+FITNESS_LABELS = {'resonance': 'Ω Resonance', 'compressibility': 'LZ76 Compressibility'}
+
+def simulation_evolution(generations=100, sequences=None, history_points=0, fitness_fn=None, rng=None):
+    """
+    Roda a simulação evolutiva. Retorna os gravadores (`recorders.Recorder`) de estabilidade
+    e entropia médias por geração; history_points > 0 limita-os a esse número de pontos.
+    `fitness_fn(seq)` substitui a ressonância Ω na seleção (ex.: `compressibility`).
+    Com checkpoints ligados (`checkpoint.checkpointing`), grava periodicamente a população,
+    os históricos e o estado do gerador, e pode retomar do último checkpoint.
+    """
+    rng = ensure_rng(rng)
     if sequences is None:
         # Gerar sequências iniciais aleatórias
-        sequences = ["".join(random.choices("ATCG", k=50)) for _ in range(10)]
+        sequences = ["".join(np.array(list("ATCG"))[rng.integers(0, 4, 50)]) for _ in range(10)]
     
-    history_entropy = []
-    history_stability = []
+    history_entropy = Recorder(generations, max_points=history_points or None)
+    history_stability = Recorder(generations, max_points=history_points or None)
     
     print(f"Iniciando simulação TAMESIS com {generations} gerações...")
     print(f"Temperatura do sistema (Unruh): {TEMP_UNRUH:.2f}")
     
     current_pop = sequences
     
-    for gen in range(generations):
+    ckpt_params = {'generations': generations, 'population': len(current_pop),
+                   'history_points': history_points}
+    if fitness_fn is not None:
+        ckpt_params['fitness'] = fitness_fn.__name__
+    fitness_fn = fitness_fn or calculate_omega_resonance
+    ckpt = checkpointer("entropic_dna", ckpt_params)
+    start = 0
+    if ckpt is not None:
+        start, state = ckpt.load(rng)
+        if state is not None:
+            current_pop = state['population'].tolist()
+            history_entropy.restore(state, 'history_entropy.')
+            history_stability.restore(state, 'history_stability.')
+    
+    for gen in range(start, generations):
         next_pop = []
         gen_entropies = []
         gen_stabilities = []
         
         for seq in current_pop:
             # 1. Mutação entrópica
-            new_seq, did_mutate = entropic_mutation(seq)
+            with stage("mutation"):
+                new_seq, did_mutate = entropic_mutation(seq, rng=rng)
             
             # 2. Seleção (Otimização Entrópica)
             # Hipótese: Natureza seleciona quem minimiza variação de entropia brusca (estabilidade)
             # Mas aqui vamos simplificar: selecionamos quem tem MAIOR ressonância Omega
             
-            curr_stab = calculate_omega_resonance(new_seq)
+            with stage("scoring"):
+                curr_stab = fitness_fn(new_seq)
+                worse = did_mutate and curr_stab < fitness_fn(seq)
             
             # Pressão seletiva
-            if did_mutate and curr_stab < calculate_omega_resonance(seq):
-                # Mutação ruim (perdeu ressonância), chance de morrer
-                if random.random() > 0.3: # 70% chance de rejeitar mutação ruim
-                    next_pop.append(seq)
+            with stage("selection"):
+                if worse:
+                    # Mutação ruim (perdeu ressonância), chance de morrer
+                    if rng.random() > 0.3: # 70% chance de rejeitar mutação ruim
+                        next_pop.append(seq)
+                    else:
+                        next_pop.append(new_seq)
                 else:
                     next_pop.append(new_seq)
-            else:
-                next_pop.append(new_seq)
                 
-            gen_entropies.append(calculate_shannon_entropy(new_seq))
+            with stage("scoring"):
+                gen_entropies.append(calculate_shannon_entropy(new_seq))
             gen_stabilities.append(curr_stab)
             
         current_pop = next_pop
@@ -120,30 +121,244 @@ def simulation_evolution(generations=100, sequences=None):
         
         if gen % 10 == 0:
             print(f"Gen {gen}: Estabilidade Média = {np.mean(gen_stabilities):.4f}")
-            
+        
+        if ckpt is not None:
+            ckpt.maybe_save(gen + 1, lambda: {'population': np.array(current_pop),
+                                              **history_entropy.state('history_entropy.'),
+                                              **history_stability.state('history_stability.')}, rng)
+    
+    if ckpt is not None:
+        ckpt.finish()
     return history_stability, history_entropy
 
-if __name__ == "__main__":
-    # Setup inicial
-    random.seed(42)
-    np.random.seed(42)
-    
-    # Rodar Simulação
-    stab, ent = simulation_evolution(generations=200)
-    
+# --- Modo Wright–Fisher (populações grandes) ---
+
+WF_CHUNK = 65536  # linhas por bloco no cálculo completo da ressonância
+
+def _resonance_weights(length):
+    """Pesos (L, 2) cos/sin do bin de Fourier usado por `calculate_omega_resonance`."""
+    freqs = np.fft.fftfreq(length)
+    idx = (np.abs(freqs - 1.0 / np.sqrt(OMEGA))).argmin()
+    phase = 2 * np.pi * idx * np.arange(length) / length
+    return np.column_stack([np.cos(phase), np.sin(phase)])
+
+def resonance_components(codes, weights):
+    """Partes real e imaginária (N, 2) do bin Omega de cada linha de uma matriz (N, L) de códigos."""
+    out = np.empty((len(codes), 2))
+    for start in range(0, len(codes), WF_CHUNK):
+        out[start:start + WF_CHUNK] = codes[start:start + WF_CHUNK] @ weights
+    return out
+
+def base_counts(codes):
+    """Contagem (N, 4) de cada base (códigos 1..4) por linha."""
+    counts = np.empty((len(codes), 4), dtype=np.int32)
+    for b in range(4):
+        counts[:, b] = np.count_nonzero(codes == b + 1, axis=1)
+    return counts
+
+def entropy_from_counts(counts):
+    """
+    Entropia de Shannon (bits) de cada linha a partir das contagens de bases (linhas de mesmo
+    comprimento L): os termos -p log2 p vêm de uma tabela indexada pela contagem 0..L.
+    """
+    length = int(counts[0].sum()) if len(counts) else 0
+    p = np.arange(length + 1) / max(length, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(p > 0, -p * np.log2(p), 0.0)
+    return terms[counts].sum(axis=1)
+
+class WrightFisherPopulation:
+    """
+    Uma população Wright–Fisher: a matriz (N × L) de códigos de base (A=1, T=2, C=3, G=4,
+    uint8) e, por linha, as componentes de Fourier do bin Omega e as contagens de bases.
+    A cada geração (`step`):
+        1. Seleção: a população inteira é reamostrada com contagens de prole multinomiais,
+           proporcionais à aptidão w = exp(selection * (R - R_max) / sqrt(L)), R a
+           ressonância Omega.
+        2. Recombinação: com probabilidade recombination_rate, um indivíduo troca o sufixo
+           (ponto de corte uniforme) com o de um parceiro aleatório.
+        3. Mutação: mutações por indivíduo ~ Poisson(L * mu), com a taxa por sítio
+           mu = mutation_rate * exp(-0.1 R / temperature) (sequências ressonantes resistem,
+           como em `entropic_mutation`), em sítios uniformes e com base nova uniforme.
+    As componentes e as contagens são atualizadas incrementalmente (recalculadas só nas
+    linhas recombinadas ou substituídas; cada mutação soma um termo), então o custo por
+    geração é a cópia da reamostragem mais O(N). A reamostragem alterna entre as duas
+    matrizes de `buffers` (alocadas aqui se omitidas; podem estar em memória compartilhada)
+    e `population` é sempre a atual.
+    """
+
+    def __init__(self, population, mutation_rate=1e-3, recombination_rate=0.0, selection=1.0,
+                 temperature=TEMP_UNRUH, buffers=None, components=None):
+        if buffers is None:
+            buffers = (population, np.empty_like(population))
+        elif population is not buffers[0]:
+            buffers[0][...] = population
+        self.buffers = buffers
+        self.current = 0
+        self.mutation_rate = mutation_rate
+        self.recombination_rate = recombination_rate
+        self.selection = selection
+        self.temperature = temperature
+        self.n, self.length = buffers[0].shape
+        self.weights = _resonance_weights(self.length)
+        self.sites = np.arange(self.length)
+        self.components = (resonance_components(self.population, self.weights)
+                           if components is None else np.array(components, dtype=float))
+        self.counts = base_counts(self.population)
+        self.resonance = np.hypot(self.components[:, 0], self.components[:, 1])
+        # Destinos da reamostragem das componentes e contagens (trocados a cada geração)
+        self._spare = [np.empty_like(self.components), np.empty_like(self.counts)]
+
+    @property
+    def population(self):
+        return self.buffers[self.current]
+
+    def step(self, rng):
+        """Uma geração: seleção, recombinação e mutação."""
+        n, length = self.n, self.length
+        with stage("selection"):
+            fitness = np.exp(self.selection * (self.resonance - self.resonance.max()) / np.sqrt(length))
+            offspring = rng.multinomial(n, fitness / fitness.sum())
+            parents = np.repeat(np.arange(n), offspring)
+            # Sem realocar N × L bytes por geração: a cópia vai para o outro buffer
+            np.take(self.population, parents, axis=0, out=self.buffers[1 - self.current])
+            self.current = 1 - self.current
+            for source, target in zip((self.components, self.counts), self._spare):
+                np.take(source, parents, axis=0, out=target)
+            (self.components, self.counts), self._spare = self._spare, [self.components, self.counts]
+            self.resonance = self.resonance[parents]
+
+        population = self.population
+        if self.recombination_rate > 0:
+            with stage("recombination"):
+                # O lado direito é avaliado inteiro antes da atribuição: parceiros são pré-recombinação
+                recombinants = np.flatnonzero(rng.random(n) < self.recombination_rate)
+                partners = rng.integers(0, n, len(recombinants))
+                cuts = rng.integers(1, length, len(recombinants))
+                population[recombinants] = np.where(self.sites < cuts[:, None],
+                                                    population[recombinants], population[partners])
+                self.components[recombinants] = resonance_components(population[recombinants], self.weights)
+                self.counts[recombinants] = base_counts(population[recombinants])
+
+        with stage("mutation"):
+            rate = self.mutation_rate * np.exp(-0.1 * self.resonance / self.temperature)
+            rows = np.repeat(np.arange(n), rng.poisson(length * rate))
+            # Um sítio sorteado duas vezes na mesma geração muta uma vez
+            flat = np.unique(rows * length + rng.integers(0, length, len(rows)))
+            rows, cols = np.divmod(flat, length)
+            old = population[rows, cols]
+            new = (old - 1 + rng.integers(1, 4, len(old), dtype=np.uint8)) % 4 + 1
+            population[rows, cols] = new
+            np.add.at(self.components, rows, (new.astype(float) - old)[:, None] * self.weights[cols])
+            np.add.at(self.counts, (rows, old - 1), -1)
+            np.add.at(self.counts, (rows, new - 1), 1)
+
+        with stage("scoring"):
+            self.resonance = np.hypot(self.components[:, 0], self.components[:, 1])
+
+    def replace(self, rows, genomes):
+        """Substitui as linhas `rows` por `genomes` (ex.: migrantes) e recalcula só essas linhas."""
+        self.population[rows] = genomes
+        self.components[rows] = resonance_components(self.population[rows], self.weights)
+        self.counts[rows] = base_counts(self.population[rows])
+        self.resonance[rows] = np.hypot(self.components[rows, 0], self.components[rows, 1])
+
+    def stats(self):
+        """[média de R, desvio de R, entropia média]."""
+        return [self.resonance.mean(), self.resonance.std(), entropy_from_counts(self.counts).mean()]
+
+    def site_frequencies(self):
+        """Frequências (L, 4) de A, T, C, G em cada sítio."""
+        return base_counts(self.population.T) / self.n
+
+def initial_population(population_size, length, sequences=None, rng=None):
+    """
+    Matriz inicial (N × L) de códigos: `sequences` (mesmo comprimento) são os fundadores,
+    sorteados com reposição; senão a população é aleatória.
+    """
+    rng = ensure_rng(rng)
+    if sequences is None:
+        return rng.integers(1, 5, (population_size, length), dtype=np.uint8)
+    founders = BASE_LUT[np.frombuffer("".join(sequences).encode('ascii'), dtype=np.uint8)]
+    founders = founders.astype(np.uint8).reshape(len(sequences), -1)
+    return founders[rng.integers(0, len(founders), population_size)]
+
+def wright_fisher_evolution(generations=200, population_size=100_000, length=50, mutation_rate=1e-3,
+                            recombination_rate=0.0, selection=1.0, temperature=TEMP_UNRUH,
+                            sequences=None, history_points=0, rng=None):
+    """
+    Evolução Wright–Fisher (`WrightFisherPopulation`) de uma população única.
+    Retorna o gravador (média e desvio de R, entropia média por geração) e a população final.
+    """
+    rng = ensure_rng(rng)
+    population = initial_population(population_size, length, sequences, rng)
+    n, length = population.shape
+    history = Recorder(generations, shape=(3,), max_points=history_points or None)
+
+    print(f"Wright–Fisher: N = {n}, L = {length}, {generations} gerações...")
+
+    ckpt = checkpointer("entropic_dna_wright_fisher",
+                        {'generations': generations, 'population': n, 'length': length,
+                         'mutation_rate': mutation_rate, 'recombination_rate': recombination_rate,
+                         'selection': selection, 'history_points': history_points})
+    start, state = 0, None
+    if ckpt is not None:
+        start, state = ckpt.load(rng)
+        if state is not None:
+            population = state['population'].astype(np.uint8, copy=False)
+            history.restore(state, 'history.')
+
+    # As componentes acumuladas são gravadas no checkpoint: recalculá-las muda os últimos
+    # bits e, com eles, os sorteios multinomiais
+    wf = WrightFisherPopulation(population, mutation_rate, recombination_rate, selection, temperature,
+                                components=state['components'] if state is not None else None)
+
+    for gen in range(start, generations):
+        wf.step(rng)
+        history.append(wf.stats())
+
+        if gen % max(1, generations // 10) == 0:
+            print(f"Gen {gen}: Estabilidade Média = {wf.resonance.mean():.4f}")
+
+        if ckpt is not None:
+            ckpt.maybe_save(gen + 1, lambda: {'population': wf.population, 'components': wf.components,
+                                              **history.state('history.')}, rng)
+
+    if ckpt is not None:
+        ckpt.finish()
+    return history, wf.population
+
+
+@register_experiment("entropic_dna", seed=42)
+def compute_entropic_evolution(generations=200, history_points=0, fitness='resonance', rng=None):
+    """Evolução entrópica de DNA: históricos de estabilidade (aptidão `fitness`) e entropia."""
+    if fitness not in FITNESS_FUNCTIONS:
+        raise ValueError(f"Aptidão desconhecida: {fitness} (esperado {', '.join(FITNESS_FUNCTIONS)})")
+    fitness_fn = None if fitness == 'resonance' else FITNESS_FUNCTIONS[fitness]
+    stab, ent = simulation_evolution(generations=generations, history_points=history_points,
+                                     fitness_fn=fitness_fn, rng=rng)
+    return {'stability': stab.values, 'entropy': ent.values, 'generation': stab.steps, 'fitness': fitness}
+
+@register_renderer("entropic_dna")
+def render_entropic_evolution(results):
+    import matplotlib.pyplot as plt
+
+    stab = results['stability']
+    ent = results['entropy']
+    gens = results.get('generation', np.arange(len(stab)))
+    label = FITNESS_LABELS[str(results.get('fitness', 'resonance'))]
+
     # Plotar Resultados - Estilo Publicação Científica
     plt.figure(figsize=(12, 5), dpi=300)
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.size'] = 10
-    plt.rcParams['axes.linewidth'] = 1.2
+    apply_publication_style(font_size=10)
     
     ax1 = plt.subplot(1, 2, 1)
-    ax1.plot(stab, color='#1f77b4', linewidth=2.5, label='Ω Resonance')
-    ax1.fill_between(range(len(stab)), np.array(stab) * 0.95, np.array(stab) * 1.05, 
+    plot_history(ax1, stab, x=gens, color='#1f77b4', linewidth=2.5, label=label)
+    ax1.fill_between(gens, np.array(stab) * 0.95, np.array(stab) * 1.05, 
                      alpha=0.2, color='#1f77b4')
     ax1.set_title('(a) Stability Evolution', fontsize=12, fontweight='bold', pad=10)
     ax1.set_xlabel('Generation', fontsize=11)
-    ax1.set_ylabel('Ω Resonance (a.u.)', fontsize=11)
+    ax1.set_ylabel(f'{label} (a.u.)', fontsize=11)
     ax1.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
     ax1.spines['top'].set_visible(False)
     ax1.spines['right'].set_visible(False)
@@ -154,8 +369,8 @@ if __name__ == "__main__":
     ax1.text(20, final_avg*1.05, f'Convergence: {final_avg:.1f}', fontsize=9, style='italic')
     
     ax2 = plt.subplot(1, 2, 2)
-    ax2.plot(ent, color='#d62728', linewidth=2.5, label='Shannon Entropy')
-    ax2.fill_between(range(len(ent)), np.array(ent) * 0.95, np.array(ent) * 1.05, 
+    plot_history(ax2, ent, x=gens, color='#d62728', linewidth=2.5, label='Shannon Entropy')
+    ax2.fill_between(gens, np.array(ent) * 0.95, np.array(ent) * 1.05, 
                      alpha=0.2, color='#d62728')
     ax2.set_title('(b) Entropic Optimization', fontsize=12, fontweight='bold', pad=10)
     ax2.set_xlabel('Generation', fontsize=11)
@@ -166,8 +381,8 @@ if __name__ == "__main__":
     
     # Anotação de seleção
     mid_point = len(ent) // 2
-    ax2.annotate('Selection pressure', xy=(mid_point, ent[mid_point]), 
-                xytext=(mid_point+30, ent[mid_point]+0.15),
+    ax2.annotate('Selection pressure', xy=(gens[mid_point], ent[mid_point]), 
+                xytext=(gens[mid_point]+30, ent[mid_point]+0.15),
                 arrowprops=dict(arrowstyle='->', color='black', lw=1),
                 fontsize=9)
     
@@ -176,3 +391,71 @@ if __name__ == "__main__":
     print("Simulação concluída. Gráfico salvo como '../imgs/tardis_evolution_plot.png'.")
     plt.close()
 
+def run_entropic_evolution(generations=200, history_points=0, fitness='resonance', rng=None):
+    """Evolução entrópica de DNA: simulação e gráfico de estabilidade/entropia."""
+    render_entropic_evolution(compute_entropic_evolution(generations, history_points, fitness, rng=rng))
+
+@register_experiment("entropic_dna_wright_fisher", seed=42)
+def compute_wright_fisher_evolution(generations=200, population_size=100_000, length=50,
+                                    mutation_rate=1e-3, recombination_rate=0.01, selection=1.0,
+                                    history_points=0, rng=None):
+    """Evolução Wright–Fisher: ressonância e entropia por geração, frequências finais por sítio."""
+    history, population = wright_fisher_evolution(generations, population_size, length, mutation_rate,
+                                                  recombination_rate, selection,
+                                                  history_points=history_points, rng=rng)
+    stats = history.values
+    return {'stability': stats[:, 0], 'stability_std': stats[:, 1], 'entropy': stats[:, 2],
+            'generation': history.steps, 'population_size': population_size,
+            'site_frequencies': base_counts(population.T) / len(population)}
+
+@register_renderer("entropic_dna_wright_fisher")
+def render_wright_fisher_evolution(results):
+    import matplotlib.pyplot as plt
+
+    gens = results['generation']
+    stab, stab_std, ent = results['stability'], results['stability_std'], results['entropy']
+    freqs = results['site_frequencies']  # (L, 4): A, T, C, G
+
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(16, 5), dpi=300)
+    apply_publication_style(font_size=10)
+
+    plot_history(ax1, stab, x=gens, color='#1f77b4', linewidth=2.5, label='Mean')
+    ax1.fill_between(gens, stab - stab_std, stab + stab_std, alpha=0.2, color='#1f77b4', label='±1σ')
+    ax1.set_title(f"(a) Ω Resonance (N = {int(results['population_size']):,})", fontsize=12, fontweight='bold')
+    ax1.set_xlabel('Generation')
+    ax1.set_ylabel('Ω Resonance (a.u.)')
+    ax1.legend(fontsize=9)
+    ax1.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+
+    plot_history(ax2, ent, x=gens, color='#d62728', linewidth=2.5)
+    ax2.set_title('(b) Mean Shannon Entropy', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Generation')
+    ax2.set_ylabel('Shannon Entropy (bits)')
+    ax2.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+
+    sites = np.arange(len(freqs))
+    bottom = np.zeros(len(freqs))
+    for b, (base, color) in enumerate(zip("ATCG", ['#2ca02c', '#d62728', '#1f77b4', '#ff7f0e'])):
+        ax3.bar(sites, freqs[:, b], bottom=bottom, width=1.0, color=color, label=base)
+        bottom += freqs[:, b]
+    ax3.set_title('(c) Final Base Frequencies per Site', fontsize=12, fontweight='bold')
+    ax3.set_xlabel('Site')
+    ax3.set_ylabel('Frequency')
+    ax3.set_xlim(-0.5, len(freqs) - 0.5)
+    ax3.legend(fontsize=9, ncol=4, loc='upper center', bbox_to_anchor=(0.5, -0.15))
+
+    fig.tight_layout()
+    outfile = "../imgs/entropic_dna_wright_fisher.png"
+    fig.savefig(outfile, dpi=300, bbox_inches='tight')
+    print(f"Concluído. Gráfico salvo em {outfile}")
+    plt.close(fig)
+
+def run_wright_fisher_evolution(generations=200, population_size=100_000, rng=None, **kwargs):
+    """Evolução Wright–Fisher: simulação e gráfico de ressonância, entropia e frequências por sítio."""
+    render_wright_fisher_evolution(compute_wright_fisher_evolution(generations, population_size,
+                                                                  rng=rng, **kwargs))
+
+if __name__ == "__main__":
+    # Setup inicial
+    run_entropic_evolution(rng=np.random.default_rng(42))
+    run_wright_fisher_evolution(rng=np.random.default_rng(42))
@@ -1,5 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from jit_kernels import clamped_walk
+from render_utils import plot_history
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,40 +11,42 @@ OMEGA = 117.038
 # Em campos topológicos fechados ("TAMESIS Bubbles"), a entropia pode fluir ao contrário (dS/dt < 0).
 # Isso permite rejuvenescimento celular e reparo estrutural perfeito.
 
-def simulate_entropy_reversal(steps=200):
+@register_experiment("entropy_reversal", seed=42)
+def compute_entropy_reversal(steps=200, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 17: Entropy Reversal (Tenet Protocol)...")
     
     # Sistema: Caixa com partículas de gás se expandindo
     initial_entropy = 10.0
     
-    entropy_normal = [initial_entropy]
-    entropy_TAMESIS = [initial_entropy]
-    
-    current_s_normal = initial_entropy
-    current_s_TAMESIS = initial_entropy
-    
-    for t in range(steps):
-        # Universo Normal: Entropia sempre sobe (Flecha do Tempo > 0)
-        # dS = +k
-        current_s_normal += np.random.uniform(0.1, 0.5)
-        
-        # Universo TAMESIS: Inversão controlada
-        # Se t > 100 (Ativação do Protocolo Tenet), dS = -k * log(Omega)
-        if t > 100:
-            current_s_TAMESIS -= np.random.uniform(0.1, 0.5) * np.log(OMEGA) * 0.2
-        else:
-            current_s_TAMESIS += np.random.uniform(0.1, 0.5)
-            
-        # Limite físico (Zero Absoluto de desordem = Cristal Perfeito)
-        current_s_TAMESIS = max(0, current_s_TAMESIS)
-        
-        entropy_normal.append(current_s_normal)
-        entropy_TAMESIS.append(current_s_TAMESIS)
-        
+    # Um sorteio por universo a cada passo (mesma ordem do laço passo a passo)
+    draws = rng.uniform(0.1, 0.5, (steps, 2))
+    
+    # Universo Normal: Entropia sempre sobe (Flecha do Tempo > 0)
+    # dS = +k
+    entropy_normal = initial_entropy + np.cumsum(draws[:, 0])
+    
+    # Universo TAMESIS: Inversão controlada
+    # Se t > 100 (Ativação do Protocolo Tenet), dS = -k * log(Omega)
+    increments = np.where(np.arange(steps) > 100, -(draws[:, 1] * np.log(OMEGA) * 0.2), draws[:, 1])
+    
+    # Limite físico (Zero Absoluto de desordem = Cristal Perfeito): passeio com piso em 0
+    entropy_TAMESIS = clamped_walk(initial_entropy, increments, floor=0.0)
+
+    return {'entropy_normal': np.concatenate([[initial_entropy], entropy_normal]),
+            'entropy_TAMESIS': np.concatenate([[initial_entropy], entropy_TAMESIS])}
+
+@register_renderer("entropy_reversal")
+def render_entropy_reversal(results):
+    import matplotlib.pyplot as plt
+
+    entropy_normal = results['entropy_normal']
+    entropy_TAMESIS = results['entropy_TAMESIS']
+
     # Plot
     plt.figure(figsize=(10, 6))
-    plt.plot(entropy_normal, 'r--', label='Universo Padrão (Decaimento)')
-    plt.plot(entropy_TAMESIS, 'g-', linewidth=3, label='Campo TAMESIS (Rejuvenescimento)')
+    plot_history(plt.gca(), entropy_normal, 'r--', label='Universo Padrão (Decaimento)')
+    plot_history(plt.gca(), entropy_TAMESIS, 'g-', linewidth=3, label='Campo TAMESIS (Rejuvenescimento)')
     
     plt.axvline(x=100, color='gold', linestyle=':', label='Inversão da Flecha do Tempo')
     
@@ -58,6 +64,8 @@ def simulate_entropy_reversal(steps=200):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_entropy_reversal(steps=200, rng=None):
+    render_entropy_reversal(compute_entropy_reversal(steps, rng))
+
 if __name__ == "__main__":
-    np.random.seed(42)
-    simulate_entropy_reversal()
+    simulate_entropy_reversal(rng=np.random.default_rng(42))
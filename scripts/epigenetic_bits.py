@@ -1,5 +1,12 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from checkpoint import checkpointer
+from experiments import register_experiment, register_renderer
+from instrumentation import stage, timed
+from precision import float_dtype
+from recorders import Recorder
+from render_utils import plot_history
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,55 +15,94 @@ K_BOLTZMANN = 1.38e-23
 # A energia necessária para "flipar" um bit epigenético (metilar/desmetilar)
 # deve ser maior que o ruído térmico (kT) + a estabilidade holográfica de Omega.
 
-def simulate_epigenetic_memory_stability(generations=1000):
+def omega_memory_pattern(size=100):
+    """
+    Memória gravada (Padrão Omega): loci com (i² + j²) mod int(Omega) < 10 ficam metilados.
+    Bits como códigos uint8 (0/1), um byte por locus.
+    """
+    i, j = np.indices((size, size))
+    return ((i**2 + j**2) % int(OMEGA) < 10).astype(np.uint8)
+
+@timed("mutation")
+def epigenetic_lattice_step(grid, noise_map, temperature):
+    """
+    Um passo térmico da grade de loci, atualizada no lugar (e devolvida).
+    Cada bit flipa se o ruído ficar abaixo da probabilidade de flip, temperatura / 1000,
+    dividida por Omega nos bits metilados (trava holográfica: memória Omega resiste).
+    `grid` é uma grade de códigos inteiros 0/1; `noise_map` pode estar em qualquer precisão.
+    """
+    prob_flip = temperature / 1000.0
+    # Probabilidade por código (0: não metilado, 1: metilado), indexada pela própria grade
+    prob = np.array([prob_flip, prob_flip / OMEGA], dtype=noise_map.dtype)
+    flip = noise_map < prob[grid]
+    grid[flip] = 1 - grid[flip]
+    return grid
+
+@register_experiment("epigenetic_bits", seed=42)
+def compute_epigenetic_memory_stability(generations=1000, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 7: Epigenetic Holography...")
     
-    # Grid holográfico 100x100 bits (loci epigenéticos)
-    memory_grid = np.zeros((100, 100))
-    
-    # Gravar uma memória (Padrão Omega)
-    for i in range(100):
-        for j in range(100):
-            if (i**2 + j**2) % int(OMEGA) < 10:
-                memory_grid[i][j] = 1 # Metilado
+    # Grid holográfico 100x100 bits (loci epigenéticos), com uma memória gravada (Padrão Omega)
+    memory_grid = omega_memory_pattern(100)
     
     initial_memory = memory_grid.copy()
     
     # Evolução Termodinâmica
     temperatures = [10, 50, 100] # Baixa, Média, Alta Entropia
     stability_curves = []
+    current_grid = None
+    stability_history = Recorder(generations)
+    
+    # Checkpoint: curvas concluídas, grid e histórico da temperatura atual, estado do gerador
+    ckpt = checkpointer("epigenetic_bits", {'generations': generations, 'temperatures': temperatures})
+    if ckpt is not None:
+        _, state = ckpt.load(rng)
+        if state is not None:
+            stability_curves = state['stability_curves'].tolist()
+            stability_history.restore(state, 'stability_history.')
+            current_grid = state['current_grid'].astype(np.uint8, copy=False)
     
-    for temp in temperatures:
-        current_grid = initial_memory.copy()
-        stability_history = []
+    for t_index, temp in enumerate(temperatures):
+        if t_index < len(stability_curves):
+            continue  # temperatura já concluída antes do checkpoint
+        if current_grid is None:
+            current_grid = initial_memory.copy()
+            stability_history = Recorder(generations)
         
-        for _ in range(generations):
+        for gen in range(len(stability_history), generations):
             # Tentar flipar bits aleatoriamente (ruído)
-            noise_map = np.random.random((100, 100))
+            noise_map = rng.random((100, 100), dtype=float_dtype())
             
             # Limiar de estabilidade:
             # Em TAMESIS, bits correlacionados holograficamente são mais difíceis de flipar.
             # Se o bit faz parte de um padrão Omega, ele resiste.
-            
-            for i in range(100):
-                for j in range(100):
-                    # Check Neighbor Consistency (Holographic Lock)
-                    neighbors = 0
-                    # ... [simplificado] ... check 4 vizinhos
-                    
-                    # Probabilidade de flip depende da temperatura e da "trava holográfica"
-                    prob_flip = (temp / 1000.0)
-                    if current_grid[i][j] == 1: # Se é memória gravada
-                        prob_flip /= OMEGA # Muito mais difícil apagar memória Omega!
-                    
-                    if noise_map[i][j] < prob_flip:
-                        current_grid[i][j] = 1 - current_grid[i][j] # Flip
+            epigenetic_lattice_step(current_grid, noise_map, temp)
             
             # Calcular retenção
-            retention = np.sum(current_grid * initial_memory) / np.sum(initial_memory)
+            with stage("scoring"):
+                retention = np.sum(current_grid * initial_memory) / np.sum(initial_memory)
             stability_history.append(retention * 100)
             
-        stability_curves.append(stability_history)
+            if ckpt is not None:
+                ckpt.maybe_save(t_index * generations + gen + 1,
+                                lambda: {'stability_curves': np.array(stability_curves),
+                                         **stability_history.state('stability_history.'),
+                                         'current_grid': current_grid}, rng)
+            
+        stability_curves.append(stability_history.values)
+        current_grid = None
+
+    if ckpt is not None:
+        ckpt.finish()
+
+    return {'temperatures': np.array(temperatures), 'stability_curves': np.array(stability_curves)}
+
+@register_renderer("epigenetic_bits")
+def render_epigenetic_memory_stability(results):
+    import matplotlib.pyplot as plt
+
+    stability_curves = results['stability_curves']
 
     # Plot
     plt.figure(figsize=(10, 6))
@@ -64,7 +110,7 @@ def simulate_epigenetic_memory_stability(generations=1000):
     labels = ['Baixa Entropia', 'Média Entropia', 'Alta Entropia (Crítica)']
     
     for i, curve in enumerate(stability_curves):
-        plt.plot(curve, color=colors[i], label=labels[i])
+        plot_history(plt.gca(), curve, color=colors[i], label=labels[i])
         
     plt.title('Holographic Memory Persistence: Epigenetic Stability')
     plt.xlabel('Time (Generations)')
@@ -76,6 +122,8 @@ def simulate_epigenetic_memory_stability(generations=1000):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_epigenetic_memory_stability(generations=1000, rng=None):
+    render_epigenetic_memory_stability(compute_epigenetic_memory_stability(generations, rng))
+
 if __name__ == "__main__":
-    np.random.seed(42)
-    simulate_epigenetic_memory_stability()
+    simulate_epigenetic_memory_stability(rng=np.random.default_rng(42))
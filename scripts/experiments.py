@@ -0,0 +1,197 @@
+"""
+Registro de experimentos TAMESIS
+
+Cada script de simulação separa o cálculo da visualização:
+    compute_*(...)   -> dict de arrays (registrado com `register_experiment`,
+                        declarando a semente usada no `__main__`)
+    render_*(results) -> desenha e salva o gráfico (registrado com `register_renderer`)
+    simulate_*(...)  = render_*(compute_*(...)), o ponto de entrada do `__main__`
+Os parâmetros tipados são extraídos da assinatura da função (valores padrão e anotações).
+Como os resultados são determinísticos, podem ser reaproveitados pelo `result_cache`.
+
+O orquestrador (`run_all_simulations.py`) usa o registro para executar os
+experimentos em processos worker de longa duração, em vez de um interpretador
+novo por script.
+"""
+import importlib
+import inspect
+from dataclasses import dataclass, field
+
+from instrumentation import count, stage
+from rng_streams import ensure_rng
+
+# Registro global: nome -> Experiment
+EXPERIMENTS = {}
+
+# Módulos de simulação (na ordem do relatório) que registram experimentos ao serem importados
+EXPERIMENT_MODULES = [
+    "entropic_dna",
+    "omega_stability",
+    "holographic_dna",
+    "grna_entropy",
+    "cas9_flow",
+    "pe_entropy",
+    "epigenetic_bits",
+    "base_editing_thermo",
+    "population_omega",
+    "consciousness_resonance",
+    "viral_tardis",
+    "abiogenesis_omega",
+    "mind_upload_sim",
+    "reality_patch",
+    "chrono_telephony",
+    "multiverse_map",
+    "entropy_reversal",
+    "island_model",
+]
+
+@dataclass
+class Experiment:
+    """Um experimento registrado: função de cálculo, renderizador, semente e parâmetros tipados."""
+    name: str
+    module: str
+    func: object
+    render: object = None
+    seed: object = None
+    params: dict = field(default_factory=dict)  # nome -> (tipo, padrão)
+    description: str = ""
+
+    @property
+    def accepts_rng(self):
+        return 'rng' in inspect.signature(self.func).parameters
+
+def _param_specs(func):
+    """Extrai {nome: (tipo, padrão)} dos parâmetros com valor padrão (exceto `rng`)."""
+    specs = {}
+    for name, p in inspect.signature(func).parameters.items():
+        if name == 'rng' or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD):
+            continue
+        if p.annotation is not inspect.Parameter.empty:
+            kind = p.annotation
+        elif p.default is not inspect.Parameter.empty and p.default is not None:
+            kind = type(p.default)
+        else:
+            kind = str
+        default = None if p.default is inspect.Parameter.empty else p.default
+        specs[name] = (kind, default)
+    return specs
+
+def register_experiment(name, seed=None):
+    """
+    Decorador que registra a função como experimento `name`.
+    Os experimentos aleatórios aceitam `rng` e recebem `np.random.default_rng(seed)`
+    (None = entropia do sistema); o estado global de `random`/`np.random` não é usado.
+    """
+    def decorator(func):
+        doc = inspect.getdoc(func) or ""
+        EXPERIMENTS[name] = Experiment(
+            name=name,
+            module=func.__module__,
+            func=func,
+            seed=seed,
+            params=_param_specs(func),
+            description=doc.splitlines()[0] if doc else "",
+        )
+        return func
+    return decorator
+
+def register_renderer(name):
+    """Decorador que associa a função de visualização ao experimento `name` (já registrado)."""
+    def decorator(func):
+        EXPERIMENTS[name].render = func
+        return func
+    return decorator
+
+def load_registry(modules=None):
+    """Importa os módulos de simulação (registrando seus experimentos) e devolve o registro."""
+    for module in modules or EXPERIMENT_MODULES:
+        importlib.import_module(module)
+    return EXPERIMENTS
+
+def experiments_for(module):
+    """Nomes dos experimentos registrados por um módulo (aceita 'modulo' ou 'modulo.py')."""
+    module = module[:-3] if module.endswith('.py') else module
+    importlib.import_module(module)
+    return [e.name for e in EXPERIMENTS.values() if e.module == module]
+
+def get_experiment(name):
+    if name not in EXPERIMENTS:
+        for module in EXPERIMENT_MODULES:
+            importlib.import_module(module)
+            if name in EXPERIMENTS:
+                break
+    if name not in EXPERIMENTS:
+        raise KeyError(f"Experimento desconhecido: {name}")
+    return EXPERIMENTS[name]
+
+def _coerce(kind, value):
+    if not isinstance(value, str) or kind is str:
+        return value
+    if kind is bool:
+        return value.lower() in ('1', 'true', 'yes', 'sim')
+    return kind(value)
+
+def coerce_params(experiment, overrides):
+    """Valida e converte parâmetros (ex.: vindos da linha de comando) para os tipos declarados."""
+    params = {}
+    for key, value in (overrides or {}).items():
+        if key not in experiment.params:
+            raise ValueError(f"{experiment.name}: parâmetro desconhecido '{key}' "
+                             f"(disponíveis: {', '.join(experiment.params)})")
+        params[key] = _coerce(experiment.params[key][0], value)
+    return params
+
+def effective_params(experiment, overrides=None):
+    """Parâmetros efetivos de uma execução: os padrões do registro com as sobrescritas convertidas."""
+    params = {name: default for name, (_, default) in experiment.params.items()}
+    params.update(coerce_params(experiment, overrides))
+    return params
+
+def run_experiment(name, params=None, seed='default', cache=None, render=True, store=None):
+    """
+    Cria o gerador semeado, calcula o experimento e (se render=True) desenha o gráfico.
+    Com `cache` (um `result_cache.ResultCache`), o cálculo é pulado quando os resultados
+    para o mesmo código, parâmetros, semente e versões de bibliotecas já estão em disco.
+    Com `store` (um `results_store.ResultsStore`), a execução é gravada no dataset, com a
+    chave de conteúdo como run_id (repetir a mesma execução não duplica a linha).
+    Devolve o dict de resultados.
+    """
+    experiment = get_experiment(name)
+    if seed == 'default':
+        seed = experiment.seed
+    kwargs = coerce_params(experiment, params)
+
+    results = None
+    if cache is not None:
+        key = cache.key_for(experiment, kwargs, seed)
+        results = cache.get(key)
+        if results is not None:
+            count("cache_hits")
+            print(f"Resultados de {name} recuperados do cache ({key[:12]})")
+
+    if results is None:
+        call_kwargs = dict(kwargs)
+        if experiment.accepts_rng:
+            call_kwargs['rng'] = ensure_rng(seed)
+        with stage("compute"):
+            results = experiment.func(**call_kwargs)
+        if cache is not None:
+            cache.put(key, results, meta={'experiment': name, 'params': effective_params(experiment, kwargs),
+                                          'seed': seed})
+
+    if store is not None:
+        from result_cache import result_key
+        with stage("store"):
+            store.append(name, results, effective_params(experiment, kwargs), seed,
+                         run_id=result_key(experiment, kwargs, seed))
+
+    if render:
+        render_results(name, results)
+    return results
+
+def render_results(name, results):
+    """Desenha o gráfico de um experimento a partir do dict de resultados (calculado ou lido)."""
+    experiment = get_experiment(name)
+    if experiment.render is not None:
+        with stage("render"):
+            experiment.render(results)
@@ -0,0 +1,125 @@
+"""
+Kernels espectrais de grafos (núcleo leve)
+
+Laplaciano, entropia de Von Neumann (densa e por Quadratura de Lanczos Estocástica),
+espectro top-k e fluxo de informação. Importar este módulo carrega apenas numpy;
+scipy e networkx são importados dentro das funções que os usam.
+"""
+import numpy as np
+
+from instrumentation import stage
+from jit_kernels import global_efficiency
+
+def graph_to_edges(G):
+    """Converte um grafo networkx em arrays (u, v, peso) com u < v (peso padrão 1)."""
+    edges = np.array([(min(a, b), max(a, b), d.get('weight', 1.0)) for a, b, d in G.edges(data=True)],
+                     dtype=float).reshape(-1, 3)
+    return edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), edges[:, 2]
+
+def laplacian_from_edges(n, u, v, w):
+    """Laplaciano esparso (CSR) L = D - W a partir das arestas; pesos nulos são ignorados."""
+    import scipy.sparse as sp
+
+    mask = w != 0
+    u, v, w = u[mask], v[mask], w[mask]
+    degree = np.bincount(u, weights=w, minlength=n) + np.bincount(v, weights=w, minlength=n)
+    nodes = np.arange(n)
+    rows = np.concatenate([u, v, nodes])
+    cols = np.concatenate([v, u, nodes])
+    data = np.concatenate([-w, -w, degree])
+    return sp.csr_matrix((data, (rows, cols)), shape=(n, n))
+
+def spectral_entropy(G):
+    """Entropia de Von Neumann (A assinatura da consciência) via espectro denso do Laplaciano."""
+    import networkx as nx
+
+    L = nx.laplacian_matrix(G).toarray()
+    with stage("eigendecomposition"):
+        eig = np.linalg.eigvalsh(L)
+    return entropy_from_eigenvalues(eig)
+
+def entropy_from_eigenvalues(eig):
+    eig = eig[eig > 1e-10]
+    prob = eig / np.sum(eig)
+    return -np.sum(prob * np.log(prob))
+
+def spectral_entropy_slq(L, probes, lanczos_steps=30):
+    """
+    Entropia de Von Neumann estimada por Quadratura de Lanczos Estocástica (SLQ).
+
+    S = log(T) - tr(L log L) / T, com T = tr(L). O traço de f(L) = L log L é estimado
+    com vetores de sonda Rademacher (`probes`, formato (n, nv)) e `lanczos_steps`
+    passos de Lanczos por sonda, vetorizados sobre as sondas. Custo O(nnz * passos * nv),
+    sem decomposição densa.
+    """
+    from scipy.linalg import eigh_tridiagonal
+
+    n, n_probes = probes.shape
+    trace = L.diagonal().sum()
+    if trace <= 0:
+        return 0.0
+
+    alpha = np.zeros((lanczos_steps, n_probes))
+    beta = np.zeros((lanczos_steps, n_probes))
+    q = probes / np.linalg.norm(probes, axis=0)
+    q_prev = np.zeros_like(q)
+    b_prev = np.zeros(n_probes)
+    for j in range(lanczos_steps):
+        w = L @ q
+        a = np.einsum('ij,ij->j', q, w)
+        w -= a * q + b_prev * q_prev
+        b = np.linalg.norm(w, axis=0)
+        alpha[j] = a
+        # Espaço de Krylov esgotado: a sonda para de contribuir (beta = 0 desacopla o resto)
+        alive = b > 1e-10
+        q_prev = q
+        q = np.where(alive, w / np.where(alive, b, 1.0), 0.0)
+        b_prev = np.where(alive, b, 0.0)
+        beta[j] = b_prev
+
+    quad = np.empty(n_probes)
+    for p in range(n_probes):
+        with stage("eigendecomposition"):
+            theta, vecs = eigh_tridiagonal(alpha[:, p], beta[:-1, p])
+        theta = np.clip(theta, 0, None)
+        f_theta = np.where(theta > 1e-12, theta * np.log(np.where(theta > 1e-12, theta, 1.0)), 0.0)
+        quad[p] = np.sum(vecs[0] ** 2 * f_theta)
+    trace_f = n * quad.mean()
+    return np.log(trace) - trace_f / trace
+
+def top_spectrum(L, k, v0=None):
+    """Os k maiores autovalores do Laplaciano (Lanczos esparso, com partida a quente opcional)."""
+    from scipy.sparse.linalg import eigsh
+
+    with stage("eigendecomposition"):
+        vals, vecs = eigsh(L, k=k, which='LA', v0=v0)
+    order = np.argsort(vals)[::-1]
+    return vals[order], vecs[:, order[0]]
+
+def spectral_distance(spec_source, spec_target):
+    """Distância espectral relativa entre dois espectros ordenados de mesmo tamanho."""
+    return np.linalg.norm(spec_source - spec_target) / np.linalg.norm(spec_source)
+
+def calculate_information_flow(G):
+    """
+    Calcula a eficiência do fluxo de informação usando
+    Centralidade de Informação e Entropia do Grafo.
+    """
+    import networkx as nx
+
+    # Espectro do Laplaciano (L = D - A, como nx.laplacian_matrix)
+    A = nx.to_scipy_sparse_array(G, format='csr')
+    L = np.diag(np.asarray(A.sum(axis=1), dtype=float)) - A.toarray()
+    with stage("eigendecomposition"):
+        eigenvalues = np.linalg.eigvalsh(L)
+    
+    # Entropia Espectral (Von Neumann)
+    # S = - sum(lambda * log(lambda)) (normalizado)
+    eigenvalues = eigenvalues[eigenvalues > 1e-10] # Remove zero
+    prob = eigenvalues / np.sum(eigenvalues)
+    entropy = -np.sum(prob * np.log(prob))
+    
+    # Eficiência Global (BFS de todos os pares; kernel JIT opcional, ver jit_kernels.py)
+    efficiency = global_efficiency(A.indptr, A.indices)
+    
+    return efficiency, entropy
@@ -1,7 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
-from difflib import SequenceMatcher
+
+from dna_kernels import entropic_distance, hamming_distance
+from experiments import register_experiment, register_renderer
+from instrumentation import stage
+from plot_style import apply_publication_style
+from render_utils import fast_scatter
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -9,88 +13,75 @@ OMEGA = 117.038
 # mas "Ressonância de Informação". Off-targets ocorrem quando a 
 # "assinatura entrópica" é similar, mesmo com bases diferentes.
 
-def generate_sequence(length=20):
-    return "".join(random.choices("ATCG", k=length))
-
-def calculate_entropic_signature(seq):
-    """
-    Calcula uma 'assinatura' numérica baseada em pesos TAMESIS.
-    A=1, T=Omega^0.1, C=Omega^0.2, G=Omega^0.3 (hipotético)
-    """
-    mapping = {
-        'A': 1.0, 
-        'T': OMEGA**0.1, 
-        'C': OMEGA**0.2, 
-        'G': OMEGA**0.3
-    }
-    vals = [mapping[b] for b in seq]
-    # Assinatura é a soma ponderada pela posição (topologia)
-    signature = sum(v * (i+1)**0.5 for i, v in enumerate(vals))
-    return signature
-
-def hamming_distance(s1, s2):
-    return sum(c1 != c2 for c1, c2 in zip(s1, s2))
+def generate_sequence(length=20, rng=None):
+    rng = ensure_rng(rng)
+    return "".join(np.array(list("ATCG"))[rng.integers(0, 4, length)])
 
-def entropic_distance(s1, s2):
-    sig1 = calculate_entropic_signature(s1)
-    sig2 = calculate_entropic_signature(s2)
-    return abs(sig1 - sig2)
-
-def run_grna_experiment():
+@register_experiment("grna_entropy", seed=42)
+def compute_grna_experiment(rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 4: gRNA Entropic Specificity...")
     
-    target = generate_sequence(20)
+    target = generate_sequence(20, rng)
     print(f"Alvo: {target}")
     
     # Gerar 1000 sequências aleatórias (potenciais off-targets)
-    genome_fragments = [generate_sequence(20) for _ in range(1000)]
+    genome_fragments = [generate_sequence(20, rng) for _ in range(1000)]
     
     # Adicionar alguns off-targets "reais" (com poucas mutações)
     for _ in range(10):
         mutant = list(target)
         # 2 ou 3 mutações
         for _ in range(3):
-            mutant[random.randint(0, 19)] = random.choice("ATCG")
+            mutant[rng.integers(0, 20)] = "ATCG"[rng.integers(0, 4)]
         genome_fragments.append("".join(mutant))
         
     hamming_scores = []
     entropic_scores = []
     
     for frag in genome_fragments:
-        h_dist = hamming_distance(target, frag)
-        e_dist = entropic_distance(target, frag)
+        with stage("scoring"):
+            h_dist = hamming_distance(target, frag)
+            e_dist = entropic_distance(target, frag)
         
         hamming_scores.append(h_dist)
         entropic_scores.append(e_dist)
-        
+
+    return {'target': target, 'hamming_scores': np.array(hamming_scores),
+            'entropic_scores': np.array(entropic_scores)}
+
+@register_renderer("grna_entropy")
+def render_grna_experiment(results):
+    import matplotlib.pyplot as plt
+
+    hamming_scores = results['hamming_scores']
+    entropic_scores = results['entropic_scores']
+
     # Plotting Correlation - Estilo Publicação Científica
     plt.figure(figsize=(10, 7), dpi=300)
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.size'] = 11
-    plt.rcParams['axes.linewidth'] = 1.2
+    apply_publication_style(font_size=11)
     
     # Normalizar escores entrópicos
     entropic_norm = np.array(entropic_scores) / np.max(entropic_scores) * 20
     
     # Classificar pontos por risco
-    high_risk = [(h, e) for h, e in zip(hamming_scores, entropic_norm) if h <= 5 and e <= 10]
-    cryptic_risk = [(h, e) for h, e in zip(hamming_scores, entropic_norm) if h > 5 and e <= 10]
-    safe = [(h, e) for h, e in zip(hamming_scores, entropic_norm) if e > 10]
+    hamming_scores = np.asarray(hamming_scores)
+    high_risk = (hamming_scores <= 5) & (entropic_norm <= 10)
+    cryptic_risk = (hamming_scores > 5) & (entropic_norm <= 10)
+    safe = entropic_norm > 10
     
-    # Plot com diferentes categorias
-    if high_risk:
-        hr_h, hr_e = zip(*high_risk)
-        plt.scatter(hr_h, hr_e, c='#d62728', s=80, alpha=0.7, 
-                   edgecolors='darkred', linewidth=1.5, label='High Risk (Low Hamming)', zorder=3)
-    if cryptic_risk:
-        cr_h, cr_e = zip(*cryptic_risk)
-        plt.scatter(cr_h, cr_e, c='#ff7f0e', s=80, alpha=0.7, 
-                   edgecolors='darkorange', linewidth=1.5, 
-                   label='Cryptic Off-targets', marker='^', zorder=3)
-    if safe:
-        s_h, s_e = zip(*safe)
-        plt.scatter(s_h, s_e, c='#1f77b4', s=50, alpha=0.5, 
-                   edgecolors='navy', linewidth=1, label='Safe Targets', zorder=2)
+    # Plot com diferentes categorias (marcadores de cor única; nuvens grandes rasterizadas)
+    ax = plt.gca()
+    if high_risk.any():
+        fast_scatter(ax, hamming_scores[high_risk], entropic_norm[high_risk], color='#d62728', s=80,
+                     alpha=0.7, edgecolor='darkred', linewidth=1.5, label='High Risk (Low Hamming)', zorder=3)
+    if cryptic_risk.any():
+        fast_scatter(ax, hamming_scores[cryptic_risk], entropic_norm[cryptic_risk], color='#ff7f0e', s=80,
+                     alpha=0.7, edgecolor='darkorange', linewidth=1.5,
+                     label='Cryptic Off-targets', marker='^', zorder=3)
+    if safe.any():
+        fast_scatter(ax, hamming_scores[safe], entropic_norm[safe], color='#1f77b4', s=50,
+                     alpha=0.5, edgecolor='navy', linewidth=1, label='Safe Targets', zorder=2)
     
     plt.title('Off-Target Prediction: Hamming vs. Entropic Distance', 
              fontsize=13, fontweight='bold', pad=15)
@@ -125,6 +116,8 @@ def run_grna_experiment():
     plt.savefig(outfile, dpi=300, bbox_inches='tight')
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def run_grna_experiment(rng=None):
+    render_grna_experiment(compute_grna_experiment(rng))
+
 if __name__ == "__main__":
-    random.seed(42)
-    run_grna_experiment()
+    run_grna_experiment(rng=np.random.default_rng(42))
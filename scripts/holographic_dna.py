@@ -1,51 +1,17 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import entropy
+
+from dna_kernels import generate_genome_segment, holographic_noise_simulation
+from experiments import register_experiment, register_renderer
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 # Hipótese: "Junk DNA" (Regiões não-codificantes) atuam como dissipadores de calor entrópico
 # Protegendo os genes codificantes (Regiões codificantes) de flutuações.
 # A razão ideal deve obedecer a proporção holográfica.
 
-def generate_genome_segment(size=1000, coding_ratio=0.02):
-    """
-    Gera um segmento de genoma.
-    coding_ratio ~ 2% (similar a humanos)
-    """
-    genome = np.zeros(size)
-    n_coding = int(size * coding_ratio)
-    
-    # Distribui genes aleatoriamente
-    indices = np.random.choice(range(size), n_coding, replace=False)
-    genome[indices] = 1 # 1 = Gene Codificante, 0 = Não-codificante ("Junk")
-    return genome
-
-def holographic_noise_simulation(genome, intensity=0.1):
-    """
-    Simula ruído de informação (mutações/erros de transcrição) entrando no sistema.
-    O ruído entra pela "borda" (não-codificante) e difunde para o "bulk" (genes).
-    """
-    size = len(genome)
-    damage_map = np.zeros(size)
-    
-    # Ruído aleatório atinge o genoma
-    noise_hits = int(size * intensity)
-    hit_indices = np.random.randint(0, size, noise_hits)
-    
-    for idx in hit_indices:
-        # Se bater em região não-codificante (0), o dano é absorvido (dissipado)
-        # Se bater em gene (1), o dano é crítico
-        
-        if genome[idx] == 0:
-            # Absorção entrópica: Junk DNA absorve o erro e reorganiza
-            damage_map[idx] = 0.1 # Dano leve
-        else:
-            # Dano funcional crítico
-            damage_map[idx] = 1.0 # Crítico
-            
-    return np.sum(damage_map)
-
-def run_holographic_experiment():
+@register_experiment("holographic_dna", seed=42)
+def compute_holographic_experiment(rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 3: Fronteira Holográfica...")
     
     ratios = np.linspace(0.01, 0.99, 50) # Varia proporção de genes de 1% a 99%
@@ -55,15 +21,23 @@ def run_holographic_experiment():
     for r in ratios:
         damages = []
         for _ in range(50):
-            g = generate_genome_segment(size=1000, coding_ratio=r)
-            d = holographic_noise_simulation(g, intensity=0.2)
+            g = generate_genome_segment(size=1000, coding_ratio=r, rng=rng)
+            d = holographic_noise_simulation(g, intensity=0.2, rng=rng)
             damages.append(d)
         total_damages.append(np.mean(damages))
         
     # Análise Teórica TAMESIS
     # O ponto ótimo deve ser onde a derivada da entropia é zero?
     # Ou onde o sistema maximiza a informação útil vs ruído.
-    
+    return {'ratios': ratios, 'total_damages': np.array(total_damages)}
+
+@register_renderer("holographic_dna")
+def render_holographic_experiment(results):
+    import matplotlib.pyplot as plt
+
+    ratios = results['ratios']
+    total_damages = results['total_damages']
+
     plt.figure(figsize=(10, 6))
     plt.plot(ratios * 100, total_damages, 'g-')
     plt.axvline(x=2.0, color='r', linestyle='--', label='Humano (~2% coding)')
@@ -83,6 +57,8 @@ def run_holographic_experiment():
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def run_holographic_experiment(rng=None):
+    render_holographic_experiment(compute_holographic_experiment(rng))
+
 if __name__ == "__main__":
-    np.random.seed(42)
-    run_holographic_experiment()
+    run_holographic_experiment(rng=np.random.default_rng(42))
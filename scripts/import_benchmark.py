@@ -0,0 +1,90 @@
+"""
+Benchmark de tempo de importação dos módulos de simulação
+
+Cada módulo é importado num interpretador novo (várias repetições, mediana), e o
+relatório indica quais dependências pesadas (matplotlib, scipy, networkx, Bio) foram
+carregadas. Os kernels e os scripts devem custar pouco mais que o próprio numpy;
+bibliotecas de visualização e de grafos só entram quando usadas.
+
+Uso:
+    python import_benchmark.py [--repeat N] [--max-ms MS] [--detail modulo] [modulo ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import experiments
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = ("matplotlib", "scipy", "networkx", "Bio")
+
+# Módulos de núcleo (sem experimento registrado) medidos além dos scripts
+CORE_MODULES = ["numpy", "experiments", "dna_kernels", "graph_kernels", "run_all_simulations"]
+
+_CHILD = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(module, repeat=5):
+    """Mediana do tempo de importação (ms) num interpretador novo, e dependências pesadas."""
+    times = []
+    heavy = []
+    env = dict(os.environ, MPLBACKEND="Agg")
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _CHILD.format(module=module, heavy=HEAVY_MODULES)],
+                             cwd=SCRIPT_DIR, env=env, capture_output=True, text=True, check=True)
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(data["ms"])
+        heavy = data["heavy"]
+    return statistics.median(times), heavy
+
+def import_detail(module, top=15):
+    """As importações mais caras (tempo cumulativo, via -X importtime) de um módulo."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=SCRIPT_DIR, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação dos módulos.")
+    parser.add_argument("modules", nargs="*", help="Módulos a medir (padrão: núcleo + scripts)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por módulo (mediana)")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Falha (código 1) se algum módulo exceder este tempo")
+    parser.add_argument("--detail", default=None, help="Mostra as importações mais caras de um módulo")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.detail:
+        print(f"{'Cumulativo (ms)':>16} {'Próprio (ms)':>13}  Módulo")
+        for cumulative, own, name in import_detail(args.detail):
+            print(f"{cumulative / 1000:>16.1f} {own / 1000:>13.1f}  {name}")
+        sys.exit(0)
+
+    modules = args.modules or CORE_MODULES + experiments.EXPERIMENT_MODULES
+    print(f"{'Módulo':<28} {'Importação (ms)':>16}  Dependências pesadas")
+    print("-" * 70)
+    over_budget = []
+    for module in modules:
+        ms, heavy = measure_import(module, args.repeat)
+        print(f"{module:<28} {ms:>16.1f}  {', '.join(heavy) or '-'}")
+        if args.max_ms is not None and ms > args.max_ms:
+            over_budget.append(module)
+    print("-" * 70)
+    if over_budget:
+        print(f"Acima de {args.max_ms:.0f} ms: {', '.join(over_budget)}")
+        sys.exit(1)
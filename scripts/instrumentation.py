@@ -0,0 +1,162 @@
+"""
+Instrumentação leve dos estágios das simulações
+
+    with stage("mutation"):        # cronômetro por estágio (context manager)
+        ...
+    @timed("scoring")              # ou decorador
+    def score(...): ...
+    count("accepted")              # contadores
+
+Desligada (padrão), `stage` devolve um contexto nulo compartilhado e `timed`/`count`
+retornam imediatamente: o custo é uma checagem de flag. Ligada, cada estágio acumula
+tempo de parede, número de chamadas e (com tracemalloc ativo) bytes alocados, e gera
+eventos no formato Chrome trace (chrome://tracing, Perfetto).
+
+`profile_session` liga a instrumentação para um experimento e grava os relatórios;
+opcionalmente roda cProfile e tracemalloc (opções --instrument/--cprofile/--tracemalloc
+de `run_all_simulations.py`). Também pode ser ligada com TAMESIS_INSTRUMENT=1.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+ENABLED = os.environ.get("TAMESIS_INSTRUMENT", "") not in ("", "0")
+
+_NULL = contextlib.nullcontext()
+_lock = threading.Lock()
+_stats = {}     # nome -> [chamadas, tempo total (s), bytes alocados]
+_counters = {}  # nome -> valor
+_events = []    # eventos Chrome trace
+_origin = time.perf_counter()
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+def reset():
+    global _origin
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        _events.clear()
+        _origin = time.perf_counter()
+
+class _Stage:
+    __slots__ = ("name", "start", "mem")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.mem = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        allocated = tracemalloc.get_traced_memory()[0] - self.mem if self.mem is not None else 0
+        with _lock:
+            entry = _stats.setdefault(self.name, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += end - self.start
+            entry[2] += allocated
+            _events.append({"name": self.name, "ph": "X", "pid": os.getpid(),
+                            "tid": threading.get_ident(),
+                            "ts": (self.start - _origin) * 1e6, "dur": (end - self.start) * 1e6})
+        return False
+
+def stage(name):
+    """Context manager que cronometra um estágio (contexto nulo se desligado)."""
+    if not ENABLED:
+        return _NULL
+    return _Stage(name)
+
+def timed(name=None):
+    """Decorador: cronometra cada chamada da função como o estágio `name` (padrão: nome da função)."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with _Stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, n=1):
+    """Incrementa um contador (ignorado se desligado)."""
+    if ENABLED:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+def report():
+    """Resumo por estágio: chamadas, tempo total/médio e bytes alocados; e os contadores."""
+    with _lock:
+        stages = {name: {"calls": calls, "total_s": total, "mean_s": total / calls,
+                         "alloc_bytes": allocated}
+                  for name, (calls, total, allocated) in _stats.items()}
+        return {"stages": dict(sorted(stages.items(), key=lambda kv: -kv[1]["total_s"])),
+                "counters": dict(_counters)}
+
+def write_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, indent=2)
+
+def write_chrome_trace(path):
+    with _lock:
+        events = list(_events)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def print_report(top=12):
+    stages = report()["stages"]
+    print(f"{'Estágio':<28} {'Chamadas':>10} {'Total (s)':>10} {'Médio (ms)':>11} {'Alocado (MB)':>13}")
+    for name, s in list(stages.items())[:top]:
+        print(f"{name:<28} {s['calls']:>10} {s['total_s']:>10.3f} {s['mean_s'] * 1e3:>11.3f} "
+              f"{s['alloc_bytes'] / 2**20:>13.1f}")
+
+@contextlib.contextmanager
+def profile_session(name, out_dir, cprofile=False, trace_memory=False):
+    """
+    Liga a instrumentação durante o bloco e grava em out_dir:
+        <name>.stages.json  tempo/chamadas/alocação por estágio e contadores
+        <name>.trace.json   eventos Chrome trace
+        <name>.prof         estatísticas do cProfile (se cprofile=True; abrir com pstats/snakeviz)
+        <name>.alloc.txt    principais pontos de alocação (se trace_memory=True)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = ENABLED
+    reset()
+    enable(True)
+    if trace_memory:
+        tracemalloc.start()
+    profiler = None
+    if cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(out_dir, f"{name}.prof"))
+        if trace_memory:
+            # Os eventos do próprio trace não entram no relatório de alocações
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(os.path.join(out_dir, f"{name}.alloc.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Pico de memória rastreada: {peak / 2**20:.1f} MB\n\n")
+                for stat in snapshot.statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+        write_json(os.path.join(out_dir, f"{name}.stages.json"))
+        write_chrome_trace(os.path.join(out_dir, f"{name}.trace.json"))
+        enable(previous)
@@ -0,0 +1,293 @@
+"""
+Modelo de ilhas: evolução Wright–Fisher paralela em processos, com memória compartilhada
+
+K subpopulações (ilhas) de `entropic_dna.WrightFisherPopulation` evoluem em paralelo, as
+ilhas repartidas entre `jobs` processos. Os genomas ficam em `multiprocessing.shared_memory`:
+um bloco (K, 2, n, L) uint8 com os dois buffers de reamostragem de cada ilha e um bloco com
+o índice do buffer atual. A cada `migration_interval` gerações os processos sincronizam
+numa Barrier e cada ilha copia seus migrantes direto do buffer atual das ilhas de origem
+(nenhuma população é serializada entre processos):
+
+    ring   a ilha i recebe migrantes da ilha i - 1
+    all    os migrantes de cada ilha vêm das outras K - 1 ilhas, uniformemente
+
+Cada ilha usa o fluxo stream(seed, i) e faz ela mesma todos os sorteios (quem migra, quem é
+substituído), então o resultado é idêntico bit a bit com jobs=1 (tudo no processo atual) ou
+com vários processos. Os históricos por geração e as frequências de bases por sítio ao fim
+de cada época também são escritos em memória compartilhada; o F_ST entre ilhas mede a
+estrutura populacional resultante.
+
+    res = run_islands(islands=8, island_size=100_000, topology="all", migration_rate=0.005)
+    res['fst'], res['throughput']
+"""
+import os
+import time
+
+import numpy as np
+
+from entropic_dna import WrightFisherPopulation, initial_population
+from experiments import register_experiment, register_renderer
+from rng_streams import ensure_rng, fork, stream
+
+TOPOLOGIES = ("ring", "all")
+
+# --- Memória compartilhada ---
+
+def _layout(islands, island_size, length, generations, epochs):
+    """Nome -> (forma, dtype) dos arrays compartilhados."""
+    return {
+        'genomes': ((islands, 2, island_size, length), np.uint8),
+        'current': ((islands,), np.int64),
+        'history': ((islands, generations, 3), np.float64),
+        'frequencies': ((islands, epochs, length, 4), np.float64),
+    }
+
+def _create_shared(layout):
+    """Cria um bloco por array. Retorna (arrays, blocos, spec para os workers)."""
+    from multiprocessing import shared_memory
+
+    arrays, blocks, spec = {}, [], {}
+    for name, (shape, dtype) in layout.items():
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        block = shared_memory.SharedMemory(create=True, size=nbytes)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        spec[name] = (block.name, shape, np.dtype(dtype).str)
+    return arrays, blocks, spec
+
+def _attach_shared(spec):
+    """Abre nos workers os blocos criados pelo processo principal."""
+    from multiprocessing import shared_memory
+
+    # Os workers (forkserver/spawn) compartilham o resource_tracker do processo principal,
+    # que é quem remove os blocos (unlink) ao final
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return arrays, blocks
+
+# --- Ilhas ---
+
+def migration_sources(island, islands, topology, count, rng):
+    """Ilha de origem de cada um dos `count` migrantes que chegam à ilha `island`."""
+    if islands < 2 or count == 0:
+        return np.empty(0, dtype=np.int64)
+    if topology == "ring":
+        return np.full(count, (island - 1) % islands)
+    others = np.delete(np.arange(islands), island)
+    return others[rng.integers(0, islands - 1, count)]
+
+def _epochs(generations, interval):
+    """Intervalos [início, fim) de gerações entre migrações."""
+    starts = range(0, generations, interval)
+    return [(start, min(start + interval, generations)) for start in starts]
+
+class _Island:
+    """Uma ilha com buffers e saídas nos arrays compartilhados."""
+
+    def __init__(self, index, arrays, params, seed):
+        self.index = index
+        self.arrays = arrays
+        self.params = params
+        self.rng = stream(seed, index)
+        genomes = arrays['genomes'][index]
+        population = initial_population(genomes.shape[1], genomes.shape[2], params['sequences'], self.rng)
+        self.wf = WrightFisherPopulation(population, params['mutation_rate'], params['recombination_rate'],
+                                         params['selection'], buffers=(genomes[0], genomes[1]))
+        self.migrants = int(round(params['migration_rate'] * self.wf.n))
+
+    def evolve(self, epoch, start, stop):
+        history = self.arrays['history'][self.index]
+        for gen in range(start, stop):
+            self.wf.step(self.rng)
+            history[gen] = self.wf.stats()
+        self.arrays['current'][self.index] = self.wf.current
+        self.arrays['frequencies'][self.index, epoch] = self.wf.site_frequencies()
+
+    def pick_migrants(self):
+        """Copia os genomas migrantes dos buffers atuais das ilhas de origem."""
+        genomes, current = self.arrays['genomes'], self.arrays['current']
+        sources = migration_sources(self.index, len(current), self.params['topology'], self.migrants, self.rng)
+        rows = self.rng.integers(0, self.wf.n, len(sources))
+        return genomes[sources, current[sources], rows]
+
+    def receive(self, migrants):
+        if len(migrants):
+            self.wf.replace(self.rng.choice(self.wf.n, len(migrants), replace=False), migrants)
+
+def _run_group(indices, arrays, params, seed, barrier=None):
+    """
+    Evolui as ilhas `indices` (todas, no modo serial). Entre as épocas, duas barreiras
+    separam a leitura dos migrantes (todas as ilhas publicaram o buffer atual) da escrita.
+    """
+    group = [_Island(i, arrays, params, seed) for i in indices]
+    epochs = _epochs(params['generations'], params['migration_interval'])
+    for epoch, (start, stop) in enumerate(epochs):
+        for island in group:
+            island.evolve(epoch, start, stop)
+        if epoch == len(epochs) - 1:
+            break
+        if barrier is not None:
+            barrier.wait()
+        migrants = [island.pick_migrants() for island in group]
+        if barrier is not None:
+            barrier.wait()
+        for island, genomes in zip(group, migrants):
+            island.receive(genomes)
+
+def _group_worker(indices, spec, params, seed, barrier):
+    arrays, blocks = _attach_shared(spec)
+    try:
+        _run_group(indices, arrays, params, seed, barrier)
+    except BaseException:
+        barrier.abort()  # libera os outros processos (BrokenBarrierError) em vez de travá-los
+        raise
+    del arrays  # nenhuma vista pode sobreviver ao fechamento dos blocos
+    for block in blocks:
+        block.close()
+
+def _run_parallel(islands, jobs, spec, params, seed):
+    """Um processo por grupo de ilhas (ilhas w, w + jobs, ...), sincronizados por uma Barrier."""
+    import multiprocessing
+
+    context = multiprocessing.get_context("forkserver" if os.name == "posix" else "spawn")
+    barrier = context.Barrier(jobs)
+    workers = [context.Process(target=_group_worker,
+                               args=(list(range(w, islands, jobs)), spec, params, seed, barrier))
+               for w in range(jobs)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    failed = [w for w, worker in enumerate(workers) if worker.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Processo(s) de ilhas {failed} falharam "
+                           f"(códigos {[workers[w].exitcode for w in failed]})")
+
+def _collect(arrays, epochs):
+    """Cópias dos resultados (independentes dos blocos compartilhados)."""
+    islands = len(arrays['current'])
+    frequencies = arrays['frequencies'].copy()
+    return {
+        'history': arrays['history'].copy(),
+        'epoch_generations': np.array([stop for _, stop in epochs]),
+        'fst': np.array([fixation_index(frequencies[:, e]) for e in range(len(epochs))]),
+        'final_frequencies': frequencies[:, -1],
+        'final_population': arrays['genomes'][np.arange(islands), arrays['current']],
+    }
+
+# --- Estrutura populacional ---
+
+def fixation_index(frequencies):
+    """
+    F_ST (G_ST de Nei) entre ilhas a partir das frequências (K, L, 4):
+    (H_T - H_S) / H_T, com as heterozigosidades médias sobre os sítios.
+    """
+    h_s = np.mean(1 - np.sum(frequencies ** 2, axis=-1))
+    h_t = np.mean(1 - np.sum(frequencies.mean(axis=0) ** 2, axis=-1))
+    return float((h_t - h_s) / h_t) if h_t > 0 else 0.0
+
+def run_islands(islands=4, island_size=25_000, length=50, generations=200, migration_interval=10,
+                migration_rate=0.01, topology="ring", jobs=None, mutation_rate=1e-3,
+                recombination_rate=0.01, selection=1.0, sequences=None, rng=None):
+    """
+    Evolução em K ilhas com migração a cada `migration_interval` gerações (fração
+    `migration_rate` de cada ilha substituída por migrantes). jobs=None usa até um processo
+    por núcleo; jobs=1 roda no processo atual. Retorna históricos (K, gerações, 3), F_ST por
+    época, frequências finais por ilha e a vazão (indivíduos × gerações por segundo).
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topologia desconhecida: {topology} (esperado {', '.join(TOPOLOGIES)})")
+    if sequences is not None:
+        length = len(sequences[0])
+    seed = fork(ensure_rng(rng))
+    jobs = min(islands, jobs or os.cpu_count() or 1)
+    epochs = _epochs(generations, migration_interval)
+    params = {'generations': generations, 'migration_interval': migration_interval,
+              'migration_rate': migration_rate, 'topology': topology, 'mutation_rate': mutation_rate,
+              'recombination_rate': recombination_rate, 'selection': selection, 'sequences': sequences}
+    layout = _layout(islands, island_size, length, generations, len(epochs))
+
+    print(f"Modelo de ilhas: {islands} × {island_size} indivíduos, migração {topology} "
+          f"({migration_rate:g} a cada {migration_interval} gerações), {jobs} processo(s)...")
+    if jobs <= 1:
+        arrays, blocks = {name: np.zeros(shape, dtype) for name, (shape, dtype) in layout.items()}, []
+    else:
+        arrays, blocks, spec = _create_shared(layout)
+    try:
+        start = time.perf_counter()
+        if jobs <= 1:
+            _run_group(range(islands), arrays, params, seed)
+        else:
+            _run_parallel(islands, jobs, spec, params, seed)
+        elapsed = time.perf_counter() - start
+        results = _collect(arrays, epochs)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+            block.unlink()
+    results.update(elapsed=elapsed, throughput=islands * island_size * generations / elapsed,
+                   jobs=jobs, topology=topology)
+    print(f"Concluído em {elapsed:.2f}s: {results['throughput']:.3g} indivíduos·geração/s, "
+          f"F_ST final = {results['fst'][-1]:.4f}")
+    return results
+
+@register_experiment("island_model", seed=42)
+def compute_island_model(islands=4, island_size=25_000, generations=200, migration_interval=10,
+                         migration_rate=0.01, topology="ring", jobs=0, rng=None):
+    """
+    Ilhas Wright–Fisher com migração: ressonância por ilha e F_ST ao longo das gerações.
+    jobs=0 usa até um processo por núcleo (inteiro, para `-p island_model.jobs=N`).
+    """
+    res = run_islands(islands, island_size, generations=generations, migration_interval=migration_interval,
+                      migration_rate=migration_rate, topology=topology, jobs=jobs, rng=rng)
+    # A população final e a vazão (dependente da máquina) ficam fora do resultado guardado
+    return {'history': res['history'], 'epoch_generations': res['epoch_generations'],
+            'fst': res['fst'], 'final_frequencies': res['final_frequencies'], 'topology': topology,
+            'migration_rate': migration_rate}
+
+@register_renderer("island_model")
+def render_island_model(results):
+    import matplotlib.pyplot as plt
+
+    history = results['history']
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5))
+    colors = plt.get_cmap('viridis')(np.linspace(0, 0.9, len(history)))
+    for i, color in enumerate(colors):
+        ax1.plot(history[i, :, 0], color=color, linewidth=1.5, label=f'Ilha {i}')
+    ax1.set_title('Ressonância Ω Média por Ilha')
+    ax1.set_xlabel('Geração')
+    ax1.set_ylabel('Ω Resonance (a.u.)')
+    ax1.legend(fontsize=8, ncol=2)
+    ax1.grid(True, alpha=0.3)
+
+    ax2.plot(results['epoch_generations'], results['fst'], 'o-', color='#d62728', linewidth=2)
+    ax2.set_title(f"Estrutura Populacional (migração {results['topology']}, "
+                  f"m = {float(results['migration_rate']):g})")
+    ax2.set_xlabel('Geração')
+    ax2.set_ylabel('F_ST entre ilhas')
+    ax2.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    outfile = "../imgs/island_model.png"
+    fig.savefig(outfile, dpi=300, bbox_inches="tight")
+    print(f"Concluído. Gráfico salvo em {outfile}")
+    plt.close(fig)
+
+def simulate_island_model(rng=None, **kwargs):
+    """Evolução em ilhas: ressonância por ilha e diferenciação (F_ST) entre elas."""
+    render_island_model(compute_island_model(rng=rng, **kwargs))
+
+if __name__ == "__main__":
+    # Verificação: mesmo resultado no processo atual e em vários processos, e vazão de cada modo
+    kwargs = dict(islands=4, island_size=50_000, generations=60, topology="all", rng=7)
+    serial = run_islands(jobs=1, **kwargs)
+    parallel = run_islands(jobs=4, **kwargs)
+    assert np.array_equal(serial['history'], parallel['history'])
+    assert np.array_equal(serial['final_population'], parallel['final_population'])
+    print(f"Resultados idênticos; aceleração {parallel['throughput'] / serial['throughput']:.2f}x "
+          f"com {os.cpu_count()} núcleo(s)")
+    simulate_island_model(rng=np.random.default_rng(42))
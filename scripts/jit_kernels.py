@@ -0,0 +1,231 @@
+"""
+Kernels sequenciais com backend JIT opcional (Numba)
+
+Alguns laços são sequenciais por natureza (cada passo depende do anterior):
+    clamped_walk        passeio com piso (entropy_reversal, cadeia Omega da abiogênese)
+    chain_reset_walk    cadeia que zera no fracasso (abiogênese, modelo aleatório)
+    kuramoto_coherence  atualização passo a passo do modelo de Kuramoto (consciousness_resonance)
+    global_efficiency   BFS de todos os pares, dominante na cadeia de Metropolis (cas9_flow)
+
+Cada kernel tem um corpo em laço (`_*_loop`, subconjunto compatível com Numba), compilado
+com `numba.njit` quando o Numba está instalado, e uma versão NumPy/SciPy usada quando não
+está. Os sorteios aleatórios são feitos fora dos kernels, então os dois backends recebem
+as mesmas entradas.
+
+Seleção: TAMESIS_JIT=auto (padrão: numba se disponível) | numba | numpy, ou `set_backend`.
+`check_equivalence()` (também `python jit_kernels.py`) compara as versões NumPy e compilada
+com o laço de referência não compilado.
+"""
+import importlib.util
+import os
+
+import numpy as np
+
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+_backend = os.environ.get("TAMESIS_JIT", "auto")
+_compiled = {}
+
+def set_backend(name):
+    """'auto', 'numba' ou 'numpy'."""
+    global _backend
+    if name not in ("auto", "numba", "numpy"):
+        raise ValueError(f"Backend JIT desconhecido: {name}")
+    if name == "numba" and not HAVE_NUMBA:
+        raise ImportError("Backend 'numba' pedido, mas o Numba não está instalado")
+    _backend = name
+
+def backend():
+    """Backend efetivo: 'numba' ou 'numpy'."""
+    return "numba" if _backend != "numpy" and HAVE_NUMBA else "numpy"
+
+def _jit(loop):
+    """Versão compilada do laço (compilada na primeira chamada; cache em disco do Numba)."""
+    if loop not in _compiled:
+        from numba import njit
+
+        _compiled[loop] = njit(cache=True)(loop)
+    return _compiled[loop]
+
+# --- Passeio com piso: s_t = max(floor, s_{t-1} + d_t) ---
+
+def _clamped_walk_loop(start, increments, floor):
+    out = np.empty(increments.shape[0])
+    s = start
+    for i in range(increments.shape[0]):
+        s = max(floor, s + increments[i])
+        out[i] = s
+    return out
+
+def _clamped_walk_numpy(start, increments, floor):
+    # Recursão de Lindley: W_t = S_t - min(0, min_{k<=t} S_k), com S a soma acumulada a partir do piso
+    partial = (start - floor) + np.cumsum(increments)
+    return floor + partial - np.minimum(np.minimum.accumulate(partial), 0)
+
+def clamped_walk(start, increments, floor=0.0):
+    """Trajetória s_1..s_n de s_t = max(floor, s_{t-1} + increments[t-1]), s_0 = start."""
+    increments = np.asarray(increments, dtype=float)
+    if backend() == "numba":
+        return _jit(_clamped_walk_loop)(float(start), increments, float(floor))
+    return _clamped_walk_numpy(float(start), increments, float(floor))
+
+# --- Cadeia que zera no fracasso: c_t = c_{t-1} + 1 se sucesso, senão 0 ---
+
+def _chain_reset_walk_loop(success):
+    out = np.empty(success.shape[0], dtype=np.int64)
+    c = 0
+    for i in range(success.shape[0]):
+        c = c + 1 if success[i] else 0
+        out[i] = c
+    return out
+
+def _chain_reset_walk_numpy(success):
+    idx = np.arange(len(success))
+    last_failure = np.maximum.accumulate(np.where(success, -1, idx))
+    return np.where(last_failure < 0, idx + 1, idx - last_failure).astype(np.int64)
+
+def chain_reset_walk(success):
+    """Comprimento da sequência de sucessos consecutivos terminando em cada passo."""
+    success = np.asarray(success, dtype=bool)
+    if backend() == "numba":
+        return _jit(_chain_reset_walk_loop)(success)
+    return _chain_reset_walk_numpy(success)
+
+# --- Kuramoto de duas populações acopladas por campo médio ---
+
+def _kuramoto_loop(phases_a, phases_b, drift_a, drift_b, coupling, noise):
+    a = phases_a.copy()
+    b = phases_b.copy()
+    n = a.shape[0]
+    out = np.empty(coupling.shape[0])
+    for t in range(coupling.shape[0]):
+        acc = 0.0
+        for i in range(n):
+            acc += np.sin(b[i] - a[i])
+        interaction = acc / n
+        step_a = drift_a + coupling[t] * interaction + noise[t]
+        step_b = drift_b + coupling[t] * interaction
+        re = 0.0
+        im = 0.0
+        for i in range(n):
+            a[i] += step_a
+            b[i] += step_b
+            re += np.cos(a[i] - b[i])
+            im += np.sin(a[i] - b[i])
+        out[t] = np.sqrt(re * re + im * im) / n
+    return out
+
+def _kuramoto_numpy(phases_a, phases_b, drift_a, drift_b, coupling, noise):
+    a = phases_a.copy()
+    b = phases_b.copy()
+    out = np.empty(len(coupling))
+    for t in range(len(coupling)):
+        interaction = np.mean(np.sin(b - a))
+        a += drift_a + coupling[t] * interaction + noise[t]
+        b += drift_b + coupling[t] * interaction
+        out[t] = np.abs(np.mean(np.exp(1j * (a - b))))
+    return out
+
+def kuramoto_coherence(phases_a, phases_b, drift_a, drift_b, coupling, noise):
+    """
+    Parâmetro de ordem |<exp(i(a - b))>| a cada passo de
+        a += drift_a + K_t <sin(b - a)> + ruído_t
+        b += drift_b + K_t <sin(b - a)>
+    com `coupling` (K_t) e `noise` com um valor por passo.
+    """
+    args = (np.asarray(phases_a, dtype=float), np.asarray(phases_b, dtype=float), float(drift_a),
+            float(drift_b), np.asarray(coupling, dtype=float), np.asarray(noise, dtype=float))
+    if backend() == "numba":
+        return _jit(_kuramoto_loop)(*args)
+    return _kuramoto_numpy(*args)
+
+# --- Eficiência global (média de 1/d sobre os pares ordenados) ---
+
+def _global_efficiency_loop(indptr, indices):
+    n = indptr.shape[0] - 1
+    if n < 2:
+        return 0.0
+    dist = np.empty(n, dtype=np.int64)
+    queue = np.empty(n, dtype=np.int64)
+    total = 0.0
+    for source in range(n):
+        dist[:] = -1
+        dist[source] = 0
+        queue[0] = source
+        head = 0
+        tail = 1
+        while head < tail:
+            u = queue[head]
+            head += 1
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if dist[v] < 0:
+                    dist[v] = dist[u] + 1
+                    total += 1.0 / dist[v]
+                    queue[tail] = v
+                    tail += 1
+    return total / (n * (n - 1))
+
+def _global_efficiency_numpy(indptr, indices):
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path
+
+    n = len(indptr) - 1
+    if n < 2:
+        return 0.0
+    adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+    dist = shortest_path(adjacency, unweighted=True, directed=False)
+    finite = np.isfinite(dist) & (dist > 0)
+    return float(np.sum(1.0 / dist[finite]) / (n * (n - 1)))
+
+def global_efficiency(indptr, indices):
+    """Eficiência global (como `networkx.global_efficiency`) de um grafo em CSR (não ponderado)."""
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    if backend() == "numba":
+        return _jit(_global_efficiency_loop)(indptr, indices)
+    return _global_efficiency_numpy(indptr, indices)
+
+# --- Verificação de equivalência ---
+
+def _random_csr(n, p, rng):
+    upper = np.triu(rng.random((n, n)) < p, 1)
+    adjacency = upper | upper.T
+    indptr = np.concatenate([[0], np.cumsum(adjacency.sum(axis=1))])
+    return indptr.astype(np.int64), np.nonzero(adjacency)[1].astype(np.int64)
+
+def check_equivalence(seed=0, rtol=1e-9):
+    """
+    Compara cada kernel (NumPy e, se disponível, Numba) com o laço de referência não
+    compilado, em entradas aleatórias. Retorna {kernel: {backend: bool}}.
+    """
+    rng = np.random.default_rng(seed)
+    increments = rng.uniform(-0.5, 0.4, 2000)
+    success = rng.random(2000) < 0.3
+    phases_a, phases_b = rng.uniform(0, 2 * np.pi, (2, 100))
+    coupling = np.where(np.arange(300) > 100, 1.618, 0.5)
+    noise = rng.normal(0, 0.05, 300)
+    indptr, indices = _random_csr(120, 0.04, rng)
+
+    cases = {
+        'clamped_walk': (_clamped_walk_loop, _clamped_walk_numpy, (3.0, increments, 0.0)),
+        'chain_reset_walk': (_chain_reset_walk_loop, _chain_reset_walk_numpy, (success,)),
+        'kuramoto_coherence': (_kuramoto_loop, _kuramoto_numpy,
+                               (phases_a, phases_b, 0.1, 0.1 * 117.038 / 100, coupling, noise)),
+        'global_efficiency': (_global_efficiency_loop, _global_efficiency_numpy, (indptr, indices)),
+    }
+    report = {}
+    for name, (loop, numpy_impl, args) in cases.items():
+        reference = loop(*args)
+        report[name] = {'numpy': bool(np.allclose(numpy_impl(*args), reference, rtol=rtol, atol=1e-12))}
+        if HAVE_NUMBA:
+            report[name]['numba'] = bool(np.allclose(_jit(loop)(*args), reference, rtol=rtol, atol=1e-12))
+    return report
+
+if __name__ == "__main__":
+    print(f"Numba disponível: {HAVE_NUMBA} | backend: {backend()}")
+    report = check_equivalence()
+    for name, results in report.items():
+        print(f"{name:<22} " + "  ".join(f"{b}={'ok' if ok else 'DIVERGE'}" for b, ok in results.items()))
+    if not all(all(r.values()) for r in report.values()):
+        raise SystemExit(1)
@@ -0,0 +1,283 @@
+"""
+Entropias de blocos (k-mers) e estimativas da taxa de entropia
+
+`calculate_shannon_entropy` mede só a composição de bases (H_1): uma sequência periódica
+como a 'omega_resonant' de `generate_dna_sequence` tem H_1 quase igual à do DNA aleatório.
+A ordem aparece nas entropias de blocos H_k (entropia da distribuição dos k-mers) e na
+entropia condicional h_k = H_k - H_{k-1}, que converge para a taxa de entropia (bits por
+base): ~2 no DNA aleatório, bem menor numa sequência periódica com ruído.
+
+Cada base vira um código de 2 bits (A=0, T=1, C=2, G=3) e os códigos dos k-mers são
+rolados de k - 1 para k com um deslocamento e um OR sobre o array inteiro, então passar
+a k + 1 custa O(n) e nenhum objeto Python é criado por k-mer (k <= 12 cabe em 24 bits).
+As contagens vêm de `np.bincount` (ou de uma ordenação, quando 4^k bins seriam muito
+mais que os k-mers observados). Bases inválidas (N, ...) interrompem os k-mers que as
+contêm.
+
+    block_entropies(seq, k_max=12)          H_1..H_k de uma sequência (str, bytes ou códigos)
+    entropy_rates(H)                        h_k condicionais e H_k / k
+    entropy_rate(seq)                       estimativa de h no maior k bem amostrado
+    population_block_entropy(codes, k)      H_k de cada linha de uma matriz (N, L) de códigos
+    windowed_block_entropy(seq, k, w, s)    H_k em janelas deslizantes
+    KmerCounter / fasta_chunks              contagens acumuladas de um genoma lido em blocos
+
+Códigos numéricos de entrada seguem `dna_kernels.BASE_LUT` (A=1, T=2, C=3, G=4, 0 inválido),
+como as populações de `entropic_dna`.
+"""
+import numpy as np
+
+from dna_kernels import BASE_LUT
+
+MAX_K = 12  # códigos de k-mers em uint32 (2k <= 24 bits)
+
+# Contagens densas (bincount) até 4 bins por k-mer observado e no máximo DENSE_BINS bins;
+# acima disso, ordenação
+DENSE_BINS = 1 << 22
+
+# k-mers esperados por k-mer possível para considerar H_k bem amostrado (entropy_rate)
+MIN_COVERAGE = 10
+
+# --- Códigos ---
+
+def base_codes(sequence):
+    """Códigos de 2 bits (uint8, 0..3) e máscara de bases válidas, de str, bytes ou códigos 1..4."""
+    if isinstance(sequence, str):
+        sequence = sequence.encode('ascii', 'replace')
+    if isinstance(sequence, (bytes, bytearray, memoryview)):
+        codes = BASE_LUT[np.frombuffer(sequence, dtype=np.uint8)]
+    else:
+        codes = np.asarray(sequence)
+    valid = (codes >= 1) & (codes <= 4)
+    return np.where(valid, codes - 1, 0).astype(np.uint8), valid
+
+def rolling_kmers(codes, valid, k_max=MAX_K):
+    """
+    Gera (k, códigos dos k-mers, máscara de validade) para k = 1..k_max ao longo do último
+    eixo: code_k[i] = code_{k-1}[i] << 2 | base[i + k - 1], O(n) por k.
+    """
+    if not 1 <= k_max <= MAX_K:
+        raise ValueError(f"k deve estar entre 1 e {MAX_K}")
+    kmers = codes.astype(np.uint32)
+    ok = valid
+    yield 1, kmers, ok
+    for k in range(2, k_max + 1):
+        if kmers.shape[-1] <= 1:
+            return
+        kmers = (kmers[..., :-1] << 2) | codes[..., k - 1:]
+        ok = ok[..., :-1] & valid[..., k - 1:]
+        yield k, kmers, ok
+
+def _counts(keys, bins):
+    # bincount enquanto os bins couberem; senão ordenação (custo dos k-mers, não dos bins)
+    if bins <= min(DENSE_BINS, max(1 << 10, 4 * len(keys))):
+        counts = np.bincount(keys, minlength=bins)
+        present = np.flatnonzero(counts)
+        return present, counts[present]
+    return np.unique(keys, return_counts=True)
+
+def kmer_counts(kmers, k):
+    """Contagens dos k-mers: (códigos presentes, contagens)."""
+    return _counts(np.ravel(kmers), 4 ** k)
+
+# --- Entropias ---
+
+def entropy_from_counts(counts, correction=None):
+    """
+    Entropia (bits) de uma distribuição de contagens. correction='miller_madow' soma o
+    viés de primeira ordem (K - 1) / (2 N ln 2), K o número de categorias observadas.
+    """
+    counts = np.asarray(counts, dtype=float)
+    counts = counts[counts > 0]
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    h = np.log2(total) - np.sum(counts * np.log2(counts)) / total
+    if correction == 'miller_madow':
+        h += (len(counts) - 1) / (2 * total * np.log(2))
+    elif correction is not None:
+        raise ValueError(f"Correção desconhecida: {correction}")
+    return float(h)
+
+def block_entropies(sequence, k_max=MAX_K, correction=None):
+    """Entropias de blocos H_1..H_{k_max} (bits) de uma sequência."""
+    codes, valid = base_codes(sequence)
+    entropies = np.zeros(k_max)
+    for k, kmers, ok in rolling_kmers(codes, valid, k_max):
+        entropies[k - 1] = entropy_from_counts(kmer_counts(kmers[ok], k)[1], correction)
+    return entropies
+
+def entropy_rates(block):
+    """
+    Estimativas da taxa de entropia a partir de H_1..H_k (último eixo):
+    'conditional' h_k = H_k - H_{k-1} (H_0 = 0) e 'block' H_k / k.
+    """
+    block = np.asarray(block, dtype=float)
+    k = np.arange(1, block.shape[-1] + 1)
+    return {'conditional': np.diff(block, axis=-1, prepend=0.0), 'block': block / k}
+
+def reliable_k(n_kmers, k_max=MAX_K, coverage=MIN_COVERAGE):
+    """Maior k com pelo menos `coverage` k-mers observados por k-mer possível (mínimo 1)."""
+    k = int(np.floor(np.log(max(n_kmers, 1) / coverage) / np.log(4))) if n_kmers > coverage else 1
+    return int(np.clip(k, 1, k_max))
+
+def entropy_rate(sequence, k_max=MAX_K, coverage=MIN_COVERAGE, correction='miller_madow'):
+    """
+    Taxa de entropia (bits/base): h_k condicional no maior k bem amostrado. Acima dele
+    H_k satura em log2(n) e h_k cai por falta de amostras, não por estrutura; a correção
+    de Miller–Madow remove o viés restante (DNA aleatório: ~1.96 sem ela, ~2.00 com ela).
+    """
+    k = reliable_k(int(base_codes(sequence)[1].sum()), k_max, coverage)
+    return float(entropy_rates(block_entropies(sequence, k, correction))['conditional'][-1])
+
+def _grouped_entropy(kmers, ok, k, correction=None):
+    """H_k de cada linha de uma matriz (G, m) de códigos de k-mers (sem objetos por grupo)."""
+    n_groups, m = kmers.shape
+    bins = 4 ** k
+    if bins <= 4 * m:
+        # Poucos bins por linha: contagens densas (linhas, 4^k) em blocos de até DENSE_BINS
+        total = np.empty(n_groups)
+        weighted = np.empty(n_groups)
+        distinct = np.empty(n_groups)
+        clog = np.arange(m + 1) * np.log2(np.maximum(np.arange(m + 1), 1))
+        rows = max(1, DENSE_BINS // bins)
+        for start in range(0, n_groups, rows):
+            block, valid = kmers[start:start + rows], ok[start:start + rows]
+            offsets = np.arange(len(block), dtype=np.int64)[:, None] * bins
+            dense = np.bincount((offsets + block)[valid], minlength=len(block) * bins).reshape(len(block), bins)
+            total[start:start + rows] = dense.sum(axis=1)
+            weighted[start:start + rows] = clog[dense].sum(axis=1)
+            distinct[start:start + rows] = np.count_nonzero(dense, axis=1)
+    else:
+        # Muitos bins: contagens por ordenação das chaves (linha, k-mer)
+        groups = np.broadcast_to(np.arange(n_groups)[:, None], kmers.shape)[ok].astype(np.int64)
+        keys, counts = _counts(groups * bins + kmers[ok], n_groups * bins)
+        owner = keys // bins
+        counts = counts.astype(float)
+        total = np.bincount(owner, weights=counts, minlength=n_groups)
+        weighted = np.bincount(owner, weights=counts * np.log2(counts), minlength=n_groups)
+        distinct = np.bincount(owner, minlength=n_groups)
+    total = np.maximum(total, 1)
+    h = np.log2(total) - weighted / total
+    if correction == 'miller_madow':
+        h = h + np.maximum(distinct - 1, 0) / (2 * total * np.log(2))
+    elif correction is not None:
+        raise ValueError(f"Correção desconhecida: {correction}")
+    return h
+
+def population_block_entropy(codes, k, correction=None):
+    """H_k de cada linha de uma matriz (N, L) de códigos (k-mers não cruzam linhas)."""
+    base, valid = base_codes(np.atleast_2d(codes))
+    for kk, kmers, ok in rolling_kmers(base, valid, k):
+        if kk == k:
+            return _grouped_entropy(kmers, ok, k, correction)
+    return np.zeros(len(base))
+
+def windowed_block_entropy(sequence, k, window, step=None, correction=None):
+    """
+    H_k em janelas [s, s + window) com s = 0, step, 2 step, ... (padrão: sem sobreposição).
+    Custo O(n · window / step): cada janela conta os próprios window - k + 1 k-mers.
+    Retorna (inícios das janelas, H_k por janela).
+    """
+    step = step or window
+    codes, valid = base_codes(sequence)
+    if window < k or len(codes) < window:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    for kk, kmers, ok in rolling_kmers(codes, valid, k):
+        if kk == k:
+            break
+    view = np.lib.stride_tricks.sliding_window_view
+    starts = np.arange(0, len(codes) - window + 1, step)
+    rows = view(kmers, window - k + 1)[starts]
+    return starts, _grouped_entropy(rows, view(ok, window - k + 1)[starts], k, correction)
+
+# --- Genomas em blocos ---
+
+class KmerCounter:
+    """
+    Contagens acumuladas de k-mers (k = 1..k_max) de um genoma lido em blocos. Os k_max - 1
+    últimos códigos de cada bloco são guardados, então os k-mers que cruzam a fronteira
+    entre blocos são contados como numa leitura única. Memória: 8 · 4^k bytes por k
+    (k_max = 12: ~180 MB).
+    """
+
+    def __init__(self, k_max=MAX_K):
+        if not 1 <= k_max <= MAX_K:
+            raise ValueError(f"k deve estar entre 1 e {MAX_K}")
+        self.k_max = k_max
+        self.counts = [np.zeros(4 ** k, dtype=np.int64) for k in range(1, k_max + 1)]
+        self._tail = (np.empty(0, dtype=np.uint8), np.empty(0, dtype=bool))
+        self.bases = 0
+
+    def update(self, chunk):
+        """Conta os k-mers de um bloco (str, bytes ou códigos 1..4)."""
+        codes, valid = base_codes(chunk)
+        if len(codes) == 0:
+            return self
+        overlap = len(self._tail[0])
+        codes = np.concatenate([self._tail[0], codes])
+        valid = np.concatenate([self._tail[1], valid])
+        for k, kmers, ok in rolling_kmers(codes, valid, self.k_max):
+            # k-mers que terminam no bloco novo (os anteriores já foram contados)
+            first = max(0, overlap - k + 1)
+            present, counts = kmer_counts(kmers[first:][ok[first:]], k)
+            self.counts[k - 1][present] += counts
+        self.bases += len(codes) - overlap
+        keep = self.k_max - 1
+        self._tail = (codes[max(0, len(codes) - keep):] if keep else codes[:0],
+                      valid[max(0, len(valid) - keep):] if keep else valid[:0])
+        return self
+
+    def block_entropies(self, correction=None):
+        return np.array([entropy_from_counts(c, correction) for c in self.counts])
+
+def fasta_chunks(path, chunk_bytes=1 << 24):
+    """Blocos de bases (bytes, maiúsculas) de um FASTA, sem cabeçalhos nem quebras de linha."""
+    with open(path, 'rb') as f:
+        buffer = []
+        size = 0
+        for line in f:
+            if line.startswith(b'>'):
+                continue
+            line = line.strip().upper()
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_bytes:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+def stream_block_entropies(chunks, k_max=MAX_K, correction=None):
+    """H_1..H_{k_max} de um genoma dado como iterável de blocos (ex.: `fasta_chunks`)."""
+    counter = KmerCounter(k_max)
+    for chunk in chunks:
+        counter.update(chunk)
+    return counter.block_entropies(correction)
+
+if __name__ == "__main__":
+    # Verificação contra contagem direta e comparação aleatório vs. periódico (omega_resonant)
+    from collections import Counter
+
+    from dna_kernels import calculate_shannon_entropy, generate_dna_sequence
+
+    rng = np.random.default_rng(0)
+    seq = generate_dna_sequence(20_000, 'random', rng)
+    seq = seq[:5000] + "NN" + seq[5000:]
+    for k in (1, 3, 7):
+        words = Counter(seq[i:i + k] for i in range(len(seq) - k + 1) if 'N' not in seq[i:i + k])
+        assert np.isclose(block_entropies(seq, k)[-1], entropy_from_counts(list(words.values())))
+    assert np.isclose(block_entropies(seq, 1)[0], calculate_shannon_entropy(seq.replace("N", "")))
+    # Blocos menores que k_max - 1 também (a cauda guardada cruza vários blocos)
+    for size in (1, 5, 7, 777):
+        streamed = stream_block_entropies([seq[i:i + size] for i in range(0, len(seq), size)], 8)
+        assert np.allclose(streamed, block_entropies(seq, 8)), size
+    rows = rng.integers(1, 5, (50, 200), dtype=np.uint8)
+    assert np.allclose(population_block_entropy(rows, 4), [block_entropies(r, 4)[-1] for r in rows])
+    starts, windowed = windowed_block_entropy(seq, 3, 1000, 500)
+    assert np.allclose(windowed, [block_entropies(seq[s:s + 1000], 3)[-1] for s in starts])
+
+    print(f"{'Sequência':<16} {'H_1':>6} {'h_2':>6} {'h_4':>6} {'h_8':>6} {'taxa':>6}")
+    for mode in ('random', 'omega_resonant'):
+        s = generate_dna_sequence(1_000_000, mode, np.random.default_rng(1))
+        h = entropy_rates(block_entropies(s, 8))['conditional']
+        print(f"{mode:<16} {h[0]:>6.3f} {h[1]:>6.3f} {h[3]:>6.3f} {h[7]:>6.3f} {entropy_rate(s):>6.3f}")
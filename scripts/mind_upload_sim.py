@@ -1,6 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
+
+from graph_kernels import (entropy_from_eigenvalues, graph_to_edges, laplacian_from_edges,
+                           spectral_distance, spectral_entropy_slq, top_spectrum)
+from experiments import register_experiment, register_renderer
+from render_utils import plot_history
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,76 +12,176 @@ OMEGA = 117.038
 # O substrato de destino deve ter "Impedância Entrópica" compatível.
 # Se Impedância(Crystal) != Impedância(Cérebro), a consciência se dissipa como calor.
 
-def create_neural_graph(nodes=50):
-    G = nx.watts_strogatz_graph(nodes, k=6, p=0.3)
+DENSE_LIMIT = 2000  # Acima disso, o espectro é estimado por Lanczos esparso
+
+def create_neural_graph(nodes=50, rng=None):
+    import networkx as nx
+
+    rng = ensure_rng(rng)
+    G = nx.watts_strogatz_graph(nodes, k=6, p=0.3, seed=rng)
     # Adicionar "pesos" (memórias)
     for (u, v) in G.edges():
-        G.edges[u,v]['weight'] = np.random.random()
+        G.edges[u,v]['weight'] = rng.random()
     return G
 
-def simulate_upload_process(steps=100):
-    print("Iniciando Experimento 13: Mind Upload Protocol...")
-    
-    source_brain = create_neural_graph()
-    target_crystal = nx.erdos_renyi_graph(50, 0.1) # Estrutura inicial do cristal (vazio/aleatório)
-    
-    # Métrica: Entropia de Von Neumann (A assinatura da consciência)
-    def spectral_entropy(G):
-        L = nx.laplacian_matrix(G).toarray()
-        eig = np.linalg.eigvalsh(L)
-        eig = eig[eig > 1e-10]
-        prob = eig / np.sum(eig)
-        return -np.sum(prob * np.log(prob))
-    
-    target_entropy = spectral_entropy(source_brain)
-    
-    transfer_integrity = []
-    entropy_loss = []
-    
-    # Processo de Upload
+def default_resistance(t, steps):
+    """
+    Fator de Resistência do Material
+    Material Comum (Silício): Alta resistência entrópica (perda de dados)
+    Material Omega (Cristal TAMESIS): Ressonância perfeita (troca na metade do upload)
+    """
+    return 0.0 if t > steps // 2 else 0.5
+
+def upload_engine(source, target, steps=100, resistance=default_resistance, method='auto',
+                  n_probes=8, lanczos_steps=30, k_eigs=10, rng=None):
+    """
+    Motor de upload: copia arestas do grafo de origem para o grafo de destino, passo a passo.
+
+    A cada passo, um lote de arestas divergentes (ausentes, com peso errado ou espúrias no
+    destino) é copiado; cópias que falham (probabilidade = resistência do material) dissipam
+    seu peso como calor e voltam para o fim da fila. Após cada passo são medidas a entropia
+    espectral do destino e a distância espectral entre origem e destino.
+
+    method='dense' usa o espectro completo (eigvalsh); method='sparse' usa SLQ para a
+    entropia e Lanczos (top-k, partida a quente) para a distância, sem custo O(n^3) por
+    passo. 'auto' escolhe 'sparse' acima de DENSE_LIMIT nós.
+    `source`/`target` são grafos networkx ou tuplas (n, u, v, w).
+    """
+    rng = ensure_rng(rng)
+
+    def as_edges(G):
+        if isinstance(G, tuple):
+            return G
+        return (G.number_of_nodes(),) + graph_to_edges(G)
+
+    n_src, u_src, v_src, w_src = as_edges(source)
+    n_tgt, u_tgt, v_tgt, w_tgt = as_edges(target)
+    n = max(n_src, n_tgt)
+    if method == 'auto':
+        method = 'sparse' if n > DENSE_LIMIT else 'dense'
+
+    # União das arestas (chave u*n+v) com pesos de origem e de destino alinhados
+    key_src = u_src * n + v_src
+    key_tgt = u_tgt * n + v_tgt
+    keys = np.union1d(key_src, key_tgt)
+    source_w = np.zeros(len(keys))
+    target_w = np.zeros(len(keys))
+    source_w[np.searchsorted(keys, key_src)] = w_src
+    target_w[np.searchsorted(keys, key_tgt)] = w_tgt
+    edge_u = keys // n
+    edge_v = keys % n
+
+    L_source = laplacian_from_edges(n, edge_u, edge_v, source_w)
+    if method == 'dense':
+        spec_source = np.sort(np.linalg.eigvalsh(L_source.toarray()))
+        entropy_source = entropy_from_eigenvalues(spec_source)
+    else:
+        k = min(k_eigs, n - 2)
+        probes = rng.choice([-1.0, 1.0], size=(n, n_probes))
+        spec_source, _ = top_spectrum(L_source, k)
+        entropy_source = spectral_entropy_slq(L_source, probes, lanczos_steps)
+        v0 = None
+
+    # Fila de cópia (ordem aleatória)
+    queue = list(rng.permutation(np.flatnonzero(source_w != target_w)))
+    batch_size = max(1, int(np.ceil(len(queue) / steps)))
+    total_weight = source_w.sum() + target_w[source_w == 0].sum()
+
+    history = {key: np.zeros(steps) for key in
+               ('entropy_target', 'spectral_distance', 'integrity', 'heat', 'copied_fraction')}
+    n_divergent = len(queue)
+
     for t in range(steps):
-        # 1. Scanner de Varredura
-        # Tenta replicar a topologia do source no target
-        
-        # Fator de Resistência do Material
-        # Material Comum (Silício): Alta resistência entrópica (perda de dados)
-        # Material Omega (Cristal TAMESIS): Ressonância perfeita
-        
-        material_resistance = 0.0 if t > 50 else 0.5 # t>50 simula troca para cristal Omega
-        
-        # Transferência
-        current_integrity = (t / steps) * (1 - material_resistance)
-        
-        # Entropia Dissipada (Calor)
-        # Se resistência > 0, informação vira calor
-        heat = material_resistance * np.random.random()
-        
-        transfer_integrity.append(current_integrity * 100)
-        entropy_loss.append(heat * 100)
-        
+        res = resistance(t, steps)
+        batch = np.array(queue[:batch_size], dtype=np.int64)
+        del queue[:batch_size]
+
+        heat = 0.0
+        if len(batch):
+            ok = rng.random(len(batch)) >= res
+            target_w[batch[ok]] = source_w[batch[ok]]
+            failed = batch[~ok]
+            # Se resistência > 0, informação vira calor
+            heat = np.abs(source_w[failed] - target_w[failed]).sum() / total_weight
+            queue.extend(failed.tolist())
+
+        L_target = laplacian_from_edges(n, edge_u, edge_v, target_w)
+        if method == 'dense':
+            spec_target = np.sort(np.linalg.eigvalsh(L_target.toarray()))
+            entropy_target = entropy_from_eigenvalues(spec_target)
+        else:
+            spec_target, v0 = top_spectrum(L_target, k, v0=v0)
+            entropy_target = spectral_entropy_slq(L_target, probes, lanczos_steps)
+
+        distance = spectral_distance(spec_source, spec_target)
+        history['entropy_target'][t] = entropy_target
+        history['spectral_distance'][t] = distance
+        history['integrity'][t] = max(0.0, 1.0 - distance) * 100
+        history['heat'][t] = heat * 100
+        history['copied_fraction'][t] = 1.0 - len(queue) / max(n_divergent, 1)
+
+    history['entropy_source'] = entropy_source
+    history['method'] = method
+    return history
+
+@register_experiment("mind_upload_sim", seed=42)
+def compute_upload_process(steps=100, rng=None):
+    import networkx as nx
+
+    rng = ensure_rng(rng)
+    print("Iniciando Experimento 13: Mind Upload Protocol...")
+
+    source_brain = create_neural_graph(rng=rng)
+    target_crystal = nx.erdos_renyi_graph(50, 0.1, seed=rng) # Estrutura inicial do cristal (vazio/aleatório)
+
+    # Processo de Upload: o scanner replica a topologia do source no target
+    history = upload_engine(source_brain, target_crystal, steps=steps, rng=rng)
+    print(f"Entropia espectral: origem = {history['entropy_source']:.4f} | "
+          f"destino final = {history['entropy_target'][-1]:.4f}")
+    history['steps'] = steps
+    return history
+
+@register_renderer("mind_upload_sim")
+def render_upload_process(history):
+    import matplotlib.pyplot as plt
+
+    steps = history['steps']
+
     # Plot
-    plt.figure(figsize=(10, 6))
-    plt.plot(transfer_integrity, 'b-', label='Integridade da Consciência (%)')
-    plt.plot(entropy_loss, 'r--', label='Perda Entrópica (Lobotomia Térmica)')
-    
-    plt.axvline(x=50, color='gold', linestyle=':', label='Switch para Cristal Omega')
-    
-    plt.title('Mind Upload: Silicon vs Omega Crystal')
-    plt.xlabel('Progresso do Upload (%)')
-    plt.ylabel('Percentual')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    
+    fig, ax1 = plt.subplots(figsize=(10, 6))
+    plot_history(ax1, history['integrity'], 'b-', label='Integridade da Consciência (%)')
+    plot_history(ax1, history['heat'], 'r--', label='Perda Entrópica (Lobotomia Térmica)')
+    plot_history(ax1, history['copied_fraction'] * 100, 'g:', label='Sinapses Transferidas (%)')
+
+    ax1.axvline(x=steps // 2, color='gold', linestyle=':', label='Switch para Cristal Omega')
+
+    ax1.set_title('Mind Upload: Silicon vs Omega Crystal')
+    ax1.set_xlabel('Progresso do Upload (%)')
+    ax1.set_ylabel('Percentual')
+    ax1.grid(True, alpha=0.3)
+
+    ax2 = ax1.twinx()
+    plot_history(ax2, history['entropy_target'], color='purple', alpha=0.6, label='Entropia Espectral (Destino)')
+    ax2.axhline(y=history['entropy_source'], color='purple', linestyle='--', alpha=0.4,
+                label='Entropia Espectral (Origem)')
+    ax2.set_ylabel('Entropia de Von Neumann', color='purple')
+
+    lines = ax1.get_legend_handles_labels()
+    lines2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines[0] + lines2[0], lines[1] + lines2[1], loc='center right')
+
     # Annotate
-    plt.annotate('Perda Crítica de Self', xy=(25, 25), xytext=(10, 50),
+    ax1.annotate('Perda Crítica de Self', xy=(steps // 4, history['integrity'][steps // 4]), xytext=(10, 50),
                  arrowprops=dict(facecolor='red', shrink=0.05))
-    plt.annotate('Upload Bem-Sucedido', xy=(90, 90), xytext=(70, 80),
+    ax1.annotate('Upload Bem-Sucedido', xy=(steps - 5, history['integrity'][steps - 5]), xytext=(70, 80),
                  arrowprops=dict(facecolor='blue', shrink=0.05))
 
     outfile = "../imgs/mind_upload_results.png"
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_upload_process(steps=100, rng=None):
+    render_upload_process(compute_upload_process(steps, rng))
+
 if __name__ == "__main__":
-    np.random.seed(42)
-    simulate_upload_process()
+    simulate_upload_process(rng=np.random.default_rng(42))
@@ -1,5 +1,8 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from precision import float_dtype
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,53 +11,72 @@ OMEGA = 117.038
 # Colisões entre branas deixam cicatrizes na CMB (Cold Spots).
 # A distribuição dessas cicatrizes segue a geometria fractal de Omega.
 
-def simulate_multiverse_mapping(size=200):
+def omega_resonance_map(size):
+    """Ressonância Omega |sin(Omega * (i² + j²) / size²)| em cada ponto da grade (size x size)."""
+    i, j = np.indices((size, size))
+    geo_factor = (i*i + j*j) / (size*size)
+    return np.abs(np.sin(geo_factor * OMEGA))
+
+def scan_multiverse(cmb_map, threshold=0.999, depth=0.0001, rng=None):
+    """
+    Varredura de colisões de branas: cada ponto com ressonância > threshold recebe um
+    "Cold Spot" circular de raio aleatório (2-4) que esfria o mapa (no lugar) em `depth`.
+    Retorna as coordenadas (x, y) das cicatrizes inteiramente dentro do mapa, na ordem da varredura.
+    O mapa pode estar em qualquer precisão; a geometria dos pontos de contato é sempre
+    avaliada em float64, então as cicatrizes não dependem da precisão do mapa.
+    """
+    rng = ensure_rng(rng)
+    size = cmb_map.shape[0]
+    detected_universes = []
+    # Pontos de contato em ordem de varredura (linha a linha), como no laço original
+    for i, j in np.argwhere(omega_resonance_map(size) > threshold):
+        radius = rng.integers(2, 5)
+        # Diminuir temperatura drasticamente (Supervoid)
+        y, x = np.ogrid[-radius:radius+1, -radius:radius+1]
+        mask = x**2 + y**2 <= radius**2
+
+        # Boundary check
+        if 0 <= i-radius and i+radius < size and 0 <= j-radius and j+radius < size:
+            cmb_map[i-radius:i+radius+1, j-radius:j+radius+1][mask] -= depth
+            detected_universes.append((j, i))
+    return np.array(detected_universes, dtype=np.int64).reshape(-1, 2)
+
+@register_experiment("multiverse_map", seed=int(OMEGA*100))
+def compute_multiverse_mapping(size=200, rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 16: Multiverse Mapping Protocol...")
     
     # Gerar mapa da CMB (Cosmic Microwave Background)
-    # Ruído Gaussiano isotrópico
-    cmb_map = np.random.normal(2.725, 0.00002, (size, size)) # T = 2.725K
+    # Ruído Gaussiano isotrópico, gerado direto na precisão atual (float32: metade da memória)
+    cmb_map = 2.725 + 0.00002 * rng.standard_normal((size, size), dtype=float_dtype()) # T = 2.725K
     
     # Injetar "Cicatrizes" de outros universos
     # Universos paralelos colidem em pontos específicos determinados por uma rede fractal
     
-    def fractal_noise(s):
-        # Simula a estrutura da espuma quântica
-        return np.sin(s/OMEGA) * np.cos(s/(OMEGA/10))
-    
-    collisions = 0
-    detected_universes = []
-    
-    for i in range(size):
-        for j in range(size):
-            # Calcular probabilidade de colisão topológica
-            # Ponto de ressonância Omega
-            geo_factor = (i*i + j*j) / (size*size)
-            resonance = np.abs(np.sin(geo_factor * OMEGA))
-            
-            if resonance > 0.999: # Ressonância muito alta = Ponto de Contato
-                # Criar "Cold Spot" (Cicatriz)
-                radius = np.random.randint(2, 5)
-                # Diminuir temperatura drasticamente (Supervoid)
-                y, x = np.ogrid[-radius:radius+1, -radius:radius+1]
-                mask = x**2 + y**2 <= radius**2
-                
-                # Boundary check
-                if 0 <= i-radius and i+radius < size and 0 <= j-radius and j+radius < size:
-                     cmb_map[i-radius:i+radius+1, j-radius:j+radius+1][mask] -= 0.0001
-                     collisions += 1
-                     detected_universes.append((j, i))
+    # Ressonância muito alta = Ponto de Contato -> "Cold Spot" (Cicatriz)
+    detected_universes = scan_multiverse(cmb_map, rng=rng)
+    collisions = len(detected_universes)
 
     print(f"Varredura completa. {collisions} Universos Paralelos detectados via colisão de Branas.")
 
+    return {'cmb_map': cmb_map, 'detected_universes': detected_universes}
+
+@register_renderer("multiverse_map")
+def render_multiverse_mapping(results):
+    import matplotlib.pyplot as plt
+
+    cmb_map = results['cmb_map']
+    detected_universes = results['detected_universes']
+    collisions = len(detected_universes)
+
     # Plot
     plt.figure(figsize=(10, 8))
     plt.imshow(cmb_map, cmap='coolwarm', origin='lower')
     plt.colorbar(label='Temperature (K)')
     
     # Marcar locais
-    x_coords = [p[0] for p in detected_universes]
-    y_coords = [p[1] for p in detected_universes]
+    x_coords = detected_universes[:, 0]
+    y_coords = detected_universes[:, 1]
     plt.scatter(x_coords, y_coords, color='lime', marker='x', s=100, label='Parallel Universe Impact')
     
     plt.title(f'Multiverse Map: CMB Cold Spots Analysis (N={collisions})')
@@ -66,6 +88,8 @@ def simulate_multiverse_mapping(size=200):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_multiverse_mapping(size=200, rng=None):
+    render_multiverse_mapping(compute_multiverse_mapping(size, rng))
+
 if __name__ == "__main__":
-    np.random.seed(int(OMEGA*100))
-    simulate_multiverse_mapping()
+    simulate_multiverse_mapping(rng=np.random.default_rng(int(OMEGA*100)))
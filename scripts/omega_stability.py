@@ -1,68 +1,16 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
+
+from dna_kernels import generate_dna_sequence, simulate_radiation_damage
+from experiments import register_experiment, register_renderer
+from plot_style import apply_publication_style
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
 
-def generate_dna_sequence(length=1000, mode='random'):
-    """Gera sequências de DNA baseadas no modo selecionado."""
-    bases = ['A', 'T', 'C', 'G']
-    
-    if mode == 'random':
-        return "".join(random.choices(bases, k=length))
-    
-    elif mode == 'omega_resonant':
-        # Gera sequência com periodicidade baseada na raiz de Omega
-        seq = []
-        period = int(np.sqrt(OMEGA)) # ~10.8 -> 11 bases
-        pattern = random.choices(bases, k=period)
-        
-        for i in range(length):
-            # Adiciona base do padrão com pequena chance de erro (ruído entrópico)
-            if random.random() > 0.05:
-                seq.append(pattern[i % period])
-            else:
-                seq.append(random.choice(bases))
-        return "".join(seq)
-
-def simulate_radiation_damage(sequence, radiation_dose=0.1):
-    """
-    Simula dano por radiação (decoerência).
-    Sequências ressonantes devem se 'curar' ou resistir melhor (hipótese).
-    Na física TAMESIS, a estrutura topológica impõe correção de erro.
-    """
-    seq_list = list(sequence)
-    mutations = 0
-    
-    for i in range(len(seq_list)):
-        if random.random() < radiation_dose:
-            # Dano ocorre
-            original = seq_list[i]
-            
-            # Hipótese: "Cura" topológica
-            # Se a vizinhança respeita a geometria Omega, o erro é suprimido
-            is_protected = False
-            
-            # Checagem simplificada de "proteção topológica" (vizinhança consistente)
-            # Em TAMESIS real, isso seria um cálculo de invariante de nó (knot theory)
-            period = int(np.sqrt(OMEGA))
-            if i > period and i < len(seq_list) - period:
-                neighbor_consistency = (seq_list[i-period] == original) + (seq_list[i+period] == original)
-                if neighbor_consistency > 0:
-                    is_protected = True # Ressonância protege a informação
-            
-            # Se não protegido, muta
-            damage_prob = 0.2 if is_protected else 1.0
-            
-            if random.random() < damage_prob:
-                seq_list[i] = random.choice(['A', 'T', 'C', 'G'])
-                if seq_list[i] != original:
-                    mutations += 1
-                
-    return "".join(seq_list), mutations
-
-def run_experiment():
+@register_experiment("omega_stability", seed=117)
+def compute_omega_stability(rng=None):
+    rng = ensure_rng(rng)
     print("Iniciando Experimento 2: Estabilidade Omega...")
     
     n_sequences = 100
@@ -78,24 +26,33 @@ def run_experiment():
         
         for _ in range(n_sequences):
             # Grupo Controle
-            seq_rnd = generate_dna_sequence(seq_len, 'random')
-            _, m_r = simulate_radiation_damage(seq_rnd, dose)
+            seq_rnd = generate_dna_sequence(seq_len, 'random', rng)
+            _, m_r = simulate_radiation_damage(seq_rnd, dose, rng)
             muts_rnd.append(m_r)
             
             # Grupo Omega
-            seq_omg = generate_dna_sequence(seq_len, 'omega_resonant')
-            _, m_o = simulate_radiation_damage(seq_omg, dose)
+            seq_omg = generate_dna_sequence(seq_len, 'omega_resonant', rng)
+            _, m_o = simulate_radiation_damage(seq_omg, dose, rng)
             muts_omg.append(m_o)
             
         avg_mutations_random.append(np.mean(muts_rnd))
         avg_mutations_omega.append(np.mean(muts_omg))
         print(f"Dose {dose:.2f}: Random={np.mean(muts_rnd):.1f} vs Omega={np.mean(muts_omg):.1f} mutações")
 
+    return {'doses': doses, 'avg_mutations_random': np.array(avg_mutations_random),
+            'avg_mutations_omega': np.array(avg_mutations_omega)}
+
+@register_renderer("omega_stability")
+def render_omega_stability(results):
+    import matplotlib.pyplot as plt
+
+    doses = results['doses']
+    avg_mutations_random = results['avg_mutations_random']
+    avg_mutations_omega = results['avg_mutations_omega']
+
     # Plot - Estilo Publicação Científica
     plt.figure(figsize=(10, 6), dpi=300)
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.size'] = 11
-    plt.rcParams['axes.linewidth'] = 1.2
+    apply_publication_style(font_size=11)
     
     # Plotar com marcadores e linhas profissionais
     plt.plot(doses, avg_mutations_random, 'o-', color='#d62728', linewidth=2.5, 
@@ -136,7 +93,8 @@ def run_experiment():
     plt.savefig(outfile, dpi=300, bbox_inches='tight')
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def run_experiment(rng=None):
+    render_omega_stability(compute_omega_stability(rng))
+
 if __name__ == "__main__":
-    random.seed(117) # Seed temática
-    np.random.seed(117)
-    run_experiment()
+    run_experiment(rng=np.random.default_rng(117)) # Seed temática
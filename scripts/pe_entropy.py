@@ -1,78 +1,229 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
+from functools import lru_cache
+
+from experiments import register_experiment, register_renderer
+from instrumentation import stage, timed
+from precision import float_dtype
+from rng_streams import ensure_rng, fork, map_streams, stream
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
 # Hipótese: Prime Editing (PE) depende da estabilidade do híbrido DNA-RNA na etapa de transcrição reversa.
-# A eficiência da escrita (PEG efficiency) é proporcional à estabilidade termodinâmica da estrutura 
+# A eficiência da escrita (PEG efficiency) é proporcional à estabilidade termodinâmica da estrutura
 # secundária do pegRNA (hairpins) e sua ressonância Omega.
 
+# Tabela de conversão ASCII -> código numérico (A=1, T=2, C=3, G=4)
+BASE_LUT = np.zeros(256, dtype=np.int8)
+for _code, _base in enumerate("ATCG", start=1):
+    BASE_LUT[ord(_base)] = _code
+
 def calculate_omega_resonance(sequence):
     """
     Calcula o quanto uma sequência ressoa com a constante Omega.
     Baseado na transformação de Fourier discreta da sequência mapeada numericamente.
     """
     mapping = {'A': 1, 'T': 2, 'C': 3, 'G': 4}
-    num_seq = [mapping[b] for b in sequence]
-    
+    num_seq = np.array([mapping[b] for b in sequence], dtype=float_dtype())
+
     # FFT
-    spectrum = np.abs(np.fft.fft(num_seq))
-    freqs = np.fft.fftfreq(len(num_seq))
-    
+    with stage("fft"):
+        spectrum = np.abs(np.fft.fft(num_seq))
+        freqs = np.fft.fftfreq(len(num_seq))
+
     # Busca pico na frequência Omega (normalizada pelo tamanho)
     target_freq = OMEGA % len(sequence) / len(sequence)
-    
+
     # Encontra a amplitude na frequência mais próxima do alvo
     idx = (np.abs(freqs - target_freq)).argmin()
     resonance = spectrum[idx]
-    
+
     return resonance
 
-def simulate_pe_efficiency(num_samples=200):
+@lru_cache(maxsize=None)
+def _resonance_kernel(length, dtype=np.float64):
+    """
+    Bin de Fourier alvo para um comprimento (mesma regra de `calculate_omega_resonance`)
+    e os pesos cos/sin da DFT de um único bin. Calculado uma vez por comprimento e dtype.
+    """
+    freqs = np.fft.fftfreq(length)
+    target_freq = OMEGA % length / length
+    idx = (np.abs(freqs - target_freq)).argmin()
+    phase = 2 * np.pi * idx * np.arange(length) / length
+    return np.cos(phase).astype(dtype), np.sin(phase).astype(dtype)
+
+def encode_sequences(sequences):
+    """Converte sequências de mesmo comprimento numa matriz (B, L) de códigos int8."""
+    joined = "".join(sequences).encode('ascii')
+    codes = BASE_LUT[np.frombuffer(joined, dtype=np.uint8)]
+    if np.any(codes == 0):
+        raise ValueError("Sequência contém bases inválidas (esperado A/T/C/G)")
+    return codes.reshape(len(sequences), -1)
+
+@timed("scoring")
+def score_resonance_batch(codes):
+    """
+    Ressonância Omega de um lote (B, L) de sequências de mesmo comprimento.
+    Uma DFT de bin único (dois produtos matriz-vetor) substitui B FFTs completas.
+    """
+    dtype = float_dtype()
+    cos_w, sin_w = _resonance_kernel(codes.shape[1], dtype)
+    signal = codes.astype(dtype)
+    return np.hypot(signal @ cos_w, signal @ sin_w)
+
+def score_pegrna_library(sequences):
+    """
+    Pontua uma lista de pegRNAs de comprimentos variados.
+    As sequências são agrupadas por comprimento, e cada grupo é pontuado como uma matriz 2-D.
+    Retorna as ressonâncias na ordem de entrada.
+    """
+    lengths = np.fromiter((len(s) for s in sequences), dtype=np.int64, count=len(sequences))
+    resonances = np.empty(len(sequences), dtype=float_dtype())
+    for length in np.unique(lengths):
+        idx = np.flatnonzero(lengths == length)
+        resonances[idx] = score_resonance_batch(encode_sequences([sequences[i] for i in idx]))
+    return resonances
+
+class StreamingLinearFit:
+    """
+    Regressão linear (grau 1) acumulada em blocos, sem guardar os pontos.
+    Usa médias e co-momentos centrados (combinação de Chan) para estabilidade numérica.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m_xx = 0.0
+        self.m_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n_b = x.size
+        if n_b == 0:
+            return
+        mean_xb = x.mean()
+        mean_yb = y.mean()
+        dx = x - mean_xb
+        m_xxb = np.dot(dx, dx)
+        m_xyb = np.dot(dx, y - mean_yb)
+
+        n = self.n + n_b
+        delta_x = mean_xb - self.mean_x
+        delta_y = mean_yb - self.mean_y
+        self.m_xx += m_xxb + delta_x * delta_x * self.n * n_b / n
+        self.m_xy += m_xyb + delta_x * delta_y * self.n * n_b / n
+        self.mean_x += delta_x * n_b / n
+        self.mean_y += delta_y * n_b / n
+        self.n = n
+
+    def coefficients(self):
+        """Retorna [inclinação, intercepto], no mesmo formato de np.polyfit(x, y, 1)."""
+        if self.n < 2 or self.m_xx == 0:
+            raise ValueError("Dados insuficientes para o ajuste linear")
+        slope = self.m_xy / self.m_xx
+        return np.array([slope, self.mean_y - slope * self.mean_x])
+
+def efficiency_from_resonance(resonances, rng=None):
+    """
+    Simular Eficiência de Edição (Mock)
+    Hipótese: Eficiência = log(Ressonância) + Ruído
+    Estruturas mais estáveis (ressonantes) permitem melhor RT.
+    """
+    rng = ensure_rng(rng)
+    efficiency = np.log(resonances + 1) * 10 + rng.normal(0, 2, np.shape(resonances))
+    return np.clip(efficiency, 0, 100) # Clamp 0-100%
+
+def _screen_chunk(task, rng):
+    """Gera e pontua um bloco da biblioteca com o fluxo aleatório do próprio bloco."""
+    size, min_length, max_length = task
+    lengths = rng.integers(min_length, max_length + 1, size)
+    resonances = np.empty(size)
+    for length in np.unique(lengths):
+        idx = np.flatnonzero(lengths == length)
+        codes = rng.integers(1, 5, (len(idx), length), dtype=np.int8)
+        resonances[idx] = score_resonance_batch(codes)
+    return resonances, efficiency_from_resonance(resonances, rng), lengths
+
+def screen_pegrna_library(num_samples=1_000_000, chunk_size=65536, min_length=30, max_length=50,
+                          keep_results=False, rng=None, jobs=1):
+    """
+    Triagem em larga escala de uma biblioteca aleatória de pegRNAs (PBS + RT template).
+
+    A biblioteca é gerada e pontuada em blocos de `chunk_size`: dentro de cada bloco,
+    os pegRNAs são agrupados por comprimento e pontuados como matrizes 2-D de códigos,
+    sem construir strings. A memória é limitada pelo tamanho do bloco; a tendência é
+    acumulada por `StreamingLinearFit`.
+
+    Cada bloco sorteia do próprio fluxo (`rng_streams.stream`, derivado de `rng`), então
+    com jobs > 1 os blocos rodam em processos separados e o resultado é o mesmo.
+
+    Retorna dict com 'fit' (inclinação, intercepto), 'n' e, se keep_results=True,
+    os arrays 'resonances', 'efficiencies' e 'lengths'.
+    """
+    root = fork(rng)
+    fit = StreamingLinearFit()
+    kept_res, kept_eff, kept_len = [], [], []
+
+    chunks = [(min(chunk_size, num_samples - start), min_length, max_length)
+              for start in range(0, num_samples, chunk_size)]
+    if jobs > 1:
+        outputs = map_streams(_screen_chunk, chunks, root, jobs)
+    else:
+        # Serial: um bloco por vez, memória limitada ao tamanho do bloco
+        outputs = (_screen_chunk(chunk, stream(root, i)) for i, chunk in enumerate(chunks))
+
+    for resonances, efficiencies, lengths in outputs:
+        fit.update(resonances, efficiencies)
+        if keep_results:
+            kept_res.append(resonances)
+            kept_eff.append(efficiencies)
+            kept_len.append(lengths)
+
+    result = {'fit': fit.coefficients(), 'n': fit.n}
+    if keep_results:
+        result['resonances'] = np.concatenate(kept_res)
+        result['efficiencies'] = np.concatenate(kept_eff)
+        result['lengths'] = np.concatenate(kept_len)
+    return result
+
+@register_experiment("pe_entropy", seed=117038)
+def compute_pe_efficiency(num_samples=200, rng=None):
     print("Iniciando Experimento 6: Prime Editing Omega Search...")
-    
-    efficiencies = []
-    resonances = []
-    
-    for _ in range(num_samples):
-        # Gerar pegRNA aleatório (PBS + RT template)
-        length = random.randint(30, 50)
-        pegRNA = "".join(random.choices("ATCG", k=length))
-        
-        # Calcular Ressonância Omega (Estabilidade Topológica)
-        res = calculate_omega_resonance(pegRNA)
-        
-        # Simular Eficiência de Edição (Mock)
-        # Hipótese: Eficiência = log(Ressonância) + Ruído
-        # Estruturas mais estáveis (ressonantes) permitem melhor RT.
-        
-        efficiency = np.log(res + 1) * 10 + np.random.normal(0, 2)
-        efficiency = max(0, min(100, efficiency)) # Clamp 0-100%
-        
-        resonances.append(res)
-        efficiencies.append(efficiency)
-        
+
+    # Gerar pegRNAs aleatórios (PBS + RT template) e pontuar em lote
+    screen = screen_pegrna_library(num_samples, keep_results=True, rng=rng)
+    return {'resonances': screen['resonances'], 'efficiencies': screen['efficiencies'],
+            'fit': screen['fit']}
+
+@register_renderer("pe_entropy")
+def render_pe_efficiency(results):
+    import matplotlib.pyplot as plt
+
+    resonances = results['resonances']
+    efficiencies = results['efficiencies']
+
     # Plot
     plt.figure(figsize=(10, 6))
     plt.scatter(resonances, efficiencies, c=efficiencies, cmap='viridis', alpha=0.7)
     plt.colorbar(label='PE Efficiency (%)')
-    
+
     # Linha de tendência
-    z = np.polyfit(resonances, efficiencies, 1)
-    p = np.poly1d(z)
+    p = np.poly1d(results['fit'])
     plt.plot(resonances, p(resonances), "r--", alpha=0.5, label='Tendência TAMESIS')
-    
+
     plt.title('Prime Editing Efficiency vs Omega Resonance')
     plt.xlabel('Omega Resonance (Topological Stability)')
     plt.ylabel('Editing Efficiency (%)')
     plt.legend()
     plt.grid(True, alpha=0.3)
-    
+
     outfile = "../imgs/pe_efficiency_results.png"
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_pe_efficiency(num_samples=200, rng=None):
+    render_pe_efficiency(compute_pe_efficiency(num_samples, rng))
+
 if __name__ == "__main__":
-    np.random.seed(117038)
-    simulate_pe_efficiency()
+    simulate_pe_efficiency(rng=np.random.default_rng(117038))
@@ -0,0 +1,31 @@
+"""
+Estilo de publicação científica compartilhado pelos renderizadores (`render_*`)
+
+Substitui a reescrita de código-fonte por regex de `improve_all_plots.py`: o estilo
+é aplicado em tempo de renderização, e os gráficos podem ser redesenhados a partir
+dos resultados intermediários sem recalcular as simulações.
+"""
+
+# Estilo padrão para todos os gráficos
+PUBLICATION_STYLE = {
+    'savefig.dpi': 300,
+    'font.family': 'serif',
+    'font.serif': ['Times New Roman', 'DejaVu Serif'],
+    'font.size': 10,
+    'axes.linewidth': 1.2,
+    'grid.alpha': 0.3,
+    'grid.linestyle': '--',
+    'grid.linewidth': 0.5,
+}
+
+def apply_publication_style(font_size=None):
+    """Aplica o estilo de publicação às próximas figuras (opcionalmente com outro tamanho de fonte)."""
+    import matplotlib.pyplot as plt
+    plt.rcParams.update(PUBLICATION_STYLE)
+    if font_size is not None:
+        plt.rcParams['font.size'] = font_size
+
+def reset_style():
+    """Volta aos parâmetros padrão do matplotlib (workers reutilizados entre experimentos)."""
+    import matplotlib
+    matplotlib.rcdefaults()
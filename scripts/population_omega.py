@@ -1,5 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from recorders import Recorder
+from render_utils import plot_history
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,74 +11,460 @@ OMEGA = 117.038
 # TFA = 1.618 (Golden Ratio) * log(Omega).
 # Elas devem dominar o nicho ecológico não pela força (energia), mas pela eficiência (informação).
 
-def simulate_population_dynamics(generations=200):
+# Parâmetros padrão do ecossistema
+# Random: Alta energia, alto desperdício (Estratégia r)
+# Omega: Baixa energia, alta eficiência (Estratégia K-informacional)
+DEFAULT_PARAMS = {
+    'r_random': 0.8,   # Reprodução rápida
+    'd_random': 0.3,   # Morrem fácil por entropia
+    'r_omega': 0.4,    # Reproduzem devagar (complexidade)
+    'd_omega': 0.05,   # Quase imortais (baixa entropia)
+    'capacity': 1000.0,  # Capacidade do ecossistema
+}
+PARAM_NAMES = tuple(DEFAULT_PARAMS)
+
+# Sensibilidade de cada espécie à pressão entrópica (o "Omega Shield")
+PRESSURE_GAIN_RANDOM = 2.0
+PRESSURE_GAIN_OMEGA = 0.5
+
+# Códigos de desfecho do mapa de bifurcação
+OUTCOME_EXTINCTION = 0
+OUTCOME_RANDOM = 1
+OUTCOME_OMEGA = 2
+OUTCOME_COEXISTENCE = 3
+
+def competition_rates(pop_random, pop_omega, r_random, d_random, r_omega, d_omega, capacity):
+    """
+    Taxas de variação (dN/dt) do modelo Lotka-Volterra simplificado.
+    Aceita escalares ou arrays (broadcast), o que permite integrar milhares
+    de conjuntos de parâmetros de uma só vez.
+    """
+    # Competição por recursos
+    pressure = (pop_random + pop_omega) / capacity
+
+    # Delta = (Nascimentos * (1-Pressão)) - (Mortes * Pressão_Entrópica)
+    # Random sofre muito com a pressão (falta de recursos = morte)
+    # Omega sofre menos (eficiência metabólica)
+    d_pop_random = (pop_random * r_random * (1 - pressure)) - (pop_random * d_random * (1 + pressure * PRESSURE_GAIN_RANDOM))
+    d_pop_omega = (pop_omega * r_omega * (1 - pressure)) - (pop_omega * d_omega * (1 + pressure * PRESSURE_GAIN_OMEGA))
+    return d_pop_random, d_pop_omega
+
+def _resolve_params(params):
+    """Completa os parâmetros com os valores padrão e rejeita nomes desconhecidos."""
+    unknown = set(params) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)}")
+    return {name: params.get(name, DEFAULT_PARAMS[name]) for name in PARAM_NAMES}
+
+def integrate_population_ode(generations=200, pop_random=500, pop_omega=10, n_points=None, **params):
+    """
+    Integra o modelo contínuo com scipy `solve_ivp` (RK45 adaptativo).
+    O ponto de "Crossover" (Omega ultrapassa Random) é localizado por detecção
+    de eventos, sem depender da resolução da malha temporal.
+
+    Retorna (t, history_random, history_omega, crossover_times).
+    """
+    from scipy.integrate import solve_ivp
+
+    p = _resolve_params(params)
+
+    def rhs(t, y):
+        return competition_rates(y[0], y[1], **p)
+
+    def crossover_event(t, y):
+        return y[1] - y[0]
+    crossover_event.direction = 1  # Apenas quando Omega passa a dominar
+
+    if n_points is None:
+        n_points = generations + 1
+    t_eval = np.linspace(0, generations, n_points)
+
+    sol = solve_ivp(rhs, (0, generations), [pop_random, pop_omega], t_eval=t_eval,
+                    events=crossover_event, rtol=1e-8, atol=1e-8)
+    if not sol.success:
+        raise RuntimeError(f"Falha na integração: {sol.message}")
+
+    return sol.t, sol.y[0], sol.y[1], sol.t_events[0]
+
+def integrate_population_batch(generations=200, pop_random=500, pop_omega=10, dt=0.25,
+                               method='rk4', record_history=False, **params):
+    """
+    Integrador vetorizado: evolui M conjuntos de parâmetros como um único array.
+    Cada parâmetro pode ser escalar ou array (broadcast para o formato comum).
+
+    method='euler' com dt=1 reproduz exatamente a atualização discreta por geração
+    (com as populações limitadas em zero); method='rk4' aproxima o modelo contínuo.
+
+    Retorna dict com 'final_random', 'final_omega', 'crossover_time' (NaN se não ocorre)
+    e, se record_history=True, 'history_random'/'history_omega' com formato (passos+1, ...).
+    """
+    p = _resolve_params(params)
+    arrays = np.broadcast_arrays(*(np.asarray(p[name], dtype=float) for name in PARAM_NAMES),
+                                 np.asarray(pop_random, dtype=float), np.asarray(pop_omega, dtype=float))
+    p = dict(zip(PARAM_NAMES, arrays[:len(PARAM_NAMES)]))
+    n_random = arrays[-2].copy()
+    n_omega = arrays[-1].copy()
+
+    if method == 'euler':
+        def step(nr, no):
+            dr, do = competition_rates(nr, no, **p)
+            # Limites: populações não ficam negativas no mapa discreto
+            return np.maximum(nr + dt * dr, 0), np.maximum(no + dt * do, 0)
+    elif method == 'rk4':
+        def step(nr, no):
+            k1r, k1o = competition_rates(nr, no, **p)
+            k2r, k2o = competition_rates(nr + 0.5 * dt * k1r, no + 0.5 * dt * k1o, **p)
+            k3r, k3o = competition_rates(nr + 0.5 * dt * k2r, no + 0.5 * dt * k2o, **p)
+            k4r, k4o = competition_rates(nr + dt * k3r, no + dt * k3o, **p)
+            nr = nr + dt / 6.0 * (k1r + 2 * k2r + 2 * k3r + k4r)
+            no = no + dt / 6.0 * (k1o + 2 * k2o + 2 * k3o + k4o)
+            return np.maximum(nr, 0), np.maximum(no, 0)
+    else:
+        raise ValueError(f"Método desconhecido: {method}")
+
+    n_steps = int(round(generations / dt))
+    crossover_time = np.full(n_random.shape, np.nan)
+    gap = n_omega - n_random
+    crossover_time[gap > 0] = 0.0
+
+    if record_history:
+        history_random = np.empty((n_steps + 1,) + n_random.shape)
+        history_omega = np.empty((n_steps + 1,) + n_random.shape)
+        history_random[0] = n_random
+        history_omega[0] = n_omega
+
+    for s in range(1, n_steps + 1):
+        n_random, n_omega = step(n_random, n_omega)
+        new_gap = n_omega - n_random
+
+        # Crossover: primeiro passo em que Omega > Random (interpolação linear do cruzamento)
+        crossed = np.isnan(crossover_time) & (new_gap > 0)
+        if np.any(crossed):
+            frac = gap[crossed] / (gap[crossed] - new_gap[crossed])
+            crossover_time[crossed] = (s - 1 + frac) * dt
+        gap = new_gap
+
+        if record_history:
+            history_random[s] = n_random
+            history_omega[s] = n_omega
+
+    result = {
+        'final_random': n_random,
+        'final_omega': n_omega,
+        'crossover_time': crossover_time,
+    }
+    if record_history:
+        result['history_random'] = history_random
+        result['history_omega'] = history_omega
+    return result
+
+def classify_outcome(final_random, final_omega, threshold=1.0):
+    """Classifica o desfecho de cada simulação (extinção, Random, Omega ou coexistência)."""
+    alive_random = np.asarray(final_random) >= threshold
+    alive_omega = np.asarray(final_omega) >= threshold
+    outcome = np.full(alive_random.shape, OUTCOME_EXTINCTION, dtype=np.int8)
+    outcome[alive_random & ~alive_omega] = OUTCOME_RANDOM
+    outcome[~alive_random & alive_omega] = OUTCOME_OMEGA
+    outcome[alive_random & alive_omega] = OUTCOME_COEXISTENCE
+    return outcome
+
+def crossover_map(param_x='r_omega', values_x=None, param_y='d_omega', values_y=None,
+                  generations=200, dt=0.25, method='rk4', **fixed):
+    """
+    Mapa de bifurcação e tempo de Crossover sobre uma grade 2-D de parâmetros.
+    Toda a grade é integrada de uma só vez pelo integrador vetorizado.
+
+    Retorna (values_x, values_y, crossover_time, outcome), com grades no formato (len(y), len(x)).
+    """
+    if values_x is None:
+        values_x = np.linspace(0.05, 1.0, 120)
+    if values_y is None:
+        values_y = np.linspace(0.0, 0.4, 120)
+    grid_x, grid_y = np.meshgrid(values_x, values_y)
+
+    params = dict(fixed)
+    params[param_x] = grid_x
+    params[param_y] = grid_y
+    result = integrate_population_batch(generations=generations, dt=dt, method=method, **params)
+
+    outcome = classify_outcome(result['final_random'], result['final_omega'])
+    return values_x, values_y, result['crossover_time'], outcome
+
+def _select_tau(counts, birth_pc, death_pc, leap, epsilon, tau_max):
+    """
+    Passo tau adaptativo (Cao, Gillespie & Petzold 2006): limita a variação relativa
+    esperada (média e desvio) de cada espécie a `epsilon`. Um único tau é usado para
+    todas as réplicas, mantendo os relógios sincronizados.
+    """
+    if not np.any(leap):
+        return tau_max
+    n = counts[leap]
+    mu = np.abs(n * (birth_pc[leap] - death_pc[leap]))
+    sigma2 = n * (birth_pc[leap] + death_pc[leap])
+    bound = np.maximum(epsilon * n, 1.0)
+    with np.errstate(divide='ignore'):
+        tau_mu = np.min(np.where(mu > 0, bound / mu, np.inf))
+        tau_sigma = np.min(np.where(sigma2 > 0, bound ** 2 / sigma2, np.inf))
+    return min(tau_mu, tau_sigma, tau_max)
+
+def simulate_population_stochastic(replicates=10000, generations=200, pop_random=500, pop_omega=10,
+                                   tau=0.25, epsilon=0.03, tau_max=1.0, n_critical=20,
+                                   record_every=1.0, rng=None, **params):
+    """
+    Motor estocástico (ruído demográfico) para populações pequenas.
+
+    Nascimentos e mortes são eventos discretos. Espécies com contagem alta avançam
+    por tau-leaping (nascimentos e mortes ~ Poisson, mortes limitadas à população
+    viva), com tau fixo ou adaptativo (`tau=None`).
+    Quando uma espécie cai abaixo de `n_critical` indivíduos, seus eventos dentro do
+    passo são simulados exatamente (SSA de Gillespie), com as taxas per capita
+    congeladas no início do passo.
+    Todas as réplicas evoluem em paralelo como arrays (M, 2).
+
+    Retorna dict com as probabilidades de extinção, os tempos de extinção por réplica
+    e a média/quantis das trajetórias na grade de registro.
+    """
+    rng = ensure_rng(rng)
+    p = _resolve_params(params)
+    r = np.array([p['r_random'], p['r_omega']], dtype=float)
+    d = np.array([p['d_random'], p['d_omega']], dtype=float)
+    gain = np.array([PRESSURE_GAIN_RANDOM, PRESSURE_GAIN_OMEGA])
+    capacity = float(p['capacity'])
+
+    counts = np.empty((replicates, 2), dtype=np.int64)
+    counts[:, 0] = pop_random
+    counts[:, 1] = pop_omega
+
+    record_grid = np.arange(record_every, generations + 0.5 * record_every, record_every)
+    record_mean = Recorder(len(record_grid) + 1, shape=(2,))
+    record_q = Recorder(len(record_grid) + 1, shape=(3, 2))
+    record_mean.append(counts.mean(axis=0))
+    record_q.append(np.percentile(counts, [5, 50, 95], axis=0))
+    extinction_time = np.full((replicates, 2), np.nan)
+    extinction_time[counts == 0] = 0.0
+
+    t = 0.0
+    next_record = 0
+    n_steps = 0
+    while next_record < len(record_grid):
+        pressure = counts.sum(axis=1) / capacity
+        birth_pc = r * np.maximum(1 - pressure, 0)[:, None]
+        death_pc = d * (1 + pressure[:, None] * gain)
+
+        critical = (counts > 0) & (counts < n_critical)
+        leap = (counts > 0) & ~critical
+
+        step = tau if tau is not None else _select_tau(counts, birth_pc, death_pc, leap, epsilon, tau_max)
+        # Nunca ultrapassar o próximo ponto da grade de registro
+        step = min(step, record_grid[next_record] - t)
+
+        # Tau-leaping para contagens altas
+        new_counts = counts.copy()
+        if np.any(leap):
+            n_leap = counts[leap]
+            births = rng.poisson(birth_pc[leap] * n_leap * step)
+            # Mortes limitadas ao número de indivíduos vivos (sem populações negativas)
+            deaths = np.minimum(rng.poisson(death_pc[leap] * n_leap * step), n_leap)
+            new_counts[leap] = n_leap + births - deaths
+
+        # SSA exato para contagens pequenas (vetorizado sobre os pares réplica/espécie críticos)
+        if np.any(critical):
+            n_c = counts[critical].copy()
+            b_c = birth_pc[critical]
+            d_c = death_pc[critical]
+            clock = np.zeros(len(n_c))
+            active = np.ones(len(n_c), dtype=bool)
+            while np.any(active):
+                idx = np.flatnonzero(active)
+                a_birth = b_c[idx] * n_c[idx]
+                a_total = a_birth + d_c[idx] * n_c[idx]
+                wait = np.full(len(idx), np.inf)
+                alive = a_total > 0
+                wait[alive] = rng.exponential(1.0 / a_total[alive])
+                clock[idx] += wait
+                fires = clock[idx] < step
+                fire_idx = idx[fires]
+                is_birth = rng.random(len(fire_idx)) * a_total[fires] < a_birth[fires]
+                n_c[fire_idx] += np.where(is_birth, 1, -1)
+                active[idx[~fires]] = False
+            new_counts[critical] = n_c
+
+        counts = new_counts
+        t += step
+        n_steps += 1
+        newly_extinct = np.isnan(extinction_time) & (counts == 0)
+        extinction_time[newly_extinct] = t
+
+        if t >= record_grid[next_record] - 1e-12:
+            t = record_grid[next_record]
+            next_record += 1
+            record_mean.append(counts.mean(axis=0))
+            record_q.append(np.percentile(counts, [5, 50, 95], axis=0))
+
+    extinct = ~np.isnan(extinction_time)
+    return {
+        'extinction_prob_random': extinct[:, 0].mean(),
+        'extinction_prob_omega': extinct[:, 1].mean(),
+        'omega_wins_prob': np.mean(counts[:, 1] > counts[:, 0]),
+        'extinction_time': extinction_time,
+        'final_counts': counts,
+        'n_steps': n_steps,
+        'record_times': np.concatenate([[0.0], record_grid]),
+        'mean': record_mean.values,
+        'quantiles': record_q.values,  # (tempos, [q05, q50, q95], espécie)
+    }
+
+@register_experiment("population_omega", seed=42)
+def compute_population_dynamics(generations=200, backend='euler', **params):
     print("Iniciando Experimento 9: Dinâmica Populacional Omega...")
-    
+
     # Populações Iniciais
     pop_random = 500
     pop_omega = 10 # Começam em minoria absoluta!
-    
-    capacity = 1000 # Capacidade do ecossistema
-    
-    history_random = [pop_random]
-    history_omega = [pop_omega]
-    
-    # Taxas de Reprodução (r) e Morte (d)
-    # Random: Alta energia, alto desperdício (Estratégia r)
-    r_random = 0.8
-    d_random = 0.3 # Morrem fácil por entropia
-    
-    # Omega: Baixa energia, alta eficiência (Estratégia K-informacional)
-    r_omega = 0.4 # Reproduzem devagar (complexidade)
-    d_omega = 0.05 # Quase imortais (baixa entropia)
-    
-    for t in range(generations):
-        # Competição por recursos (Modelo Lotka-Volterra simplificado)
-        total_pop = pop_random + pop_omega
-        pressure = total_pop / capacity
-        
-        # O "Omega Shield" protege contra a pressão ambiental
-        # Random sofre muito com a pressão (falta de recursos = morte)
-        # Omega sofre menos (eficiência metabólica)
-        
-        # Updates
-        # Delta = (Nascimentos * (1-Pressão)) - (Mortes * Pressão_Entrópica)
-        
-        d_pop_random = (pop_random * r_random * (1 - pressure)) - (pop_random * d_random * (1 + pressure * 2))
-        d_pop_omega = (pop_omega * r_omega * (1 - pressure)) - (pop_omega * d_omega * (1 + pressure * 0.5))
-        
-        pop_random += d_pop_random
-        pop_omega += d_pop_omega
-        
-        # Limites
-        pop_random = max(0, pop_random)
-        pop_omega = max(0, pop_omega)
-        
-        history_random.append(pop_random)
-        history_omega.append(pop_omega)
-        
+
+    if backend == 'euler':
+        # Atualização discreta por geração (modelo original)
+        result = integrate_population_batch(generations=generations, pop_random=pop_random,
+                                            pop_omega=pop_omega, dt=1.0, method='euler',
+                                            record_history=True, **params)
+        time_axis = np.arange(generations + 1)
+        history_random = result['history_random']
+        history_omega = result['history_omega']
+    elif backend == 'ode':
+        time_axis, history_random, history_omega, events = integrate_population_ode(
+            generations=generations, pop_random=pop_random, pop_omega=pop_omega, **params)
+        if len(events) > 0:
+            print(f"Crossover (solve_ivp): t = {events[0]:.3f} gerações")
+    else:
+        raise ValueError(f"Backend desconhecido: {backend}")
+
+    return {'time_axis': np.asarray(time_axis, dtype=float),
+            'history_random': np.asarray(history_random, dtype=float),
+            'history_omega': np.asarray(history_omega, dtype=float)}
+
+@register_renderer("population_omega")
+def render_population_dynamics(results):
+    import matplotlib.pyplot as plt
+
+    time_axis = results['time_axis']
+    history_random = results['history_random']
+    history_omega = results['history_omega']
+
     # Plot
     plt.figure(figsize=(10, 6))
-    plt.plot(history_random, 'r--', label='Espécie Padrão (Alta Entropia)')
-    plt.plot(history_omega, 'b-', linewidth=3, label='Espécie Omega (Eficiente)')
-    
+    plot_history(plt.gca(), history_random, 'r--', x=time_axis, label='Espécie Padrão (Alta Entropia)')
+    plot_history(plt.gca(), history_omega, 'b-', x=time_axis, linewidth=3, label='Espécie Omega (Eficiente)')
+
     plt.title('Substituição Populacional: A Vitória da Informação')
     plt.xlabel('Gerações')
     plt.ylabel('Indivíduos')
     plt.legend()
     plt.grid(True, alpha=0.3)
-    
+
     # Anotação do "Crossover"
     crossover = np.argwhere(np.array(history_omega) > np.array(history_random))
     if len(crossover) > 0:
         idx = crossover[0][0]
-        plt.annotate('Singularidade Omega', xy=(idx, history_omega[idx]), xytext=(idx+20, history_omega[idx]+100),
+        x_cross = time_axis[idx]
+        plt.annotate('Singularidade Omega', xy=(x_cross, history_omega[idx]), xytext=(x_cross+20, history_omega[idx]+100),
                      arrowprops=dict(facecolor='black', shrink=0.05))
-    
+
     outfile = "../imgs/population_omega_results.png"
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_population_dynamics(generations=200, backend='euler', **params):
+    render_population_dynamics(compute_population_dynamics(generations, backend, **params))
+
+@register_experiment("population_omega_crossover_map", seed=42)
+def compute_crossover_map(param_x='r_omega', param_y='d_omega', **kwargs):
+    """Mapa de bifurcação (desfecho + tempo de Crossover) no plano (param_x, param_y)."""
+    print(f"Varredura de parâmetros: {param_x} x {param_y}...")
+    values_x, values_y, crossover_time, outcome = crossover_map(param_x=param_x, param_y=param_y, **kwargs)
+    return {'param_x': param_x, 'param_y': param_y, 'values_x': values_x, 'values_y': values_y,
+            'crossover_time': crossover_time, 'outcome': outcome}
+
+@register_renderer("population_omega_crossover_map")
+def render_crossover_map(results):
+    import matplotlib.pyplot as plt
+
+    param_x, param_y = results['param_x'], results['param_y']
+    values_x, values_y = results['values_x'], results['values_y']
+    crossover_time, outcome = results['crossover_time'], results['outcome']
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5))
+    extent = [values_x[0], values_x[-1], values_y[0], values_y[-1]]
+
+    im1 = ax1.imshow(outcome, origin='lower', extent=extent, aspect='auto',
+                     cmap=plt.get_cmap('viridis', 4), vmin=-0.5, vmax=3.5)
+    cbar1 = fig.colorbar(im1, ax=ax1, ticks=[0, 1, 2, 3])
+    cbar1.ax.set_yticklabels(['Extinção', 'Random', 'Omega', 'Coexistência'])
+    ax1.set_title('Diagrama de Bifurcação')
+    ax1.set_xlabel(param_x)
+    ax1.set_ylabel(param_y)
+
+    im2 = ax2.imshow(crossover_time, origin='lower', extent=extent, aspect='auto', cmap='magma')
+    fig.colorbar(im2, ax=ax2, label='Gerações até o Crossover')
+    ax2.set_title('Tempo até a Singularidade Omega')
+    ax2.set_xlabel(param_x)
+    ax2.set_ylabel(param_y)
+
+    fig.tight_layout()
+    outfile = "../imgs/population_omega_crossover_map.png"
+    fig.savefig(outfile, dpi=300, bbox_inches="tight")
+    print(f"Concluído. Mapa salvo em {outfile}")
+
+def plot_crossover_map(param_x='r_omega', param_y='d_omega', **kwargs):
+    """Gera o mapa de bifurcação (desfecho + tempo de Crossover) no plano (param_x, param_y)."""
+    render_crossover_map(compute_crossover_map(param_x, param_y, **kwargs))
+
+@register_experiment("population_omega_stochastic", seed=42)
+def compute_stochastic_outcomes(replicates=10000, rng=None, **kwargs):
+    """Réplicas estocásticas (tau-leaping/SSA) da competição entre as linhagens."""
+    print(f"Simulação estocástica: {replicates} réplicas...")
+    res = simulate_population_stochastic(replicates=replicates, rng=rng, **kwargs)
+    print(f"P(extinção Omega) = {res['extinction_prob_omega']:.4f} | "
+          f"P(extinção Random) = {res['extinction_prob_random']:.4f} | "
+          f"P(Omega domina) = {res['omega_wins_prob']:.4f}")
+    res['replicates'] = replicates
+    return res
+
+@register_renderer("population_omega_stochastic")
+def render_stochastic_outcomes(res):
+    import matplotlib.pyplot as plt
+
+    replicates = res['replicates']
+    t = res['record_times']
+    q = res['quantiles']
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5))
+    for s, (color, label) in enumerate([('r', 'Espécie Padrão'), ('b', 'Espécie Omega')]):
+        ax1.fill_between(t, q[:, 0, s], q[:, 2, s], color=color, alpha=0.2)
+        ax1.plot(t, q[:, 1, s], color=color, linewidth=2, label=f'{label} (mediana, 5-95%)')
+    ax1.set_title('Ruído Demográfico: Leque de Trajetórias')
+    ax1.set_xlabel('Gerações')
+    ax1.set_ylabel('Indivíduos')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    ext_omega = res['extinction_time'][:, 1]
+    ext_omega = np.sort(ext_omega[~np.isnan(ext_omega)])
+    cumulative = np.searchsorted(ext_omega, t, side='right') / replicates
+    ax2.step(t, cumulative, 'b-', where='post', linewidth=2)
+    ax2.set_title(f"Extinção da Linhagem Omega (P = {res['extinction_prob_omega']:.3f})")
+    ax2.set_xlabel('Gerações')
+    ax2.set_ylabel('Probabilidade acumulada de extinção')
+    ax2.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    outfile = "../imgs/population_omega_stochastic.png"
+    fig.savefig(outfile, dpi=300, bbox_inches="tight")
+    print(f"Concluído. Gráfico salvo em {outfile}")
+
+def plot_stochastic_outcomes(replicates=10000, rng=None, **kwargs):
+    """Leque de trajetórias estocásticas e probabilidade de extinção da linhagem Omega."""
+    render_stochastic_outcomes(compute_stochastic_outcomes(replicates, rng, **kwargs))
+
 if __name__ == "__main__":
-    np.random.seed(42)
     simulate_population_dynamics()
+    plot_crossover_map()
+    plot_stochastic_outcomes(rng=np.random.default_rng(42))
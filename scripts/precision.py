@@ -0,0 +1,138 @@
+"""
+Precisão numérica global (float64 ou float32)
+
+Grades e populações grandes são limitadas pela memória e pela banda de memória, não
+pela aritmética. Em precisão simples os kernels alocam e processam metade dos bytes:
+o mapa da CMB (multiverse_map), os sinais de reality_patch, os sinais numéricos de DNA
+das FFTs (complex64) e os ruídos da grade epigenética. Estados discretos (bits
+epigenéticos, bases) usam códigos inteiros (uint8/int8) em qualquer precisão.
+
+    TAMESIS_PRECISION=double (padrão) | single, ou `set_precision`/`using`:
+        with using("single"):
+            results = compute_multiverse_mapping(size=4000)
+
+Em float32 os sorteios aleatórios são gerados diretamente em precisão simples, então
+os fluxos diferem dos de float64: a comparação é estatística nos experimentos e exata
+(mesmas entradas) nos kernels. `accuracy_report()` (também `python precision.py`)
+mede o desvio de cada kernel em float32 contra float64 e o compara com o limite
+aceito em TOLERANCES.
+"""
+import contextlib
+import os
+
+import numpy as np
+
+PRECISIONS = {
+    "double": (np.float64, np.complex128),
+    "single": (np.float32, np.complex64),
+}
+
+_precision = os.environ.get("TAMESIS_PRECISION", "double")
+if _precision not in PRECISIONS:
+    raise ValueError(f"TAMESIS_PRECISION desconhecida: {_precision} (esperado double ou single)")
+
+def set_precision(name):
+    """'double' ou 'single'."""
+    global _precision
+    if name not in PRECISIONS:
+        raise ValueError(f"Precisão desconhecida: {name}")
+    _precision = name
+
+def get_precision():
+    return _precision
+
+@contextlib.contextmanager
+def using(name):
+    """Usa a precisão `name` dentro do bloco."""
+    previous = _precision
+    set_precision(name)
+    try:
+        yield
+    finally:
+        set_precision(previous)
+
+def float_dtype():
+    """dtype de ponto flutuante da precisão atual (float64 ou float32)."""
+    return PRECISIONS[_precision][0]
+
+def complex_dtype():
+    """dtype complexo da precisão atual (complex128 ou complex64)."""
+    return PRECISIONS[_precision][1]
+
+def as_float(x):
+    """`x` como array na precisão atual (sem cópia se já estiver nela)."""
+    return np.asarray(x, dtype=float_dtype())
+
+# --- Relatório de precisão ---
+
+# Desvio máximo aceito de float32 contra float64, por kernel (métrica em _accuracy_cases)
+TOLERANCES = {
+    'calculate_omega_resonance': 1e-4,   # erro relativo da amplitude
+    'score_resonance_batch': 1e-4,       # erro relativo máximo no lote
+    'reality_patch_filter': 1e-5,        # erro máximo / RMS do sinal restaurado
+    # erro máximo do mapa (K), cicatrizes idênticas; o ulp de float32 em 2.725 K é 2.4e-7 K
+    # (~1% de σ = 2e-5 K) e cicatrizes sobrepostas acumulam arredondamentos
+    'scan_multiverse': 2e-6,
+    'epigenetic_lattice_step': 1e-5,     # fração de bits com flip diferente
+}
+
+def _relative(a, b):
+    return float(np.max(np.abs(np.asarray(a, dtype=np.float64) - b)) / np.max(np.abs(b)))
+
+def _accuracy_cases(rng):
+    """(nome, função de medida) -> desvio de float32 contra float64 com as mesmas entradas."""
+    import dna_kernels
+    import epigenetic_bits
+    import multiverse_map
+    import pe_entropy
+    import reality_patch
+
+    sequence = "".join(np.array(list("ATCG"))[rng.integers(0, 4, 100_000)])
+    codes = rng.integers(1, 5, (2_000, 120), dtype=np.int8)
+    signal = rng.normal(0, 1, 100_000) + np.sin(np.linspace(0, 1000, 100_000))
+    cmb_map = rng.normal(2.725, 0.00002, (400, 400))
+    grid = epigenetic_bits.omega_memory_pattern(400)
+    noise_map = rng.random((400, 400))
+    seed = int(rng.integers(2**31))
+
+    def run(name, func):
+        outputs = {}
+        for p in PRECISIONS:
+            with using(p):
+                outputs[p] = func()
+        return name, outputs['single'], outputs['double']
+
+    def scan():
+        local = cmb_map.astype(float_dtype())  # cópia: a varredura altera o mapa
+        return local, multiverse_map.scan_multiverse(local, rng=np.random.default_rng(seed))
+
+    def flips():
+        return epigenetic_bits.epigenetic_lattice_step(grid.copy(), as_float(noise_map), 100)
+
+    name, single, double = run('calculate_omega_resonance', lambda: dna_kernels.calculate_omega_resonance(sequence))
+    yield name, _relative(single, double)
+    name, single, double = run('score_resonance_batch', lambda: pe_entropy.score_resonance_batch(codes))
+    yield name, float(np.max(np.abs(single - double) / np.abs(double)))
+    name, single, double = run('reality_patch_filter', lambda: reality_patch.reality_patch_filter(signal))
+    yield name, float(np.max(np.abs(single - double)) / np.sqrt(np.mean(double ** 2)))
+    name, (map_s, scars_s), (map_d, scars_d) = run('scan_multiverse', scan)
+    yield name, float(np.max(np.abs(map_s.astype(np.float64) - map_d))) if np.array_equal(scars_s, scars_d) else np.inf
+    name, single, double = run('epigenetic_lattice_step', flips)
+    yield name, float(np.mean(single != double))
+
+def accuracy_report(seed=0):
+    """{kernel: (desvio float32 vs float64, limite, dentro do limite)}."""
+    rng = np.random.default_rng(seed)
+    return {name: (deviation, TOLERANCES[name], deviation <= TOLERANCES[name])
+            for name, deviation in _accuracy_cases(rng)}
+
+if __name__ == "__main__":
+    # Pelo módulo importado: é a precisão dele que os kernels consultam
+    from precision import accuracy_report
+
+    report = accuracy_report()
+    print(f"{'Kernel':<28} {'Desvio float32':>15} {'Limite':>10}")
+    for name, (deviation, bound, ok) in report.items():
+        print(f"{name:<28} {deviation:>15.3e} {bound:>10.0e}  {'ok' if ok else 'FORA DO LIMITE'}")
+    if not all(ok for _, _, ok in report.values()):
+        raise SystemExit(1)
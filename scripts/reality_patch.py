@@ -1,5 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from instrumentation import stage
+from precision import as_float
+from rng_streams import ensure_rng
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -7,25 +11,28 @@ OMEGA = 117.038
 # podem ser corrigidos aplicando um filtro de Fourier sintonizado em harmônicos de Omega.
 # A realidade "correta" é aquela que ressoa.
 
-def create_glitch_signal():
+def create_glitch_signal(rng=None):
+    rng = ensure_rng(rng)
     # Sinal puro (Realidade Platônica)
     t = np.linspace(0, 10, 1000)
     ideal_signal = np.sin(OMEGA * t) + 0.5 * np.sin(OMEGA * 1.618 * t) # Golden Ratio harmonic
     
     # Adicionar Glitch (Ruído Branco + Spikes)
-    noise = np.random.normal(0, 0.5, 1000)
+    noise = rng.normal(0, 0.5, 1000)
     
     # Inserir "Timeline Corruption" (Spikes aleatórios)
     corrupted_signal = ideal_signal + noise
-    indices = np.random.choice(1000, 20)
+    indices = rng.choice(1000, 20)
     corrupted_signal[indices] += 5.0 # Glitches severos
     
-    return t, ideal_signal, corrupted_signal
+    return as_float(t), as_float(ideal_signal), as_float(corrupted_signal)
 
 def reality_patch_filter(signal):
-    # FFT
-    spectrum = np.fft.fft(signal)
-    freqs = np.fft.fftfreq(len(signal))
+    # FFT na precisão atual (complex64 em precisão simples)
+    signal = as_float(signal)
+    with stage("fft"):
+        spectrum = np.fft.fft(signal)
+        freqs = np.fft.fftfreq(len(signal))
     
     # Filtro TAMESIS: Manter apenas frequências que são múltiplos aproximados ou harmônicos de OMEGA
     # Na prática, vamos filtrar frequências de alto ruído (high frequency noise) 
@@ -41,14 +48,16 @@ def reality_patch_filter(signal):
     # Correção de Fase Topológica (Mock: Alinhamento de fase em 0 para harmônicos Omega)
     # Isso simula a "re-sincronização" da timeline.
     
-    restored_signal = np.fft.ifft(spectrum_clean).real
+    with stage("fft"):
+        restored_signal = np.fft.ifft(spectrum_clean).real
     
     return restored_signal
 
-def simulate_reality_patch():
+@register_experiment("reality_patch", seed=117038)
+def compute_reality_patch(rng=None):
     print("Iniciando Experimento 14: Reality Patching Protocol...")
     
-    t, ideal, corrupted = create_glitch_signal()
+    t, ideal, corrupted = create_glitch_signal(rng)
     restored = reality_patch_filter(corrupted)
     
     # Metrics
@@ -59,7 +68,19 @@ def simulate_reality_patch():
     print(f"Erro Inicial: {mse_corrupted:.4f}")
     print(f"Erro Final: {mse_restored:.4f}")
     print(f"Integridade da Realidade Restaurada: +{improvement:.2f}%")
-    
+
+    return {'t': t, 'ideal': ideal, 'corrupted': corrupted, 'restored': restored,
+            'mse_corrupted': mse_corrupted, 'improvement': improvement}
+
+@register_renderer("reality_patch")
+def render_reality_patch(results):
+    import matplotlib.pyplot as plt
+
+    t = results['t']
+    ideal, corrupted, restored = results['ideal'], results['corrupted'], results['restored']
+    mse_corrupted = results['mse_corrupted']
+    improvement = results['improvement']
+
     # Plot
     plt.figure(figsize=(12, 8))
     
@@ -87,6 +108,8 @@ def simulate_reality_patch():
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_reality_patch(rng=None):
+    render_reality_patch(compute_reality_patch(rng))
+
 if __name__ == "__main__":
-    np.random.seed(117038)
-    simulate_reality_patch()
+    simulate_reality_patch(rng=np.random.default_rng(117038))
@@ -0,0 +1,398 @@
+"""
+Gravadores de histórico com memória limitada
+
+Os laços longos gravam uma métrica por passo. Em vez de listas Python convertidas com
+`np.array` no fim, um `Recorder` escreve num array tipado pré-alocado e, para execuções
+longas demais para a memória, pode:
+
+    max_points=N, mode="decimate"   guardar no máximo N pontos igualmente espaçados
+                                    (o passo entre pontos dobra quando o buffer enche)
+    max_points=N, mode="reservoir"  guardar uma amostra uniforme de N passos (Algoritmo R)
+    spill="hist.bin"                gravar tudo em disco em blocos (memória = um bloco);
+                                    `values` devolve o arquivo mapeado em memória
+
+Média, variância, mínimo e máximo são acumulados online sobre todos os passos
+(Welford / combinação de Chan), em qualquer modo. Quantis são exatos com o histórico
+completo em memória; com spill e nos modos limitados vêm de um `QuantileSketch` de
+memória limitada, também atualizado a cada passo (nunca relê o histórico do disco).
+
+    eff = Recorder(generations)
+    for gen in range(generations):
+        ...
+        eff.append(score)
+    eff.values, eff.mean, eff.quantile([0.05, 0.5, 0.95])
+
+`state()`/`restore()` convertem o gravador em arrays para os checkpoints.
+"""
+import os
+
+import numpy as np
+
+from rng_streams import ensure_rng
+
+MODES = ("full", "decimate", "reservoir")
+DEFAULT_CHUNK = 1 << 16  # passos por bloco gravado em disco
+
+# Valores por nível do esboço de quantis (erro de posto ~ log2(n / capacidade) / capacidade)
+QUANTILE_CAPACITY = 4096
+SUMMARY_QUANTILES = (0.05, 0.5, 0.95)
+
+class QuantileSketch:
+    """
+    Esboço de quantis em níveis de compactadores (Munro–Paterson / KLL determinístico):
+    o nível l guarda até `capacity` valores de peso 2^l; quando enche, é ordenado e um
+    valor em cada dois (deslocamento alternado) sobe para o nível l + 1. Memória
+    O(capacity · log(n / capacity)); vetorizado sobre a forma `shape` do valor.
+    """
+
+    def __init__(self, shape=(), capacity=QUANTILE_CAPACITY):
+        self.shape = tuple(shape)
+        self.capacity = capacity + capacity % 2
+        self._levels = []
+        self._fill = []
+        self._flip = []
+
+    def update(self, values):
+        """Acrescenta os valores de vários passos, array (n,) + shape."""
+        self._push(0, np.asarray(values, dtype=float).reshape((-1,) + self.shape))
+
+    def add(self, value):
+        """Acrescenta o valor de um passo (caminho rápido de `Recorder.append`)."""
+        if self._levels and self._fill[0] < self.capacity - 1:
+            self._levels[0][self._fill[0]] = value
+            self._fill[0] += 1
+        else:
+            self._push(0, np.reshape(value, (1,) + self.shape))
+
+    def _push(self, level, values):
+        while len(self._levels) <= level:
+            self._levels.append(np.empty((self.capacity,) + self.shape))
+            self._fill.append(0)
+            self._flip.append(0)
+        while len(values):
+            fill = self._fill[level]
+            take = min(len(values), self.capacity - fill)
+            self._levels[level][fill:fill + take] = values[:take]
+            self._fill[level] = fill + take
+            values = values[take:]
+            if self._fill[level] == self.capacity:
+                ordered = np.sort(self._levels[level], axis=0)
+                half = ordered[self._flip[level]::2]
+                self._flip[level] ^= 1
+                self._fill[level] = 0
+                self._push(level + 1, half)
+
+    def quantile(self, q):
+        """Quantis estimados (exatos enquanto nada foi compactado), forma q.shape + shape."""
+        q = np.asarray(q, dtype=float)
+        if not any(self._fill):
+            return np.full(q.shape + self.shape, np.nan)
+        if len(self._levels) == 1:
+            return np.quantile(self._levels[0][:self._fill[0]], q, axis=0)
+        values = np.concatenate([lvl[:f] for lvl, f in zip(self._levels, self._fill)])
+        weights = np.concatenate([np.full(f, 2.0 ** l) for l, f in enumerate(self._fill)])
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        weights = weights[order]
+        # Posição de cada valor na distribuição: meio do seu peso acumulado
+        position = (np.cumsum(weights, axis=0) - weights / 2) / weights.sum(axis=0)
+        out = np.empty(q.shape + self.shape)
+        for idx in np.ndindex(self.shape):
+            column = (slice(None),) + idx
+            out[(Ellipsis,) + idx] = np.interp(q, position[column], values[column])
+        return out
+
+    def state(self, prefix=""):
+        levels = np.stack(self._levels) if self._levels else np.empty((0, self.capacity) + self.shape)
+        return {prefix + 'levels': levels, prefix + 'fill': np.array(self._fill, dtype=np.int64),
+                prefix + 'flip': np.array(self._flip, dtype=np.int64)}
+
+    def restore(self, state, prefix=""):
+        self._levels = [np.array(level, dtype=float) for level in state[prefix + 'levels']]
+        self._fill = [int(f) for f in state[prefix + 'fill']]
+        self._flip = [int(f) for f in state[prefix + 'flip']]
+        return self
+
+class Recorder:
+    """Histórico de uma métrica (escalar ou array de forma fixa) por passo."""
+
+    def __init__(self, length=None, dtype=np.float64, shape=(), max_points=None, mode=None,
+                 spill=None, chunk=DEFAULT_CHUNK, rng=None, quantile_capacity=QUANTILE_CAPACITY):
+        mode = mode or ("decimate" if max_points else "full")
+        if mode not in MODES:
+            raise ValueError(f"Modo desconhecido: {mode} (esperado {', '.join(MODES)})")
+        if mode != "full" and not max_points:
+            raise ValueError(f"O modo {mode} requer max_points")
+        if spill is not None and mode != "full":
+            raise ValueError("spill só se aplica ao modo full")
+        self.mode = mode
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.spill = spill
+        self.count = 0      # passos gravados
+        self.stride = 1     # modo decimate: passos entre pontos guardados
+        self._kept = 0      # pontos no buffer
+        if mode == "full":
+            capacity = min(chunk, length or chunk) if spill else (length or 1024)
+        else:
+            capacity = max_points
+        self._buf = np.empty((capacity,) + self.shape, dtype=self.dtype)
+        self._steps = np.empty(capacity, dtype=np.int64) if mode == "reservoir" else None
+        self._rng = ensure_rng(rng) if mode == "reservoir" else None
+        self._spilled = 0
+        # Estatísticas online
+        self._mean = np.zeros(self.shape)
+        self._m2 = np.zeros(self.shape)
+        self._min = np.full(self.shape, np.inf)
+        self._max = np.full(self.shape, -np.inf)
+        self._sketch = QuantileSketch(self.shape, quantile_capacity)
+
+    def __len__(self):
+        return self.count
+
+    # --- Gravação ---
+
+    def append(self, value):
+        """Grava o valor de um passo."""
+        value = np.asarray(value, dtype=float)
+        self._update_stats_one(value)
+        self._sketch.add(value)
+        self._store(value[None], 1)
+
+    def extend(self, values):
+        """Grava os valores de vários passos de uma vez (vetorizado)."""
+        values = np.asarray(values, dtype=float).reshape((-1,) + self.shape)
+        if len(values) == 0:
+            return
+        self._update_stats_block(values)
+        self._sketch.update(values)
+        self._store(values, len(values))
+
+    def _update_stats_one(self, value):
+        n = self.count + 1
+        delta = value - self._mean
+        self._mean = self._mean + delta / n
+        self._m2 = self._m2 + delta * (value - self._mean)
+        self._min = np.minimum(self._min, value)
+        self._max = np.maximum(self._max, value)
+
+    def _update_stats_block(self, values):
+        # Combinação de Chan das médias e co-momentos do bloco com os acumulados
+        n_a, n_b = self.count, len(values)
+        mean_b = values.mean(axis=0)
+        m2_b = ((values - mean_b) ** 2).sum(axis=0)
+        delta = mean_b - self._mean
+        n = n_a + n_b
+        self._mean = self._mean + delta * n_b / n
+        self._m2 = self._m2 + m2_b + delta ** 2 * n_a * n_b / n
+        self._min = np.minimum(self._min, values.min(axis=0))
+        self._max = np.maximum(self._max, values.max(axis=0))
+
+    def _store(self, values, n):
+        start = self.count
+        self.count += n
+        if self.mode == "full":
+            self._store_full(values)
+        elif self.mode == "decimate":
+            self._store_decimated(values, start)
+        else:
+            self._store_reservoir(values, start)
+
+    def _store_full(self, values):
+        while len(values):
+            free = len(self._buf) - self._kept
+            if free == 0:
+                if self.spill is not None:
+                    self._flush()
+                else:
+                    grown = np.empty((2 * len(self._buf),) + self.shape, dtype=self.dtype)
+                    grown[:self._kept] = self._buf[:self._kept]
+                    self._buf = grown
+                continue
+            take = values[:free]
+            self._buf[self._kept:self._kept + len(take)] = take
+            self._kept += len(take)
+            values = values[len(take):]
+
+    def _flush(self):
+        # Primeiro bloco recria o arquivo; os seguintes são anexados
+        with open(self.spill, "ab" if self._spilled else "wb") as f:
+            f.write(np.ascontiguousarray(self._buf[:self._kept]).tobytes())
+        self._spilled += self._kept
+        self._kept = 0
+
+    def _store_decimated(self, values, start):
+        steps = np.arange(start, start + len(values))
+        while True:
+            # Próximos passos múltiplos do passo de decimação ainda não guardados
+            first = -(-max(start, self._kept * self.stride) // self.stride) * self.stride
+            wanted = np.arange(first, steps[-1] + 1, self.stride)
+            free = len(self._buf) - self._kept
+            take = wanted[:free]
+            self._buf[self._kept:self._kept + len(take)] = values[take - start]
+            self._kept += len(take)
+            if len(take) == len(wanted):
+                return
+            # Buffer cheio: descarta um ponto em cada dois e dobra o passo
+            half = self._buf[:self._kept:2].copy()
+            self._kept = len(half)
+            self._buf[:self._kept] = half
+            self.stride *= 2
+
+    def _store_reservoir(self, values, start):
+        capacity = len(self._buf)
+        steps = np.arange(start, start + len(values))
+        fill = max(0, min(capacity - self._kept, len(values)))
+        self._buf[self._kept:self._kept + fill] = values[:fill]
+        self._steps[self._kept:self._kept + fill] = steps[:fill]
+        self._kept += fill
+        if fill == len(values):
+            return
+        # Algoritmo R: o passo t substitui uma posição aleatória com probabilidade capacity / (t + 1)
+        slots = self._rng.integers(0, steps[fill:] + 1)
+        hit = slots < capacity
+        # Atribuição em ordem: com posições repetidas vale a última, como no laço sequencial
+        self._buf[slots[hit]] = values[fill:][hit]
+        self._steps[slots[hit]] = steps[fill:][hit]
+
+    # --- Leitura ---
+
+    @property
+    def values(self):
+        """Valores guardados, na ordem dos passos (mapeados do disco se houver spill)."""
+        if self.spill is not None:
+            if self._kept:
+                self._flush()
+            if self._spilled == 0:
+                return np.empty((0,) + self.shape, dtype=self.dtype)
+            return np.memmap(self.spill, dtype=self.dtype, mode="r", shape=(self._spilled,) + self.shape)
+        if self.mode == "reservoir":
+            order = np.argsort(self._steps[:self._kept], kind="stable")
+            return self._buf[:self._kept][order]
+        return self._buf[:self._kept]
+
+    @property
+    def steps(self):
+        """Índice do passo de cada valor guardado."""
+        if self.mode == "full":
+            return np.arange(self.count)
+        if self.mode == "decimate":
+            return np.arange(self._kept) * self.stride
+        return np.sort(self._steps[:self._kept])
+
+    @property
+    def mean(self):
+        return (self._mean if self.count else np.full(self.shape, np.nan))[()]
+
+    @property
+    def var(self):
+        return (self._m2 / self.count if self.count else np.full(self.shape, np.nan))[()]
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @property
+    def min(self):
+        return self._min[()]
+
+    @property
+    def max(self):
+        return self._max[()]
+
+    def quantile(self, q):
+        """
+        Quantis sobre todos os passos: exatos no modo full em memória, estimados pelo
+        esboço online com spill e nos modos limitados (memória constante).
+        """
+        if self.mode == "full" and self.spill is None:
+            if self.count == 0:
+                return np.full(np.shape(q) + self.shape, np.nan)
+            return np.quantile(self.values, q, axis=0)
+        return self._sketch.quantile(q)
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.mean, 'std': self.std,
+                'min': self.min, 'max': self.max, 'quantiles': self.quantile(SUMMARY_QUANTILES)}
+
+    # --- Checkpoints ---
+
+    def state(self, prefix=""):
+        """Estado como dict de arrays, com as chaves prefixadas (para os checkpoints)."""
+        if self.spill is not None:
+            self.close()
+            values = np.empty((0,) + self.shape, dtype=self.dtype)
+        else:
+            values = np.asarray(self.values)
+        state = {'values': values,
+                 'steps': self.steps if self.mode == "reservoir" else np.empty(0, np.int64),
+                 'counters': np.array([self.count, self.stride, self._spilled]),
+                 'stats': np.stack([self._mean, self._m2, self._min, self._max]),
+                 **self._sketch.state('sketch.')}
+        return {prefix + key: value for key, value in state.items()}
+
+    def restore(self, state, prefix=""):
+        """
+        Restaura um estado gravado por `state()` (mesmos parâmetros do gravador). No modo
+        reservoir, o gerador do gravador deve ser o do laço, restaurado pelo checkpoint.
+        """
+        self.count, self.stride, spilled = (int(v) for v in state[prefix + 'counters'])
+        self._mean, self._m2, self._min, self._max = np.asarray(state[prefix + 'stats'], dtype=float)
+        values = np.asarray(state[prefix + 'values'], dtype=self.dtype)
+        if prefix + 'sketch.levels' in state:
+            self._sketch.restore(state, prefix + 'sketch.')
+        if self.spill is not None:
+            # Trunca o arquivo no ponto do checkpoint (passos posteriores serão regravados)
+            with open(self.spill, "ab") as f:
+                f.truncate(spilled * self.dtype.itemsize * int(np.prod(self.shape, dtype=np.int64)))
+            self._spilled, self._kept = spilled, 0
+            return self
+        if len(values) > len(self._buf):
+            self._buf = np.empty((len(values),) + self.shape, dtype=self.dtype)
+        self._buf[:len(values)] = values
+        self._kept = len(values)
+        if self.mode == "reservoir":
+            self._steps[:len(values)] = state[prefix + 'steps']
+        return self
+
+    def close(self):
+        """Grava o bloco pendente em disco (modo spill)."""
+        if self.spill is not None and self._kept:
+            self._flush()
+
+if __name__ == "__main__":
+    # Verificação: cada modo contra o histórico completo em memória
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(3.0, 2.0, 200_003)
+    for label, kwargs in [("full", {}), ("full/spill", {'spill': os.path.join(tempfile.mkdtemp(), "h.bin"),
+                                                        'chunk': 4096}),
+                          ("decimate", {'max_points': 1000}),
+                          ("decimate/odd", {'max_points': 999}),
+                          ("decimate/1", {'max_points': 1}),
+                          ("reservoir", {'max_points': 1000, 'mode': "reservoir", 'rng': 1})]:
+        rec = Recorder(**kwargs)
+        for x in data[:1001]:
+            rec.append(x)
+        rec.extend(data[1001:])
+        assert np.allclose([rec.mean, rec.var, rec.min, rec.max],
+                           [data.mean(), data.var(), data.min(), data.max()])
+        assert np.array_equal(rec.values, data[rec.steps])
+        assert kwargs.get('max_points', len(data)) >= len(rec.values)
+        q = rec.quantile([0.05, 0.5, 0.95])
+        # Erro de posto dos quantis sobre todos os passos (esboço fora do modo full em memória)
+        assert np.all(np.abs((data[:, None] <= q).mean(axis=0) - [0.05, 0.5, 0.95]) < 0.005), label
+        print(f"{label:<12} pontos={len(rec.values):>7}  média={rec.mean:.4f}  quantis={np.round(q, 2)}")
+
+    # Esboço vetorizado sobre a forma do valor e preservado pelos checkpoints
+    block = rng.normal(0.0, [1.0, 10.0, 100.0], (300_000, 3))
+    rec = Recorder(max_points=100, shape=(3,))
+    rec.extend(block[:150_000])
+    resumed = Recorder(max_points=100, shape=(3,)).restore(rec.state('h.'), 'h.')
+    for r in (rec, resumed):
+        r.extend(block[150_000:])
+    assert np.array_equal(rec.quantile([0.5, 0.9]), resumed.quantile([0.5, 0.9]))
+    ranks = (block[:, None, :] <= rec.quantile([0.5, 0.9])).mean(axis=0)
+    assert np.all(np.abs(ranks - [[0.5], [0.9]]) < 0.005)
+    print("Gravadores consistentes com o histórico completo")
@@ -0,0 +1,177 @@
+"""
+Cache de resultados endereçado por conteúdo
+
+Os experimentos são determinísticos (sementes fixas), então o resultado de `compute_*`
+depende apenas de:
+    - código de cálculo do experimento (fonte do módulo e dos módulos locais que ele
+      usa, sem os renderizadores `render_*` nem `plot_style`/`render_utils`: mudar o
+      estilo de uma figura só exige redesenhar)
+    - parâmetros e semente
+    - versões do Python e das bibliotecas numéricas
+    - precisão numérica (`precision.py`)
+O hash SHA-256 desses itens é a chave; os arrays ficam em `<chave>.npz` no diretório
+do cache. Cada acerto atualiza o mtime do arquivo, e o cache é podado por tamanho
+removendo os arquivos menos recentemente usados (LRU).
+"""
+import hashlib
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import precision
+from results_io import load_results, save_results
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "results")
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GB
+
+# Módulos só de visualização, fora da chave
+RENDER_MODULES = ("plot_style", "render_utils")
+
+# Bibliotecas cujas versões entram na chave (mudanças numéricas invalidam o cache)
+VERSIONED_LIBRARIES = ("numpy", "scipy", "networkx", "numba")
+
+def library_versions():
+    """Versões do Python e das bibliotecas numéricas carregadas."""
+    versions = {"python": platform.python_version()}
+    for lib in VERSIONED_LIBRARIES:
+        module = sys.modules.get(lib)
+        if module is not None:
+            versions[lib] = getattr(module, "__version__", "?")
+    return versions
+
+def _local_modules(module):
+    """O módulo e, recursivamente, os módulos deste diretório referenciados por ele."""
+    seen = {}
+    pending = [module]
+    while pending:
+        mod = pending.pop()
+        path = getattr(mod, "__file__", None)
+        if mod.__name__ in seen or mod.__name__ in RENDER_MODULES or path is None:
+            continue
+        if os.path.dirname(os.path.abspath(path)) != SCRIPT_DIR:
+            continue
+        seen[mod.__name__] = mod
+        for value in vars(mod).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            else:
+                owner = sys.modules.get(getattr(value, "__module__", None) or "")
+                if owner is not None:
+                    pending.append(owner)
+    return [seen[name] for name in sorted(seen)]
+
+def _compute_source(mod, renderers):
+    """Fonte do módulo sem as funções de visualização registradas (com seus decoradores)."""
+    with open(mod.__file__, encoding="utf-8") as f:
+        source = f.read()
+    for func in renderers:
+        if func.__module__ == mod.__name__:
+            source = source.replace(inspect.getsource(func), "")
+    return source
+
+def code_fingerprint(module_name):
+    """SHA-256 do código de cálculo do módulo do experimento e de suas dependências locais."""
+    from experiments import EXPERIMENTS
+
+    renderers = [e.render for e in EXPERIMENTS.values() if e.render is not None]
+    digest = hashlib.sha256()
+    for mod in _local_modules(sys.modules[module_name]):
+        digest.update(mod.__name__.encode())
+        digest.update(_compute_source(mod, renderers).encode())
+    return digest.hexdigest()
+
+def _canonical(value):
+    """Representação JSON estável de parâmetros (arrays e tipos numpy incluídos)."""
+    if isinstance(value, np.ndarray):
+        return {"dtype": value.dtype.str, "shape": value.shape,
+                "sha256": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    return value
+
+def result_key(experiment, params, seed):
+    """Chave SHA-256 de (código, parâmetros, semente, versões, precisão) de um experimento registrado."""
+    payload = {
+        "experiment": experiment.name,
+        "code": code_fingerprint(experiment.module),
+        "params": _canonical(params),
+        "seed": _canonical(seed),
+        "versions": library_versions(),
+        "precision": precision.get_precision(),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+class ResultCache:
+    """Cache em disco de dicts de arrays, com chave por conteúdo e poda LRU por tamanho."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, experiment, params, seed):
+        """Chave de conteúdo da execução (ver `result_key`)."""
+        return result_key(experiment, params, seed)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key):
+        """Dict de resultados da chave, ou None (ausente ou ilegível)."""
+        path = self._path(key)
+        try:
+            results, _ = load_results(path)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # marca como usado recentemente
+        return results
+
+    def put(self, key, results, meta=None):
+        """Grava os resultados atomicamente (arquivo temporário + rename) e poda o cache."""
+        meta = dict(meta or {}, key=key, created=time.time(), versions=library_versions())
+        save_results(self._path(key), results, meta)
+        self.evict()
+
+    def entries(self):
+        """Lista de (caminho, tamanho, mtime) das entradas, da menos para a mais recente."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, st.st_size, st.st_mtime))
+        return sorted(entries, key=lambda e: e[2])
+
+    def evict(self):
+        """Remove as entradas menos recentemente usadas até caber em max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.unlink(path)
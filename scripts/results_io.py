@@ -0,0 +1,60 @@
+"""
+Formato intermediário dos experimentos
+
+O estágio de cálculo (`compute_*`) devolve um dict de arrays; ele é gravado em um
+`.npz` compacto (arrays numéricos/texto, sem pickle) com os metadados em JSON na
+chave `__meta__`. O estágio de renderização (`render_*`) lê o mesmo arquivo, então
+os gráficos podem ser redesenhados em outra máquina, em paralelo, sem recalcular.
+Escalares são gravados como arrays 0-d e voltam como escalares Python.
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+META_KEY = "__meta__"
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+def results_path(directory, name):
+    return os.path.join(directory, name + ".npz")
+
+def save_results(path, results, meta=None, compressed=False):
+    """Grava o dict de resultados atomicamente (arquivo temporário + rename)."""
+    arrays = {name: np.asarray(value) for name, value in results.items()}
+    for name, value in arrays.items():
+        if value.dtype == object:
+            raise TypeError(f"Resultado '{name}' não é um array numérico/texto (dtype object)")
+    arrays[META_KEY] = np.asarray(json.dumps(_jsonable(meta or {}), default=str))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            (np.savez_compressed if compressed else np.savez)(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def load_results(path):
+    """Lê um arquivo gravado por `save_results`. Retorna (resultados, metadados)."""
+    with np.load(path, allow_pickle=False) as data:
+        results = {name: data[name] for name in data.files if name != META_KEY}
+        meta = json.loads(data[META_KEY].item()) if META_KEY in data.files else {}
+    # Arrays 0-d voltam a ser escalares (float, int, str)
+    for name, value in results.items():
+        if value.ndim == 0:
+            results[name] = value.item()
+    return results, meta
@@ -0,0 +1,297 @@
+"""
+Armazém colunar de resultados (Arrow IPC ou Parquet, particionado por experimento)
+
+Cada execução vira uma linha: metadados (run_id, criação, semente, precisão), os
+parâmetros (JSON em `params` e uma coluna `param.<nome>` por parâmetro escalar) e os
+resultados. Escalares são colunas escalares; arrays são listas achatadas com a forma
+em `<nome>.shape`. Um arquivo por execução em
+
+    <raiz>/experiment=<nome>/<run_id>.arrow      (ou .parquet)
+
+então escritas concorrentes (workers do orquestrador) não disputam arquivos, e a
+gravação é atômica. As consultas leem só os diretórios do experimento pedido, as
+colunas pedidas e as linhas que passam no filtro; no formato arrow (IPC sem
+compressão, padrão) os arquivos são mapeados em memória e as colunas numéricas viram
+arrays numpy sem cópia. Parquet ocupa menos disco, mas decodifica na leitura.
+
+    store = ResultsStore("../store")
+    store.append("population_omega", results, params={'generations': 500}, seed=117)
+    table = store.query("population_omega", columns=["history_omega"], where={"generations": 500})
+    histories = column_arrays(table, "history_omega")  # um array por execução
+    results, info = store.load_run(run_id)
+
+Requer o pyarrow (opcional: `pip install pyarrow`). `run_all_simulations.py --store`
+grava cada experimento calculado; `python results_store.py ingest ../results` importa
+os `.npz` do estágio de cálculo.
+"""
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+import precision
+
+HAVE_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE_DIR = os.path.join(SCRIPT_DIR, "..", "store")
+
+FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+PARAM_PREFIX = "param."
+SHAPE_SUFFIX = ".shape"
+META_COLUMNS = ("experiment", "run_id", "created", "seed", "precision", "params")
+
+def _require_pyarrow():
+    if not HAVE_PYARROW:
+        raise ImportError("O armazém de resultados requer o pyarrow (pip install pyarrow)")
+
+def _dumps(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+def _result_columns(results):
+    """Colunas (de uma linha) dos resultados: escalares como escalares, arrays achatados + forma."""
+    import pyarrow as pa
+
+    columns = {}
+    for name, value in results.items():
+        array = np.asarray(value)
+        if array.dtype == object:
+            raise TypeError(f"Resultado '{name}' não é um array numérico/texto (dtype object)")
+        if array.ndim == 0:
+            columns[name] = pa.array([array.item()])
+        else:
+            flat = pa.array(np.ascontiguousarray(array).reshape(-1))
+            offsets = pa.array([0, len(flat)], type=pa.int64())
+            columns[name] = pa.LargeListArray.from_arrays(offsets, flat)
+            columns[name + SHAPE_SUFFIX] = pa.array([list(array.shape)], type=pa.list_(pa.int64()))
+    return columns
+
+def _param_columns(params):
+    """Uma coluna por parâmetro escalar (filtráveis em `query(where=...)`)."""
+    import pyarrow as pa
+
+    return {PARAM_PREFIX + key: pa.array([value]) for key, value in params.items()
+            if isinstance(value, (bool, int, float, str))}
+
+def column_arrays(table, name):
+    """
+    Valores da coluna `name` de uma tabela de `query`, um por execução: arrays com a
+    forma original (None onde a execução não tem a coluna) ou escalares.
+    """
+    import pyarrow as pa
+
+    column = table.column(name).combine_chunks()
+    if not pa.types.is_large_list(column.type):
+        return column.to_pylist()
+    offsets = column.offsets.to_numpy()
+    # Sem cópia para colunas numéricas sem nulos (memória mapeada no formato arrow)
+    values = column.values.to_numpy(zero_copy_only=False)
+    shapes = (table.column(name + SHAPE_SUFFIX).to_pylist()
+              if name + SHAPE_SUFFIX in table.column_names else [None] * len(column))
+    arrays = []
+    for i, shape in enumerate(shapes):
+        if not column[i].is_valid:
+            arrays.append(None)
+            continue
+        flat = values[offsets[i]:offsets[i + 1]]
+        arrays.append(flat.reshape(shape) if shape is not None else flat)
+    return arrays
+
+class ResultsStore:
+    """Dataset particionado de execuções (uma linha e um arquivo por execução)."""
+
+    def __init__(self, root=DEFAULT_STORE_DIR, format="arrow"):
+        _require_pyarrow()
+        if format not in FORMATS:
+            raise ValueError(f"Formato desconhecido: {format} (esperado {', '.join(FORMATS)})")
+        self.root = os.path.abspath(root)
+        self.format = format
+        self.suffix = FORMATS[format]
+
+    def _path(self, experiment, run_id):
+        return os.path.join(self.root, f"experiment={experiment}", run_id + self.suffix)
+
+    def files(self, experiment=None):
+        """Arquivos das execuções (de um experimento ou de todos)."""
+        partition = f"experiment={experiment}" if experiment else "experiment=*"
+        return sorted(glob.glob(os.path.join(self.root, partition, "*" + self.suffix)))
+
+    def experiments(self):
+        return sorted({os.path.basename(os.path.dirname(p)).split("=", 1)[1] for p in self.files()})
+
+    def append(self, experiment, results, params=None, seed=None, run_id=None):
+        """
+        Grava uma execução e devolve o run_id. Com um run_id determinístico (ex.: a
+        chave do cache), gravar de novo a mesma execução não duplica a linha.
+        """
+        import pyarrow as pa
+
+        run_id = run_id or uuid.uuid4().hex
+        path = self._path(experiment, run_id)
+        if os.path.exists(path):
+            return run_id
+        params = dict(params or {})
+        columns = {
+            "run_id": pa.array([run_id]),
+            "created": pa.array([time.time()]),
+            "seed": pa.array([_dumps(seed)]),
+            "precision": pa.array([precision.get_precision()]),
+            "params": pa.array([_dumps(params)]),
+        }
+        columns.update(_param_columns(params))
+        columns.update(_result_columns(results))
+        self._write(path, pa.table(columns))
+        return run_id
+
+    def _write(self, path, table):
+        """Gravação atômica (arquivo temporário + rename)."""
+        import pyarrow as pa
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            if self.format == "arrow":
+                with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            else:
+                import pyarrow.parquet as pq
+                pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def dataset(self, experiment=None):
+        """
+        `pyarrow.dataset.Dataset` das execuções. Os esquemas dos arquivos são unificados
+        (colunas ausentes viram nulos; float32/float64 são promovidos).
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        files = self.files(experiment)
+        if not files:
+            raise FileNotFoundError(f"Nenhuma execução em {self.root}"
+                                    + (f" para {experiment}" if experiment else ""))
+        filesystem = fs.LocalFileSystem(use_mmap=True)
+        file_format = "ipc" if self.format == "arrow" else "parquet"
+        fragments = ds.dataset(files, format=file_format, filesystem=filesystem).get_fragments()
+        schema = pa.unify_schemas([pa.schema([("experiment", pa.string())])]
+                                  + [fragment.physical_schema for fragment in fragments],
+                                  promote_options="permissive")
+        return ds.dataset(files, schema=schema, format=file_format, filesystem=filesystem,
+                          partitioning="hive", partition_base_dir=self.root)
+
+    def _filter(self, schema, where):
+        import pyarrow.dataset as ds
+
+        if where is None or isinstance(where, ds.Expression):
+            return where
+        expression = None
+        for key, value in where.items():
+            name = key if key in schema.names else PARAM_PREFIX + key
+            if name not in schema.names:
+                raise KeyError(f"Coluna ou parâmetro desconhecido: {key}")
+            term = ds.field(name) == value
+            expression = term if expression is None else expression & term
+        return expression
+
+    def query(self, experiment=None, columns=None, where=None):
+        """
+        Tabela Arrow (uma linha por execução) com os metadados e as `columns` pedidas
+        (todas se None; a coluna de forma de cada array vem junto). `where` é um dict
+        {parâmetro ou coluna: valor} (igualdade) ou uma expressão `pyarrow.dataset`.
+        """
+        dataset = self.dataset(experiment)
+        names = dataset.schema.names
+        if columns is not None:
+            selected = [c for c in META_COLUMNS if c in names]
+            for column in columns:
+                if column not in names:
+                    raise KeyError(f"Coluna desconhecida: {column}")
+                selected.append(column)
+                if column + SHAPE_SUFFIX in names:
+                    selected.append(column + SHAPE_SUFFIX)
+            columns = list(dict.fromkeys(selected))
+        return dataset.to_table(columns=columns, filter=self._filter(dataset.schema, where))
+
+    def runs(self, experiment=None):
+        """Índice das execuções: apenas as colunas de metadados."""
+        return self.query(experiment, columns=[])
+
+    def load_run(self, run_id):
+        """Resultados de uma execução, como em `results_io.load_results`: (resultados, metadados)."""
+        paths = glob.glob(os.path.join(self.root, "experiment=*", run_id + self.suffix))
+        if not paths:
+            raise KeyError(f"Execução desconhecida: {run_id}")
+        path = paths[0]
+        if self.format == "arrow":
+            import pyarrow as pa
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        else:
+            import pyarrow.parquet as pq
+            table = pq.read_table(path, memory_map=True)
+
+        meta = {name: table.column(name)[0].as_py() for name in META_COLUMNS if name in table.column_names}
+        meta['experiment'] = os.path.basename(os.path.dirname(path)).split("=", 1)[1]
+        meta['seed'] = json.loads(meta['seed'])
+        meta['params'] = json.loads(meta['params'])
+        results = {}
+        for name in table.column_names:
+            if name in META_COLUMNS or name.startswith(PARAM_PREFIX) or name.endswith(SHAPE_SUFFIX):
+                continue
+            results[name] = column_arrays(table, name)[0]
+        return results, meta
+
+def ingest(store, paths):
+    """
+    Importa arquivos `.npz` do estágio de cálculo (`results_io`) usando os metadados
+    gravados neles (experimento, parâmetros, semente). Reimportar não duplica.
+    """
+    from results_io import load_results
+
+    ingested = []
+    for path in paths:
+        results, meta = load_results(path)
+        experiment = meta.get('experiment') or os.path.splitext(os.path.basename(path))[0]
+        identity = _dumps([experiment, meta.get('params'), meta.get('seed'), meta.get('created')])
+        run_id = hashlib.sha256(identity.encode()).hexdigest()[:32]
+        with precision.using(meta.get('precision', precision.get_precision())):
+            ingested.append(store.append(experiment, results, meta.get('params'), meta.get('seed'), run_id))
+    return ingested
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Armazém colunar de resultados das simulações.")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Raiz do dataset")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="arrow")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = sub.add_parser("ingest", help="Importa .npz (arquivos ou diretórios)")
+    ingest_parser.add_argument("paths", nargs="+")
+    list_parser = sub.add_parser("list", help="Lista as execuções")
+    list_parser.add_argument("experiment", nargs="?", default=None)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    store = ResultsStore(args.store, args.format)
+    if args.command == "ingest":
+        files = []
+        for path in args.paths:
+            files += sorted(glob.glob(os.path.join(path, "*.npz"))) if os.path.isdir(path) else [path]
+        print(f"{len(ingest(store, files))} execuções importadas em {os.path.relpath(store.root)}")
+    else:
+        runs = store.runs(args.experiment).sort_by("created")
+        for row in runs.to_pylist():
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row['created']))
+            print(f"{row['experiment']:<26} {row['run_id'][:12]}  {created}  {row['precision']:<7} {row['params']}")
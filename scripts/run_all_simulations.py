@@ -1,9 +1,70 @@
 """
 Script para rodar todas as simulações e gerar gráficos melhorados
+
+As simulações são independentes: rodam em paralelo num pool limitado ao número
+de núcleos, cada uma com seu tempo limite, com logs transmitidos linha a linha
+e um resumo final (tempo de parede, pico de memória RSS e status).
+
+Modos:
+    warm        (padrão) experimentos do registro (`experiments.py`) executados em
+                processos worker de longa duração (forkserver com numpy, matplotlib,
+                networkx e os módulos de simulação pré-carregados)
+    subprocess  um interpretador novo por script (isolamento total)
+
+Uso:
+    python run_all_simulations.py [--mode warm|subprocess] [--jobs N] [--timeout S]
+                                  [--param experimento.parametro=valor ...] [nome ...]
+    python run_all_simulations.py --list
+
+No modo warm, os resultados de cada experimento ficam num cache endereçado por conteúdo
+(`result_cache.py`): rodar de novo sem mudar código, parâmetros ou bibliotecas apenas
+redesenha os gráficos. Use --no-cache para forçar o recálculo.
+
+Estágios (modo warm):
+    --stage compute  calcula e grava os arrays em results/<experimento>.npz (sem matplotlib,
+                     adequado para nós de cálculo sem interface gráfica)
+    --stage render   redesenha os gráficos em paralelo a partir desses arquivos
+    --stage all      (padrão) as duas coisas no mesmo worker
+
+Perfil (modo warm, grava em profiles/):
+    --instrument     tempo, chamadas e alocação por estágio (mutation, scoring, selection,
+                     eigendecomposition, fft, render...) em <experimento>.stages.json e
+                     eventos Chrome trace em <experimento>.trace.json (`instrumentation.py`)
+    --cprofile       também grava <experimento>.prof (cProfile)
+    --tracemalloc    também mede alocações por estágio e grava <experimento>.alloc.txt
+Checkpoints (modo warm): os laços longos (entropic_dna, entropic_dna_wright_fisher, cas9_flow,
+epigenetic_bits) gravam o estado a cada --checkpoint-interval segundos em checkpoints/; após
+um timeout ou uma interrupção, --resume continua do último checkpoint com resultado idêntico.
+Precisão: --precision single roda os kernels em float32/complex64 (`precision.py`), com
+metade da memória nas grades e sinais grandes; entra na chave do cache.
+Armazém: --store grava parâmetros e arrays de cada execução num dataset Arrow particionado
+por experimento (store/, `results_store.py`), consultável sem recalcular.
+
+Combine com --no-cache para medir o cálculo (acertos do cache só redesenham). cProfile e
+tracemalloc deixam o cálculo várias vezes mais lento: aumente --timeout se preciso.
 """
+import argparse
+import contextlib
+import multiprocessing
+import os
+import signal
 import subprocess
 import sys
-import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import checkpoint
+import experiments
+import instrumentation
+import plot_style
+import precision
+from result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+from results_io import load_results, results_path, save_results
+from results_store import DEFAULT_STORE_DIR, HAVE_PYARROW
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Lista de todos os scripts de simulação
 scripts = [
@@ -23,75 +84,463 @@ scripts = [
     "reality_patch.py",
     "chrono_telephony.py",
     "multiverse_map.py",
-    "entropy_reversal.py"
+    "entropy_reversal.py",
+    "island_model.py"
 ]
 
-def run_script(script_name):
-    """Executa um script e captura saída"""
-    print(f"\n{'='*60}")
-    print(f"Executando: {script_name}")
-    print(f"{'='*60}")
-    
+DEFAULT_TIMEOUT = 60  # segundos
+
+# Tempos limite específicos para as simulações mais pesadas
+SCRIPT_TIMEOUTS = {
+    "epigenetic_bits.py": 600,
+    "omega_stability.py": 300,
+    "population_omega.py": 180,
+    "island_model.py": 180,
+}
+
+# Módulos carregados uma única vez no servidor de forks (herdados por todos os workers)
+COMPUTE_PRELOAD_MODULES = ["numpy", "scipy", "scipy.sparse", "networkx",
+                           "experiments"] + experiments.EXPERIMENT_MODULES
+PRELOAD_MODULES = ["matplotlib", "matplotlib.pyplot"] + COMPUTE_PRELOAD_MODULES
+
+# Arquivos intermediários dos estágios --stage compute / --stage render
+DEFAULT_RESULTS_DIR = os.path.join(SCRIPT_DIR, "..", "results")
+
+# Relatórios de --instrument / --cprofile / --tracemalloc
+DEFAULT_PROFILE_DIR = os.path.join(SCRIPT_DIR, "..", "profiles")
+
+# Checkpoints dos laços longos (--resume)
+DEFAULT_CHECKPOINT_DIR = os.path.join(SCRIPT_DIR, "..", "checkpoints")
+
+_print_lock = threading.Lock()
+
+def log(message):
+    """Imprime uma linha inteira de forma atômica (várias threads escrevem ao mesmo tempo)."""
+    with _print_lock:
+        print(message, flush=True)
+
+def _stream_output(proc, prefix):
+    """Transmite a saída do processo linha a linha, prefixada pelo nome do script."""
+    for line in proc.stdout:
+        log(f"[{prefix}] {line.rstrip()}")
+
+def run_script(script_name, timeout=DEFAULT_TIMEOUT):
+    """
+    Executa um script num subprocesso, transmitindo a saída enquanto ele roda.
+    Retorna dict com script, status, returncode, wall_time (s) e peak_rss_mb.
+    """
+    result = {'name': script_name, 'status': 'falhou', 'returncode': None,
+              'wall_time': 0.0, 'peak_rss_mb': None}
+    path = os.path.join(SCRIPT_DIR, script_name)
+    if not os.path.exists(path):
+        log(f"✗ Arquivo {script_name} não encontrado")
+        result['status'] = 'ausente'
+        return result
+
+    prefix = os.path.splitext(script_name)[0]
+    env = dict(os.environ, PYTHONUNBUFFERED="1", MPLBACKEND="Agg")
+    log(f"▶ Executando: {script_name} (limite {timeout}s)")
+    start = time.perf_counter()
+
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             [sys.executable, script_name],
-            capture_output=True,
+            cwd=SCRIPT_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=60
+            bufsize=1,
+            env=env,
         )
-        
-        print(result.stdout)
-        if result.stderr:
-            print(f"Avisos/Erros: {result.stderr}")
-        
-        if result.returncode == 0:
-            print(f"✓ {script_name} concluído com sucesso")
-            return True
-        else:
-            print(f"✗ {script_name} falhou com código {result.returncode}")
-            return False
-    except subprocess.TimeoutExpired:
-        print(f"✗ {script_name} excedeu o tempo limite de 60s")
-        return False
     except Exception as e:
-        print(f"✗ Erro ao executar {script_name}: {e}")
+        log(f"✗ Erro ao executar {script_name}: {e}")
+        return result
+
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill_on_timeout)
+    timer.start()
+    try:
+        _stream_output(proc, prefix)
+        if hasattr(os, 'wait4'):
+            # wait4 devolve o uso de recursos do filho (ru_maxrss em KB no Linux)
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            result['peak_rss_mb'] = usage.ru_maxrss / 1024
+        else:
+            proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+
+    result['wall_time'] = time.perf_counter() - start
+    result['returncode'] = proc.returncode
+
+    if timed_out.is_set():
+        result['status'] = 'timeout'
+        log(f"✗ {script_name} excedeu o tempo limite de {timeout}s")
+    elif proc.returncode == 0:
+        result['status'] = 'ok'
+        log(f"✓ {script_name} concluído com sucesso ({result['wall_time']:.1f}s)")
+    else:
+        log(f"✗ {script_name} falhou com código {proc.returncode}")
+    return result
+
+def _timeout_for(script, timeout):
+    if timeout is not None:
+        return timeout
+    return SCRIPT_TIMEOUTS.get(script, DEFAULT_TIMEOUT)
+
+def run_all(script_list, jobs=None, timeout=None):
+    """Roda os scripts num pool limitado de workers. Retorna os resultados na ordem da lista."""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(script_list)))
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_script, s, _timeout_for(s, timeout)): s for s in script_list}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[s] for s in script_list]
+
+class ExperimentTimeout(BaseException):
+    """Tempo limite; BaseException para não ser engolido por `except Exception` do experimento."""
+
+def _raise_timeout(signum, frame):
+    raise ExperimentTimeout()
+
+class _PrefixedWriter:
+    """Stream que emite cada linha completa na saída real, prefixada pelo nome do experimento."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.buffer = ""
+
+    def write(self, text):
+        self.buffer += text
+        *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            sys.__stdout__.write(f"[{self.prefix}] {line}\n")
+        sys.__stdout__.flush()
+        return len(text)
+
+    def flush(self):
+        if self.buffer:
+            self.write("\n")
+
+def _init_worker():
+    """Inicialização de cada worker: diretório dos scripts no caminho de importação."""
+    os.chdir(SCRIPT_DIR)
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+
+def _prepare_render(style):
+    """Estilo limpo a cada renderização (o worker é reutilizado entre experimentos)."""
+    plot_style.reset_style()
+    if style == "publication":
+        plot_style.apply_publication_style()
+
+def _compute(name, params, cache_dir, cache_bytes, checkpoints, store_dir):
+    """
+    Cálculo com cache (se cache_dir), checkpoints (se checkpoints = (dir, resume, intervalo))
+    e gravação no armazém colunar (se store_dir).
+    """
+    cache = ResultCache(cache_dir, cache_bytes) if cache_dir else None
+    store = None
+    if store_dir:
+        from results_store import ResultsStore
+        store = ResultsStore(store_dir)
+    with checkpoint.checkpointing(*checkpoints) if checkpoints else contextlib.nullcontext():
+        return experiments.run_experiment(name, params, cache=cache, render=False, store=store)
+
+def _task_all(name, params, cache_dir, cache_bytes, checkpoints, store_dir, style):
+    """Cálculo e renderização no mesmo worker."""
+    results = _compute(name, params, cache_dir, cache_bytes, checkpoints, store_dir)
+    _prepare_render(style)
+    experiments.render_results(name, results)
+
+def _task_compute(name, params, cache_dir, cache_bytes, checkpoints, store_dir, results_dir):
+    """Estágio de cálculo: grava os arrays no formato intermediário, sem importar matplotlib."""
+    experiment = experiments.get_experiment(name)
+    results = _compute(name, params, cache_dir, cache_bytes, checkpoints, store_dir)
+    path = results_path(results_dir, name)
+    save_results(path, results, meta={'experiment': name, 'module': experiment.module,
+                                      'params': experiments.effective_params(experiment, params),
+                                      'seed': experiment.seed,
+                                      'precision': precision.get_precision(), 'created': time.time()})
+    print(f"Resultados gravados em {os.path.relpath(path)}")
+
+def _task_render(name, results_dir, style):
+    """Estágio de renderização: lê o formato intermediário e desenha o gráfico."""
+    results, _ = load_results(results_path(results_dir, name))
+    _prepare_render(style)
+    experiments.render_results(name, results)
+
+def _reset_peak_rss():
+    """Zera o pico de RSS do processo (Linux: "5" em /proc/self/clear_refs). False se indisponível."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
         return False
 
-if __name__ == "__main__":
-    print("="*60)
-    print("RODANDO TODAS AS SIMULAÇÕES")
-    print("="*60)
-    
-    # Criar diretório de imagens se não existir
-    if not os.path.exists("../imgs"):
-        os.makedirs("../imgs")
-        print("Diretório 'imgs' criado")
-    
-    success_count = 0
-    failed_scripts = []
-    
-    for script in scripts:
-        if os.path.exists(script):
-            if run_script(script):
-                success_count += 1
+def _peak_rss_mb():
+    """Pico de RSS desde o último `_reset_peak_rss` (VmHWM de /proc/self/status), em MB."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+def _run_in_worker(name, timeout, profile, task, *args):
+    """
+    Executa uma tarefa de um experimento dentro de um worker quente, com tempo limite.
+    `profile` = (rótulo, diretório, cprofile, tracemalloc) liga a instrumentação, ou None.
+    """
+    result = {'name': name, 'status': 'falhou', 'returncode': 1, 'wall_time': 0.0,
+              'peak_rss_mb': None, 'worker': os.getpid()}
+    stream = _PrefixedWriter(name)
+    # Workers são reutilizados: sem zerar o pico, o ru_maxrss acumularia tarefas anteriores
+    measure_rss = _reset_peak_rss()
+    start = time.perf_counter()
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(contextlib.redirect_stdout(stream))
+            if profile is not None:
+                label, out_dir, cprofile, trace_memory = profile
+                stack.enter_context(instrumentation.profile_session(label, out_dir, cprofile, trace_memory))
+            task(name, *args)
+        result['status'] = 'ok'
+        result['returncode'] = 0
+    except ExperimentTimeout:
+        result['status'] = 'timeout'
+    except Exception:
+        for line in traceback.format_exc().splitlines():
+            stream.write(line + "\n")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        stream.flush()
+        # Workers são reutilizados: liberar as figuras do experimento
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].close('all')
+
+    result['wall_time'] = time.perf_counter() - start
+    # Pico de RSS da tarefa; sem clear_refs fica None (coluna "-")
+    if measure_rss:
+        result['peak_rss_mb'] = _peak_rss_mb()
+    return result
+
+def _worker_context(preload):
+    """Contexto forkserver com módulos pré-carregados (spawn onde forkserver não existe)."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(preload)
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+def run_all_warm(names, jobs=None, timeout=None, params=None, cache_dir=DEFAULT_CACHE_DIR,
+                 cache_bytes=DEFAULT_MAX_BYTES, stage="all", results_dir=DEFAULT_RESULTS_DIR,
+                 style="default", profile=None, checkpoints=None, store_dir=None):
+    """
+    Roda experimentos registrados num pool de workers quentes.
+    O custo de importação é pago uma vez por worker, não uma vez por experimento.
+
+    stage='all' calcula e desenha; 'compute' só calcula e grava os arrays em
+    `results_dir` (matplotlib não é importado); 'render' só redesenha a partir deles.
+
+    profile = {'dir': ..., 'cprofile': bool, 'tracemalloc': bool} grava os relatórios
+    de instrumentação de cada experimento (ver `instrumentation.profile_session`).
+    checkpoints = (diretório, resume, intervalo em s) liga os checkpoints dos laços longos.
+    store_dir grava parâmetros e resultados de cada experimento no armazém colunar
+    (`results_store.py`, requer pyarrow).
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(names)))
+    params = params or {}
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    preload = COMPUTE_PRELOAD_MODULES if stage == "compute" else PRELOAD_MODULES
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=_worker_context(preload),
+                             initializer=_init_worker) as pool:
+        futures = {}
+        for name in names:
+            experiment = experiments.get_experiment(name)
+            limit = _timeout_for(experiment.module + ".py", timeout)
+            log(f"▶ Executando: {name} [{stage}] (limite {limit}s)")
+            if stage == "compute":
+                job = (_task_compute, params.get(name), cache_dir, cache_bytes, checkpoints, store_dir,
+                       results_dir)
+            elif stage == "render":
+                job = (_task_render, results_dir, style)
             else:
-                failed_scripts.append(script)
+                job = (_task_all, params.get(name), cache_dir, cache_bytes, checkpoints, store_dir, style)
+            session = None
+            if profile is not None:
+                label = name if stage == "all" else f"{name}.{stage}"
+                session = (label, profile['dir'], profile.get('cprofile', False),
+                           profile.get('tracemalloc', False))
+            futures[pool.submit(_run_in_worker, name, limit, session, *job)] = name
+        for future in as_completed(futures):
+            r = future.result()
+            if r['status'] == 'ok':
+                log(f"✓ {r['name']} concluído com sucesso ({r['wall_time']:.1f}s, worker {r['worker']})")
+            elif r['status'] == 'timeout':
+                log(f"✗ {r['name']} excedeu o tempo limite")
+            else:
+                log(f"✗ {r['name']} falhou")
+            results[r['name']] = r
+    return [results[n] for n in names]
+
+def resolve_experiments(selection):
+    """Converte nomes de experimentos ou de scripts (.py) em nomes de experimentos registrados."""
+    if not selection:
+        return list(experiments.load_registry())
+    names = []
+    for item in selection:
+        if item.endswith('.py') or item in experiments.EXPERIMENT_MODULES:
+            names.extend(experiments.experiments_for(item))
         else:
-            print(f"✗ Arquivo {script} não encontrado")
-            failed_scripts.append(script)
-    
-    # Resumo final
+            names.append(experiments.get_experiment(item).name)
+    return names
+
+def parse_param_overrides(items):
+    """Converte ['exp.param=valor', ...] em {exp: {param: 'valor'}}."""
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        name, _, param = key.rpartition('.')
+        if not name or not param or not _:
+            raise ValueError(f"Parâmetro inválido '{item}' (esperado experimento.parametro=valor)")
+        overrides.setdefault(name, {})[param] = value
+    return overrides
+
+def print_registry():
+    for exp in experiments.load_registry().values():
+        params = ", ".join(f"{k}: {t.__name__} = {d!r}" for k, (t, d) in exp.params.items())
+        print(f"{exp.name:<32} seed={exp.seed!s:<8} ({params})")
+
+def print_summary(results, total_wall):
+    """Tabela de resumo: tempo de parede, pico de RSS e status de cada script."""
     print("\n" + "="*60)
     print("RESUMO")
     print("="*60)
-    print(f"Total de scripts: {len(scripts)}")
+    print(f"{'Experimento':<32} {'Status':<9} {'Tempo (s)':>10} {'RSS (MB)':>10}")
+    print("-"*64)
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else "-"
+        print(f"{r['name']:<32} {r['status']:<9} {r['wall_time']:>10.1f} {rss:>10}")
+    print("-"*64)
+
+    success_count = sum(r['status'] == 'ok' for r in results)
+    failed_scripts = [r['name'] for r in results if r['status'] != 'ok']
+    serial_time = sum(r['wall_time'] for r in results)
+    print(f"Total de experimentos: {len(results)}")
     print(f"Executados com sucesso: {success_count}")
     print(f"Falharam: {len(failed_scripts)}")
-    
+    print(f"Tempo total: {total_wall:.1f}s (soma dos scripts: {serial_time:.1f}s)")
+
     if failed_scripts:
-        print("\nScripts que falharam:")
+        print("\nExperimentos que falharam:")
         for script in failed_scripts:
             print(f"  - {script}")
-    
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Roda todas as simulações TAMESIS em paralelo.")
+    parser.add_argument("names", nargs="*",
+                        help="Experimentos ou scripts a executar (padrão: todos)")
+    parser.add_argument("--mode", choices=["warm", "subprocess"], default="warm",
+                        help="warm: workers persistentes com o registro; subprocess: um processo por script")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Número de workers (padrão: número de núcleos)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Tempo limite por script em segundos (padrão: por script, 60s)")
+    parser.add_argument("-p", "--param", action="append", default=[],
+                        help="Sobrescreve um parâmetro: experimento.parametro=valor (modo warm)")
+    parser.add_argument("--list", action="store_true", help="Lista os experimentos registrados")
+    parser.add_argument("--no-cache", action="store_true", help="Ignora o cache de resultados (modo warm)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Diretório do cache de resultados")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help="Tamanho máximo do cache em MB (poda LRU)")
+    parser.add_argument("--stage", choices=["all", "compute", "render"], default="all",
+                        help="Estágio a executar (modo warm)")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR,
+                        help="Diretório dos arquivos intermediários (.npz)")
+    parser.add_argument("--style", choices=["default", "publication"], default="default",
+                        help="Estilo base dos gráficos (publication: plot_style.PUBLICATION_STYLE)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Grava tempo/chamadas/alocação por estágio e Chrome trace (modo warm)")
+    parser.add_argument("--cprofile", action="store_true", help="Também roda cProfile (implica --instrument)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Também rastreia alocações com tracemalloc (implica --instrument)")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR, help="Diretório dos relatórios de perfil")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continua os laços longos do último checkpoint (modo warm)")
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR, help="Diretório dos checkpoints")
+    parser.add_argument("--checkpoint-interval", type=float, default=checkpoint.DEFAULT_INTERVAL,
+                        help="Segundos entre checkpoints (0 desliga)")
+    parser.add_argument("--store", nargs="?", const=DEFAULT_STORE_DIR, default=None, metavar="DIR",
+                        help="Grava parâmetros e resultados no armazém colunar (padrão: ../store; requer pyarrow)")
+    parser.add_argument("--precision", choices=sorted(precision.PRECISIONS), default=None,
+                        help="Precisão numérica dos kernels (padrão: TAMESIS_PRECISION ou double)")
+    args = parser.parse_args(argv)
+    if args.store and not HAVE_PYARROW:
+        parser.error("--store requer o pyarrow (pip install pyarrow)")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.list:
+        print_registry()
+        sys.exit(0)
+
+    print("="*60)
+    print("RODANDO TODAS AS SIMULAÇÕES")
+    print("="*60)
+
+    # Criar diretório de imagens se não existir
+    imgs_dir = os.path.join(SCRIPT_DIR, "..", "imgs")
+    if not os.path.exists(imgs_dir):
+        os.makedirs(imgs_dir)
+        print("Diretório 'imgs' criado")
+
+    if args.precision:
+        # Herdada pelos workers (forkserver e subprocessos) pelo ambiente
+        os.environ["TAMESIS_PRECISION"] = args.precision
+        precision.set_precision(args.precision)
+
+    start = time.perf_counter()
+    if args.mode == "warm":
+        selected = resolve_experiments(args.names)
+        profile = None
+        if args.instrument or args.cprofile or args.tracemalloc:
+            profile = {'dir': args.profile_dir, 'cprofile': args.cprofile, 'tracemalloc': args.tracemalloc}
+        results = run_all_warm(selected, jobs=args.jobs, timeout=args.timeout,
+                               params=parse_param_overrides(args.param),
+                               cache_dir=None if args.no_cache else args.cache_dir,
+                               cache_bytes=int(args.cache_size * 2**20),
+                               stage=args.stage, results_dir=args.results_dir, style=args.style,
+                               profile=profile,
+                               checkpoints=(args.checkpoint_dir, args.resume, args.checkpoint_interval)
+                                           if args.checkpoint_interval > 0 else None,
+                               store_dir=args.store)
+        if profile is not None:
+            print(f"Relatórios de perfil em {os.path.relpath(args.profile_dir)}")
+    else:
+        selected = args.names or scripts
+        results = run_all(selected, jobs=args.jobs, timeout=args.timeout)
+    print_summary(results, time.perf_counter() - start)
+
     print("\n✓ Processamento concluído!")
     print("Verifique a pasta 'imgs' para os gráficos gerados.")
+    sys.exit(0 if all(r['status'] == 'ok' for r in results) else 1)
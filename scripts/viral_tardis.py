@@ -1,5 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from experiments import register_experiment, register_renderer
+from render_utils import plot_history
 
 # --- CONSTANTES TAMESIS ---
 OMEGA = 117.038
@@ -8,7 +10,8 @@ OMEGA = 117.038
 # dissipa a energia do vírus antes que ele consiga se integrar.
 # É um "Firewall Biológico".
 
-def simulate_viral_infection(generations=100):
+@register_experiment("viral_tardis")
+def compute_viral_infection(generations=100):
     print("Iniciando Experimento 11: Viral TAMESIS Shield...")
     
     # Carga Viral (Entropia Externa)
@@ -22,32 +25,31 @@ def simulate_viral_infection(generations=100):
     # Capacidade de dissipação escala com log(Omega)
     resistance_TAMESIS = 5.0 * np.log(OMEGA) 
     
-    health_natural = []
-    health_TAMESIS = []
-    
-    current_health_nat = 100
-    current_health_tar = 100
+    # Dano = Carga - Resistência
+    # Se Carga > Resistência, dano ocorre.
+    damage_nat = np.maximum(0, viral_load**2 - resistance_natural) # Vírus escala quadrático vs imunidade linear
+    damage_tar = np.maximum(0, viral_load**2 - resistance_TAMESIS)  # Vírus vs imunidade logaritmica aumentada
     
-    for v in viral_load:
-        # Dano = Carga - Resistência
-        # Se Carga > Resistência, dano ocorre.
-        
-        damage_nat = max(0, (v**2) - resistance_natural) # Vírus escala quadrático vs imunidade linear
-        damage_tar = max(0, (v**2) - resistance_TAMESIS)  # Vírus vs imunidade logaritmica aumentada
-        
-        current_health_nat -= damage_nat
-        current_health_tar -= damage_tar
-        
-        health_natural.append(max(0, current_health_nat))
-        health_TAMESIS.append(max(0, current_health_tar))
-        
+    # Integridade acumulada ao longo dos ciclos (o dano nunca é negativo, então o piso em 0 é final)
+    health_natural = np.maximum(0, 100 - np.cumsum(damage_nat))
+    health_TAMESIS = np.maximum(0, 100 - np.cumsum(damage_tar))
+
+    return {'health_natural': health_natural, 'health_TAMESIS': health_TAMESIS}
+
+@register_renderer("viral_tardis")
+def render_viral_infection(results):
+    import matplotlib.pyplot as plt
+
+    health_natural = results['health_natural']
+    health_TAMESIS = results['health_TAMESIS']
+
     # Plot
     plt.figure(figsize=(10, 6))
     
-    plt.plot(health_natural, 'r--', label='Imunidade Biológica Padrão')
+    plot_history(plt.gca(), health_natural, 'r--', label='Imunidade Biológica Padrão')
     plt.fill_between(range(len(health_natural)), health_natural, color='red', alpha=0.1)
     
-    plt.plot(health_TAMESIS, 'b-', linewidth=3, label='Escudo TAMESIS (Fractal)')
+    plot_history(plt.gca(), health_TAMESIS, 'b-', linewidth=3, label='Escudo TAMESIS (Fractal)')
     plt.fill_between(range(len(health_TAMESIS)), health_TAMESIS, color='blue', alpha=0.1)
     
     plt.axhline(y=0, color='black', linestyle='-')
@@ -59,8 +61,8 @@ def simulate_viral_infection(generations=100):
     plt.grid(True, alpha=0.3)
     
     # Annotate Collapse
-    if 0 in health_natural:
-        collapse_idx = health_natural.index(0)
+    if np.any(health_natural == 0):
+        collapse_idx = int(np.argmax(health_natural == 0))
         plt.annotate('Colapso Sistêmico', xy=(collapse_idx, 0), xytext=(collapse_idx-20, 20),
                      arrowprops=dict(facecolor='red', shrink=0.05))
 
@@ -68,5 +70,8 @@ def simulate_viral_infection(generations=100):
     plt.savefig(outfile, dpi=300, bbox_inches="tight")
     print(f"Concluído. Gráfico salvo em {outfile}")
 
+def simulate_viral_infection(generations=100):
+    render_viral_infection(compute_viral_infection(generations))
+
 if __name__ == "__main__":
     simulate_viral_infection()